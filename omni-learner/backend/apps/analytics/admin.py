@@ -1,3 +1,32 @@
 from django.contrib import admin
+from .models import DailyBoardMetrics, DailyUserMetrics
 
-# Register your models here.
+
+@admin.register(DailyBoardMetrics)
+class DailyBoardMetricsAdmin(admin.ModelAdmin):
+    list_display = [
+        "board",
+        "date",
+        "cards_created",
+        "cards_completed",
+        "wip_total",
+        "updated_at",
+    ]
+    list_filter = ["date"]
+    search_fields = ["board__name", "owner__email"]
+    raw_id_fields = ["board", "owner"]
+
+
+@admin.register(DailyUserMetrics)
+class DailyUserMetricsAdmin(admin.ModelAdmin):
+    list_display = [
+        "user",
+        "date",
+        "cards_created",
+        "cards_completed",
+        "wip_total",
+        "updated_at",
+    ]
+    list_filter = ["date"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
@@ -0,0 +1,154 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("kanban", "0004_card_event"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBoardMetrics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("cards_created", models.IntegerField(default=0)),
+                ("cards_completed", models.IntegerField(default=0)),
+                (
+                    "lead_time_hours",
+                    models.FloatField(
+                        default=0, help_text="Sum of created -> completed hours"
+                    ),
+                ),
+                (
+                    "cycle_time_hours",
+                    models.FloatField(
+                        default=0, help_text="Sum of started -> completed hours"
+                    ),
+                ),
+                (
+                    "cycle_time_samples",
+                    models.IntegerField(
+                        default=0, help_text="Completed cards that had a start time"
+                    ),
+                ),
+                (
+                    "estimated_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                (
+                    "actual_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                ("wip_total", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "wip_by_column",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Open cards per column: {column_id: count}",
+                    ),
+                ),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_metrics",
+                        to="kanban.board",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="board_daily_metrics",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "analytics_daily_board_metrics",
+                "ordering": ["board", "date"],
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "date"], name="analytics_d_owner_i_79c07d_idx"
+                    )
+                ],
+                "unique_together": {("board", "date")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyUserMetrics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("cards_created", models.IntegerField(default=0)),
+                ("cards_completed", models.IntegerField(default=0)),
+                (
+                    "lead_time_hours",
+                    models.FloatField(
+                        default=0, help_text="Sum of created -> completed hours"
+                    ),
+                ),
+                (
+                    "cycle_time_hours",
+                    models.FloatField(
+                        default=0, help_text="Sum of started -> completed hours"
+                    ),
+                ),
+                (
+                    "cycle_time_samples",
+                    models.IntegerField(
+                        default=0, help_text="Completed cards that had a start time"
+                    ),
+                ),
+                (
+                    "estimated_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                (
+                    "actual_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                ("wip_total", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_metrics",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "analytics_daily_user_metrics",
+                "ordering": ["user", "date"],
+                "unique_together": {("user", "date")},
+            },
+        ),
+    ]
@@ -1,3 +1,90 @@
 from django.db import models
+from django.conf import settings
 
-# Create your models here.
+
+class DailyMetricsBase(models.Model):
+    """Abstract daily rollup of kanban activity
+
+    Lead/cycle times are stored as sums (plus sample counts) so averages over
+    any date range can be re-aggregated exactly.
+    """
+
+    date = models.DateField()
+
+    cards_created = models.IntegerField(default=0)
+    cards_completed = models.IntegerField(default=0)
+
+    lead_time_hours = models.FloatField(
+        default=0, help_text="Sum of created -> completed hours"
+    )
+    cycle_time_hours = models.FloatField(
+        default=0, help_text="Sum of started -> completed hours"
+    )
+    cycle_time_samples = models.IntegerField(
+        default=0, help_text="Completed cards that had a start time"
+    )
+
+    estimated_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    actual_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    wip_total = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def avg_lead_time_hours(self):
+        if not self.cards_completed:
+            return None
+        return self.lead_time_hours / self.cards_completed
+
+    @property
+    def avg_cycle_time_hours(self):
+        if not self.cycle_time_samples:
+            return None
+        return self.cycle_time_hours / self.cycle_time_samples
+
+
+class DailyBoardMetrics(DailyMetricsBase):
+    """Per-board daily rollup"""
+
+    board = models.ForeignKey(
+        "kanban.Board", on_delete=models.CASCADE, related_name="daily_metrics"
+    )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="board_daily_metrics",
+    )
+    wip_by_column = models.JSONField(
+        default=dict, blank=True, help_text="Open cards per column: {column_id: count}"
+    )
+
+    class Meta:
+        db_table = "analytics_daily_board_metrics"
+        ordering = ["board", "date"]
+        unique_together = [["board", "date"]]
+        indexes = [
+            models.Index(fields=["owner", "date"]),
+        ]
+
+    def __str__(self):
+        return f"Board {self.board_id} @ {self.date}"
+
+
+class DailyUserMetrics(DailyMetricsBase):
+    """Per-user daily rollup (sum over the user's boards)"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="daily_metrics"
+    )
+
+    class Meta:
+        db_table = "analytics_daily_user_metrics"
+        ordering = ["user", "date"]
+        unique_together = [["user", "date"]]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.date}"
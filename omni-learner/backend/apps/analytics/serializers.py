@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from .models import DailyBoardMetrics, DailyUserMetrics
+
+METRIC_SERIALIZER_FIELDS = [
+    "date",
+    "cards_created",
+    "cards_completed",
+    "avg_lead_time_hours",
+    "avg_cycle_time_hours",
+    "estimated_hours",
+    "actual_hours",
+    "wip_total",
+]
+
+
+class DailyBoardMetricsSerializer(serializers.ModelSerializer):
+    """Serializer cho daily board metrics"""
+
+    avg_lead_time_hours = serializers.FloatField(read_only=True)
+    avg_cycle_time_hours = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DailyBoardMetrics
+        fields = ["id", "board"] + METRIC_SERIALIZER_FIELDS + ["wip_by_column"]
+        read_only_fields = fields
+
+
+class DailyUserMetricsSerializer(serializers.ModelSerializer):
+    """Serializer cho daily user metrics"""
+
+    avg_lead_time_hours = serializers.FloatField(read_only=True)
+    avg_cycle_time_hours = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DailyUserMetrics
+        fields = ["id", "user"] + METRIC_SERIALIZER_FIELDS
+        read_only_fields = fields
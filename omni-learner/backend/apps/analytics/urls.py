@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r"boards", views.DailyBoardMetricsViewSet, basename="board-metrics")
+router.register(r"users", views.DailyUserMetricsViewSet, basename="user-metrics")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
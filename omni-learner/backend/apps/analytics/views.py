@@ -1,3 +1,115 @@
-from django.shortcuts import render
+from datetime import date, timedelta
 
-# Create your views here.
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import DailyBoardMetrics, DailyUserMetrics
+from .serializers import DailyBoardMetricsSerializer, DailyUserMetricsSerializer
+
+MAX_RANGE_DAYS = 366
+
+SUMMARY_FIELDS = [
+    "cards_created",
+    "cards_completed",
+    "lead_time_hours",
+    "cycle_time_hours",
+    "cycle_time_samples",
+    "estimated_hours",
+    "actual_hours",
+]
+
+
+class MetricsRangeMixin:
+    """Date-range filtering over rollup tables
+
+    Query params: ?start=2026-01-01&end=2026-01-31 (default: last 30 days).
+    Results are not paginated so charts get the full series; the range is
+    capped at MAX_RANGE_DAYS instead.
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    filter_backends = []
+
+    def get_date_range(self):
+        params = self.request.query_params
+        try:
+            end = date.fromisoformat(params["end"]) if "end" in params else None
+            start = date.fromisoformat(params["start"]) if "start" in params else None
+        except ValueError:
+            raise ValidationError({"error": "start/end must be YYYY-MM-DD"})
+
+        end = end or timezone.localdate()
+        start = start or end - timedelta(days=29)
+        if start > end:
+            raise ValidationError({"error": "start must be before end"})
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise ValidationError(
+                {"error": f"Date range cannot exceed {MAX_RANGE_DAYS} days"}
+            )
+        return start, end
+
+    def filter_range(self, queryset):
+        start, end = self.get_date_range()
+        return queryset.filter(date__range=(start, end)).order_by("date")
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """Totals and averages over the date range"""
+        start, end = self.get_date_range()
+        totals = self.get_queryset().aggregate(
+            **{field: Sum(field) for field in SUMMARY_FIELDS}
+        )
+        totals = {field: value or 0 for field, value in totals.items()}
+
+        completed = totals["cards_completed"]
+        samples = totals.pop("cycle_time_samples")
+        lead = totals.pop("lead_time_hours")
+        cycle = totals.pop("cycle_time_hours")
+
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                **totals,
+                "estimated_hours": float(totals["estimated_hours"]),
+                "actual_hours": float(totals["actual_hours"]),
+                "avg_lead_time_hours": lead / completed if completed else None,
+                "avg_cycle_time_hours": cycle / samples if samples else None,
+            }
+        )
+
+
+class DailyBoardMetricsViewSet(MetricsRangeMixin, viewsets.ReadOnlyModelViewSet):
+    """Daily metrics per board (filter: ?board=<id>)"""
+
+    serializer_class = DailyBoardMetricsSerializer
+
+    def get_queryset(self):
+        queryset = DailyBoardMetrics.objects.filter(owner=self.request.user)
+
+        board_id = self.request.query_params.get("board")
+        if board_id:
+            try:
+                board_id = int(board_id)
+            except ValueError:
+                raise ValidationError({"error": "board must be an integer id"})
+            queryset = queryset.filter(board_id=board_id)
+
+        return self.filter_range(queryset)
+
+
+class DailyUserMetricsViewSet(MetricsRangeMixin, viewsets.ReadOnlyModelViewSet):
+    """Daily metrics for the current user across all boards"""
+
+    serializer_class = DailyUserMetricsSerializer
+
+    def get_queryset(self):
+        return self.filter_range(
+            DailyUserMetrics.objects.filter(user=self.request.user)
+        )
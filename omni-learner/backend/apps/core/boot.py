@@ -0,0 +1,33 @@
+"""Boot hooks for preforking servers (gunicorn --preload, Celery prefork)
+
+The parent imports the whole project once and freezes the garbage collector,
+so forked children share those pages copy-on-write instead of dirtying them
+the first time a collection walks the objects. Children then drop state
+that must not cross a fork.
+"""
+
+import gc
+
+
+def preload():
+    """Import everything a request can touch (URLconf -> every view)"""
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+
+def freeze():
+    """Move every object created so far out of the collector's reach"""
+    gc.collect()
+    gc.freeze()
+
+
+def reset_after_fork():
+    """Drop connections inherited from the parent"""
+    from django.db import connections
+
+    from .redis import reset_redis
+
+    # Pool của backend pooled tự tạo lại theo pid; đây là kết nối thường
+    connections.close_all()
+    reset_redis()
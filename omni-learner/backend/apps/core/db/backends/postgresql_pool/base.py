@@ -0,0 +1,144 @@
+"""PostgreSQL backend that checks connections out of a psycopg_pool
+
+Every process (gunicorn / uvicorn worker, Celery child) lazily opens one
+bounded pool per database alias; Django "closing" a connection hands it back
+to the pool. Pools are keyed by pid, so a process forked after the parent
+touched the database builds its own instead of sharing sockets.
+
+Pool arguments come from ``OPTIONS["pool"]`` (min_size, max_size, timeout,
+max_idle, max_lifetime). CONN_HEALTH_CHECKS makes the pool test each
+connection on checkout.
+
+A pool is closed (not just emptied) when the test database is created or
+dropped, and rebuilt when ``NAME`` changes, so idle pooled connections never
+hold the database DROP DATABASE is waiting for. The ``_nodb_cursor``
+connection to the maintenance database is not pooled.
+"""
+
+import atexit
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+from .creation import DatabaseCreation
+
+_pools = {}
+# (pid, alias) -> database NAME the pool connects to
+_pool_names = {}
+_pools_lock = threading.Lock()
+
+
+def get_pools():
+    """{alias: pool} opened by the current process"""
+    pid = os.getpid()
+    return {alias: pool for (owner, alias), pool in _pools.items() if owner == pid}
+
+
+@atexit.register
+def close_pools():
+    """Close this process's pools (connections of forked parents are left alone)"""
+    pid = os.getpid()
+    for key in [key for key in _pools if key[0] == pid]:
+        _pool_names.pop(key, None)
+        _pools.pop(key).close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        key = (os.getpid(), self.alias)
+        pool = _pools.get(key)
+        if pool is not None and _pool_names.get(key) != self.settings_dict["NAME"]:
+            # NAME đổi (vd. test database): pool cũ trỏ vào database khác
+            self.close_pool()
+            pool = None
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(key)
+                if pool is None:
+                    pool = self._create_pool()
+                    # Pool của process cha (trước khi fork) không dùng được ở đây
+                    for stale in [k for k in _pools if k[0] != key[0]]:
+                        _pool_names.pop(stale, None)
+                        del _pools[stale]
+                    _pools[key] = pool
+                    _pool_names[key] = self.settings_dict["NAME"]
+        return pool
+
+    def close_pool(self):
+        """Return this wrapper's connection and close the process's pool"""
+        if self.connection is not None:
+            self.close()
+        key = (os.getpid(), self.alias)
+        with _pools_lock:
+            _pool_names.pop(key, None)
+            pool = _pools.pop(key, None)
+        if pool is not None:
+            pool.close()
+
+    def _create_pool(self):
+        from psycopg_pool import ConnectionPool
+
+        if self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured(
+                "Pooled connections require CONN_MAX_AGE = 0 "
+                f"(database '{self.alias}')."
+            )
+        pool = ConnectionPool(
+            kwargs=self.get_connection_params(),
+            check=(
+                ConnectionPool.check_connection
+                if self.settings_dict["CONN_HEALTH_CHECKS"]
+                else None
+            ),
+            name=f"{self.alias}-{os.getpid()}",
+            open=False,
+            **self.settings_dict["OPTIONS"].get("pool", {}),
+        )
+        # Không chờ đủ min_size: kết nối đầu tiên được mở theo yêu cầu
+        pool.open(wait=False)
+        return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = base.IsolationLevel(
+                base.IsolationLevel.READ_COMMITTED
+                if isolation_level is None
+                else isolation_level
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {isolation_level} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+
+        if self.alias == NO_DB_ALIAS:
+            self._pool_pid = None
+            connection = super().get_new_connection(conn_params)
+        else:
+            connection = self.pool.getconn()
+            self._pool_pid = os.getpid()
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if getattr(self, "_pool_pid", None) != os.getpid():
+            # Không qua pool, hoặc kế thừa qua fork: đóng như backend thường
+            return super()._close()
+        with self.wrap_database_errors:
+            # putconn() rolls back anything left open before reuse
+            self.pool.putconn(self.connection)
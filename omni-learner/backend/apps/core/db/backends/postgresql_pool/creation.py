@@ -0,0 +1,21 @@
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Close the pool before CREATE / DROP / clone of a test database
+
+    Pooled connections to the test (or template) database would otherwise
+    make PostgreSQL refuse with "being accessed by other users".
+    """
+
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        self.connection.close_pool()
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close_pool()
+        return super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        self.connection.close_pool()
+        return super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,41 @@
+"""Run independent ORM calls concurrently from async views
+
+Django 5.0's async ORM wraps each query in sync_to_async on the request's
+own thread, so asyncio.gather() over it still runs one query at a time.
+run_parallel() gives every call a worker thread, and with it a connection
+checked out of the process pool and handed back when the call returns.
+Without the pooled backend the calls run one after another on the request
+thread: a fresh connection per call would cost more than it saves.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+POOLED_ENGINE = "apps.core.db.backends.postgresql_pool"
+
+
+def _on_own_connection(func):
+    def call():
+        try:
+            return func()
+        finally:
+            # Trả kết nối về pool cho lần gọi sau
+            connections.close_all()
+
+    return call
+
+
+async def run_parallel(*funcs):
+    """Results of calling each of ``funcs``, in order"""
+    if settings.DATABASES["default"]["ENGINE"] != POOLED_ENGINE:
+        return [await sync_to_async(func)() for func in funcs]
+
+    return await asyncio.gather(
+        *(
+            sync_to_async(_on_own_connection(func), thread_sensitive=False)()
+            for func in funcs
+        )
+    )
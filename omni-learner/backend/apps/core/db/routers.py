@@ -0,0 +1,58 @@
+"""Primary / replica database routing
+
+Reads go to a replica only inside a ``read_from_replica()`` scope: safe-method
+requests (see ReplicaRoutingMiddleware) and analytics jobs. Writes, migrations
+and everything else use ``default``.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_aliases():
+    return settings.DATABASE_REPLICAS
+
+
+@contextmanager
+def read_from_replica():
+    """Route ORM reads in this scope to a replica (no-op without replicas)"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Force reads in this scope back to the primary"""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads to a random replica when the current scope allows it"""
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica là bản sao của cùng một database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
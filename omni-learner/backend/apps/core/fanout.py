@@ -0,0 +1,49 @@
+"""Chunked fan-out of batch jobs over id ranges
+
+A job over N users is split into [low, high) id ranges of ``shard_size``
+(each a single set-based task call), and ``shards_per_message`` ranges are
+packed into one message with Celery's chunks(). 100k users with 500-id
+shards is 200 messages - or 20 with 10 shards per message - not 100k.
+"""
+
+from celery import group
+from django.db.models import Max, Min
+
+
+def id_bounds(queryset, field="id"):
+    """(lowest, highest) value of ``field`` in ``queryset``, (None, None) if empty"""
+    bounds = queryset.aggregate(low=Min(field), high=Max(field))
+    return bounds["low"], bounds["high"]
+
+
+def id_ranges(low, high, shard_size):
+    """[id_from, id_to) ranges covering low..high (inclusive)"""
+    return [(start, start + shard_size) for start in range(low, high + 1, shard_size)]
+
+
+def fan_out(task, bounds, *args, shard_size, shards_per_message=1):
+    """Enqueue ``task(*args, id_from, id_to)`` for every shard of ``bounds``
+
+    Messages keep the task's own queue and priority (CELERY_TASK_ROUTES),
+    even when packed into chunks. Returns the number of messages sent.
+    """
+    low, high = bounds
+    if low is None:
+        return 0
+
+    calls = [
+        (*args, id_from, id_to) for id_from, id_to in id_ranges(low, high, shard_size)
+    ]
+    if shards_per_message > 1:
+        # chunks() chạy dưới tên celery.starmap: phải mang theo route của task
+        route = task.app.amqp.router.route({}, task.name)
+        options = {"queue": route["queue"].name}
+        if route.get("priority") is not None:
+            options["priority"] = route["priority"]
+        job = task.chunks(calls, shards_per_message).group()
+    else:
+        options = {}
+        job = group(task.s(*call) for call in calls)
+
+    job.apply_async(**options)
+    return len(job.tasks)
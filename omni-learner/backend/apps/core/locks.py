@@ -0,0 +1,270 @@
+"""Distributed leases, single-instance tasks and single-flight computations
+
+A lease is a named lock with an owner token and a TTL: SET NX PX in Redis,
+released (or extended) only by the owner through a compare-and-delete
+script, so a holder that outlived its TTL cannot drop someone else's lease.
+With LOCK_BACKEND = "database" a PostgreSQL session advisory lock is used
+instead; it has no TTL and is held until released or the connection closes.
+"""
+
+import functools
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lock:"
+POLL_SECONDS = 0.05
+
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+EXTEND_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class LeaseNotAcquired(Exception):
+    pass
+
+
+class BaseLease:
+    def __init__(self, name, ttl):
+        self.name = name
+        self.ttl = ttl
+        self.acquired = False
+
+    def _try_acquire(self):
+        raise NotImplementedError
+
+    def acquire(self, timeout=0):
+        """Take the lease, polling for up to ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.acquired = self._try_acquire()
+            if self.acquired or time.monotonic() >= deadline:
+                return self.acquired
+            time.sleep(POLL_SECONDS)
+
+    def __enter__(self):
+        if not self.acquire():
+            raise LeaseNotAcquired(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class RedisLease(BaseLease):
+    """Lease stored as ``lock:<name>`` = owner token, expiring after ``ttl`` s"""
+
+    def __init__(self, name, ttl):
+        super().__init__(name, ttl)
+        self.key = KEY_PREFIX + name
+        self.token = uuid.uuid4().hex
+
+    def _try_acquire(self):
+        return bool(
+            get_redis().set(self.key, self.token, nx=True, px=int(self.ttl * 1000))
+        )
+
+    def release(self):
+        if not self.acquired:
+            return False
+        self.acquired = False
+        return bool(get_redis().eval(RELEASE_SCRIPT, 1, self.key, self.token))
+
+    def extend(self, ttl=None):
+        """Reset the TTL; False if the lease already expired and was lost"""
+        ttl = self.ttl if ttl is None else ttl
+        return bool(
+            get_redis().eval(EXTEND_SCRIPT, 1, self.key, self.token, int(ttl * 1000))
+        )
+
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+class DatabaseLease(BaseLease):
+    """PostgreSQL advisory lock on the ``default`` connection
+
+    ``ttl`` is ignored. Other databases (SQLite in development) get a
+    process-local lock.
+    """
+
+    def __init__(self, name, ttl):
+        super().__init__(name, ttl)
+        digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+        self.lock_id = int.from_bytes(digest, "big", signed=True)
+        self.connection = connections["default"]
+
+    def _try_acquire(self):
+        if self.connection.vendor != "postgresql":
+            with _local_locks_guard:
+                lock = _local_locks.setdefault(self.name, threading.Lock())
+            return lock.acquire(blocking=False)
+
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [self.lock_id])
+            return cursor.fetchone()[0]
+
+    def release(self):
+        if not self.acquired:
+            return False
+        self.acquired = False
+        if self.connection.vendor != "postgresql":
+            _local_locks[self.name].release()
+            return True
+
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [self.lock_id])
+            return cursor.fetchone()[0]
+
+    def extend(self, ttl=None):
+        return self.acquired
+
+
+def lease(name, ttl):
+    """A lease on ``name`` from the configured LOCK_BACKEND (not yet taken)"""
+    if settings.LOCK_BACKEND == "database":
+        return DatabaseLease(name, ttl)
+    return RedisLease(name, ttl)
+
+
+class _LeaseRenewer(threading.Thread):
+    """Extend ``job_lease`` every ttl / 3 seconds until stopped or lost"""
+
+    def __init__(self, job_lease):
+        super().__init__(name=f"lease-renewer:{job_lease.name}", daemon=True)
+        self.job_lease = job_lease
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.job_lease.ttl / 3):
+            try:
+                if not self.job_lease.extend():
+                    logger.warning("Lost lease %s while running", self.job_lease.name)
+                    return
+            except Exception:
+                logger.warning("Could not extend lease %s", self.job_lease.name)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def single_instance(ttl=None, hold=False):
+    """Skip a task call while another call of the same task holds its lease
+
+    The lease is keyed by the task's name and arguments, so two beat
+    instances (or an overlapping deploy) firing the same job run it once;
+    skipped calls return None. While the task runs the lease is renewed
+    every ttl / 3 seconds, so ``ttl`` only bounds how long a killed worker
+    blocks the job: size it to (a bit under) the job's beat interval.
+    With ``hold`` a successful run keeps the lease until ``ttl`` expires,
+    making the job at most once per ``ttl`` even when the duplicate arrives
+    after the first run has finished. ``hold`` needs the Redis backend;
+    advisory locks end with the run.
+    ``ttl`` defaults to CELERY_TASK_TIME_LIMIT. Put it under ``@shared_task``.
+    """
+
+    def decorator(func):
+        task_name = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            name = f"task:{task_name}:{args!r}:{sorted(kwargs.items())!r}"
+            job_lease = lease(name, ttl or settings.CELERY_TASK_TIME_LIMIT)
+            if not job_lease.acquire():
+                logger.info("Skipping %s: already running or recently run", name)
+                return None
+
+            renewer = None
+            if isinstance(job_lease, RedisLease):
+                renewer = _LeaseRenewer(job_lease)
+                renewer.start()
+            try:
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    if renewer:
+                        renewer.stop()
+            except BaseException:
+                job_lease.release()
+                raise
+            if hold:
+                # Giữ lease đủ ``ttl`` tính từ lúc chạy xong
+                job_lease.extend()
+            else:
+                job_lease.release()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def single_flight(key, compute, timeout=None, ttl=None):
+    """Result of ``compute()``, shared by concurrent callers with the same key
+
+    The first caller takes the lease and computes; the others poll the cache
+    for its result (or the freed lease, if it failed) for up to ``timeout``
+    seconds, then compute themselves.
+    Results are kept for ``ttl`` seconds (SINGLE_FLIGHT_RESULT_SECONDS), so
+    callers may see an answer that old.
+    """
+    timeout = settings.SINGLE_FLIGHT_TIMEOUT_SECONDS if timeout is None else timeout
+    ttl = settings.SINGLE_FLIGHT_RESULT_SECONDS if ttl is None else ttl
+    result_key = f"single-flight:{key}"
+    missing = object()
+
+    def cached():
+        try:
+            return cache.get(result_key, missing)
+        except Exception:
+            logger.warning("Single-flight cache unavailable for %s", key)
+            return missing
+
+    flight = lease(f"single-flight:{key}", timeout)
+    deadline = time.monotonic() + timeout
+    while True:
+        result = cached()
+        if result is not missing:
+            return result
+
+        try:
+            leader = flight.acquire()
+        except Exception:
+            # Redis không khả dụng: tự tính
+            logger.warning("Single-flight lease unavailable for %s", key)
+            return compute()
+
+        if leader:
+            try:
+                result = compute()
+                try:
+                    cache.set(result_key, result, ttl)
+                except Exception:
+                    pass
+                return result
+            finally:
+                flight.release()
+
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(POLL_SECONDS)
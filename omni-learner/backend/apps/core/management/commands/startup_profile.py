@@ -0,0 +1,140 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter under -X importtime; prints one JSON line
+PROBE = r"""
+import json
+import sys
+import time
+
+from django.apps.config import AppConfig
+
+apps = {}
+phases = {}
+create = AppConfig.create.__func__
+
+
+def timed(timing, phase, func):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing[phase] = (time.perf_counter() - start) * 1000
+
+    return wrapper
+
+
+def create_timed(cls, entry):
+    start = time.perf_counter()
+    app_config = create(cls, entry)
+    timing = apps[app_config.label] = {"import": (time.perf_counter() - start) * 1000}
+    app_config.import_models = timed(timing, "models", app_config.import_models)
+    app_config.ready = timed(timing, "ready", app_config.ready)
+    return app_config
+
+
+AppConfig.create = classmethod(create_timed)
+
+import django
+
+start = time.perf_counter()
+django.setup()
+phases["setup"] = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+if sys.argv[1] == "web":
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.urls import get_resolver
+
+    WSGIHandler()
+    get_resolver().url_patterns
+else:
+    from config.celery import app
+
+    app.loader.import_default_modules()
+phases[sys.argv[1]] = (time.perf_counter() - start) * 1000
+
+print(json.dumps({"apps": apps, "phases": phases}))
+"""
+
+
+def parse_importtime(output):
+    """[(module, self ms, cumulative ms)] from ``-X importtime`` output"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Report import time and AppConfig cost of starting a fresh process"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=["web", "worker"],
+            default="web",
+            help="web: middleware + URLconf (every view); worker: Celery tasks",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Rows in the module tables"
+        )
+
+    def handle(self, *args, **options):
+        target = options["target"]
+        limit = options["limit"]
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, target],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+        )
+        if result.returncode:
+            raise CommandError(result.stderr[-3000:])
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = parse_importtime(result.stderr)
+
+        total = sum(self_ms for _, self_ms, _ in modules)
+        phases = report["phases"]
+        self.stdout.write(
+            f"Start-up ({target}): django.setup() {phases['setup']:.0f} ms, "
+            f"{target} {phases[target]:.0f} ms, imports {total:.0f} ms\n"
+        )
+
+        self.stdout.write(f"{'App':<28}{'import':>10}{'models':>10}{'ready':>10}")
+        rows = sorted(
+            report["apps"].items(),
+            key=lambda item: -sum(item[1].values()),
+        )
+        for label, timing in rows:
+            self.stdout.write(
+                f"{label:<28}"
+                + "".join(
+                    f"{timing.get(phase, 0):>10.1f}"
+                    for phase in ("import", "models", "ready")
+                )
+            )
+
+        packages = defaultdict(float)
+        for name, self_ms, _ in modules:
+            packages[name.split(".")[0]] += self_ms
+        self.stdout.write("\nImport time by top-level package (ms)")
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(f"  {name:<40}{ms:>10.1f}")
+
+        self.stdout.write("\nSlowest modules (self / cumulative ms)")
+        slowest = sorted(modules, key=lambda module: -module[1])[:limit]
+        for name, self_ms, cumulative_ms in slowest:
+            self.stdout.write(f"  {name:<50}{self_ms:>10.1f}{cumulative_ms:>10.1f}")
@@ -0,0 +1,246 @@
+"""Prometheus metrics for web and Celery processes
+
+Each process keeps its own numbers (e.g. its connection pools, the tasks it
+ran), so it publishes a snapshot to Redis at most every
+METRICS_PUBLISH_SECONDS. The /metrics endpoint, answered by whichever web
+worker gets the scrape, renders every live snapshot labelled by process;
+snapshots of exited processes expire.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "metrics:process:"
+
+# (pool stat, metric, type, help, scale)
+DB_POOL_METRICS = [
+    ("pool_size", "db_pool_connections", "gauge", "Open connections", 1),
+    ("pool_available", "db_pool_idle_connections", "gauge", "Idle connections", 1),
+    ("pool_max", "db_pool_max_connections", "gauge", "Pool size limit", 1),
+    ("requests_waiting", "db_pool_waiting", "gauge", "Checkouts waiting", 1),
+    ("requests_num", "db_pool_checkouts_total", "counter", "Checkouts", 1),
+    (
+        "requests_wait_ms",
+        "db_pool_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a connection",
+        0.001,
+    ),
+    (
+        "requests_errors",
+        "db_pool_checkout_errors_total",
+        "counter",
+        "Checkouts that timed out or failed",
+        1,
+    ),
+    (
+        "returns_bad",
+        "db_pool_bad_returns_total",
+        "counter",
+        "Connections returned broken or mid-transaction",
+        1,
+    ),
+    (
+        "connections_lost",
+        "db_pool_connections_lost_total",
+        "counter",
+        "Connections that failed the health check",
+        1,
+    ),
+]
+
+# Upper bounds (seconds) of the task wait / run time histogram buckets
+TASK_BUCKETS = (0.05, 0.25, 1, 5, 15, 60, 300, 900, 1800)
+
+# (stat, metric, help)
+TASK_HISTOGRAMS = [
+    ("wait", "celery_task_queue_wait_seconds", "Time from enqueue (or ETA) to start"),
+    ("run", "celery_task_runtime_seconds", "Time spent executing"),
+]
+
+_last_publish = 0.0
+_tasks = {}
+_tasks_lock = threading.Lock()
+
+
+def process_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def db_pool_stats():
+    """{alias: psycopg_pool stats} for this process's pools"""
+    from .db.backends.postgresql_pool.base import get_pools
+
+    return {alias: pool.get_stats() for alias, pool in get_pools().items()}
+
+
+def _task_stats(task, queue):
+    queues = _tasks.setdefault(task, {})
+    if queue not in queues:
+        queues[queue] = {
+            "states": {},
+            **{
+                stat: {"buckets": [0] * (len(TASK_BUCKETS) + 1), "sum": 0.0}
+                for stat, _, _ in TASK_HISTOGRAMS
+            },
+        }
+    return queues[queue]
+
+
+def _observe(histogram, seconds):
+    histogram["buckets"][bisect_left(TASK_BUCKETS, seconds)] += 1
+    histogram["sum"] += seconds
+
+
+def record_task(task, queue, state, wait=None, run=None):
+    """Count one finished execution of ``task`` taken from ``queue``
+
+    ``wait`` is None for tasks that never went through the broker (eager).
+    """
+    with _tasks_lock:
+        stats = _task_stats(task, queue)
+        stats["states"][state] = stats["states"].get(state, 0) + 1
+        if wait is not None:
+            _observe(stats["wait"], wait)
+        if run is not None:
+            _observe(stats["run"], run)
+
+
+def snapshot():
+    with _tasks_lock:
+        tasks = json.loads(json.dumps(_tasks))
+    return {"db_pool": db_pool_stats(), "celery_tasks": tasks}
+
+
+def publish(force=False):
+    """Store this process's snapshot in Redis (throttled)"""
+    global _last_publish
+    now = time.monotonic()
+    if not force and now - _last_publish < settings.METRICS_PUBLISH_SECONDS:
+        return
+    _last_publish = now
+
+    try:
+        get_redis().set(
+            SNAPSHOT_PREFIX + process_name(),
+            json.dumps(snapshot()),
+            ex=settings.METRICS_PUBLISH_SECONDS * 4,
+        )
+    except Exception:
+        logger.warning("Could not publish process metrics", exc_info=True)
+
+
+def collect_snapshots():
+    """{process: snapshot} for every live process, this one included"""
+    snapshots = {}
+    try:
+        redis = get_redis()
+        keys = list(redis.scan_iter(match=SNAPSHOT_PREFIX + "*", count=500))
+        for key, value in zip(keys, redis.mget(keys) if keys else []):
+            if value:
+                key = key.decode() if isinstance(key, bytes) else key
+                snapshots[key[len(SNAPSHOT_PREFIX) :]] = json.loads(value)
+    except Exception:
+        logger.warning("Could not read process metrics", exc_info=True)
+
+    snapshots[process_name()] = snapshot()
+    return snapshots
+
+
+def _labels(**labels):
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def queue_lengths():
+    """{queue: messages waiting} summed over the Redis priority sub-queues"""
+    if not settings.CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+        return {}
+
+    import redis
+
+    options = settings.CELERY_BROKER_TRANSPORT_OPTIONS
+    sep = options.get("sep", "\x06\x16")
+    steps = options.get("priority_steps", [0, 3, 6, 9])
+    names = [queue.name for queue in settings.CELERY_TASK_QUEUES]
+    try:
+        client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+        with client.pipeline(transaction=False) as pipe:
+            for name in names:
+                for step in steps:
+                    # kombu: bậc 0 dùng tên queue gốc
+                    pipe.llen(f"{name}{sep}{step}" if step else name)
+            counts = pipe.execute()
+    except Exception:
+        logger.warning("Could not read queue lengths", exc_info=True)
+        return {}
+    return {
+        name: sum(counts[index * len(steps) : (index + 1) * len(steps)])
+        for index, name in enumerate(names)
+    }
+
+
+def _render_tasks(lines, snapshots):
+    rows = [
+        (process, task, queue, stats)
+        for process, data in sorted(snapshots.items())
+        for task, queues in sorted(data.get("celery_tasks", {}).items())
+        for queue, stats in sorted(queues.items())
+    ]
+
+    metric = "celery_tasks_total"
+    lines.append(f"# HELP {metric} Finished executions by state (RETRY, FAILURE, ...)")
+    lines.append(f"# TYPE {metric} counter")
+    for process, task, queue, stats in rows:
+        for state, count in sorted(stats["states"].items()):
+            labels = _labels(process=process, task=task, queue=queue, state=state)
+            lines.append(f"{metric}{labels} {count}")
+
+    for stat, metric, help_text in TASK_HISTOGRAMS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for process, task, queue, stats in rows:
+            histogram = stats[stat]
+            total = 0
+            for bound, count in zip((*TASK_BUCKETS, "+Inf"), histogram["buckets"]):
+                total += count
+                labels = _labels(process=process, task=task, queue=queue, le=bound)
+                lines.append(f"{metric}_bucket{labels} {total}")
+            labels = _labels(process=process, task=task, queue=queue)
+            lines.append(f"{metric}_sum{labels} {histogram['sum']}")
+            lines.append(f"{metric}_count{labels} {total}")
+
+
+def render_metrics():
+    """Prometheus text exposition of all snapshots"""
+    snapshots = collect_snapshots()
+    lines = []
+    for stat, metric, kind, help_text, scale in DB_POOL_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for process, data in sorted(snapshots.items()):
+            for alias, stats in sorted(data.get("db_pool", {}).items()):
+                value = stats.get(stat, 0) * scale
+                lines.append(f"{metric}{_labels(process=process, alias=alias)} {value}")
+
+    _render_tasks(lines, snapshots)
+
+    lines.append("# HELP celery_queue_length Messages waiting in the broker")
+    lines.append("# TYPE celery_queue_length gauge")
+    for queue, length in sorted(queue_lengths().items()):
+        lines.append(f"celery_queue_length{_labels(queue=queue)} {length}")
+    return "\n".join(lines) + "\n"
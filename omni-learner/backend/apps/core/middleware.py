@@ -0,0 +1,90 @@
+import hashlib
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+from .db.routers import read_from_replica, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """Serve safe-method requests from replicas, with read-your-writes
+
+    A client that sent a write is pinned to the primary for
+    REPLICA_STICKY_SECONDS. Clients are identified by a hash of their
+    Authorization header (JWT) or session cookie; the pin lives in the cache
+    so it holds across web processes.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+
+        client = self._client_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if client:
+                try:
+                    cache.set(client, 1, settings.REPLICA_STICKY_SECONDS)
+                except Exception:
+                    logger.warning("Could not pin client to the primary database")
+            return response
+
+        try:
+            pinned = client is not None and cache.get(client)
+        except Exception:
+            # Không kiểm tra được -> an toàn: đọc từ primary
+            pinned = True
+        if pinned:
+            return self.get_response(request)
+
+        with read_from_replica():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        client = self._client_key(request)
+        if request.method not in SAFE_METHODS:
+            response = await self.get_response(request)
+            if client:
+                try:
+                    await cache.aset(client, 1, settings.REPLICA_STICKY_SECONDS)
+                except Exception:
+                    logger.warning("Could not pin client to the primary database")
+            return response
+
+        try:
+            pinned = client is not None and await cache.aget(client)
+        except Exception:
+            pinned = True
+        if pinned:
+            return await self.get_response(request)
+
+        with read_from_replica():
+            return await self.get_response(request)
+
+    def _client_key(self, request):
+        identity = request.headers.get("Authorization") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME
+        )
+        if not identity:
+            return None
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:32]
+        return f"db-sticky:{digest}"
@@ -10,3 +10,37 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(models.Model):
+    """A Celery task call recorded in the same transaction as its cause
+
+    Rows are written by ``apps.core.outbox.enqueue`` and published by the
+    relay in id order, so calls sharing an ``ordering_key`` (e.g.
+    "board:12") reach the broker in the order they were inserted (see the
+    settle window in ``apps.core.outbox``).
+    """
+
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    ordering_key = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "core_outbox_messages"
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="core_outbox_pending_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+            models.Index(fields=["sent_at"], name="core_outbox_sent_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.id}"
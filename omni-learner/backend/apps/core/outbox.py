@@ -0,0 +1,157 @@
+"""Transactional outbox for Celery side effects
+
+Views and tasks call ``enqueue()`` instead of ``.delay()``: the call is an
+INSERT in the current transaction (the request's, under ATOMIC_REQUESTS), so
+it is published only if the change that caused it commits, and the request
+never waits on the broker. ``relay()`` (the relay_outbox beat job) publishes
+pending rows in id order over one broker connection and marks them sent in
+the same transaction. Rows younger than OUTBOX_SETTLE_SECONDS are left for
+the next run.
+
+Delivery is at least once: a crash between publishing and committing the
+batch publishes those rows again, under the same ``outbox-<id>`` task id, so
+consumers must be idempotent; ``already_delivered()`` / ``mark_delivered()``
+let a task skip repeats of a message it already handled.
+Messages with an ``ordering_key`` (e.g. ``board:<id>``) are published in id
+order per key; a message that cannot be published holds back the later ones
+with the same key. Ids are assigned at INSERT, not at commit: a transaction
+that took a lower id but commits later would be published after a higher id
+of the same key. The settle window covers transactions that commit within
+OUTBOX_SETTLE_SECONDS of their ``enqueue()``; a longer one can still be
+overtaken. Publish order is not execution order either: with several
+workers (or prefetch) two messages of one key can still run concurrently or
+finish out of order.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, *args, ordering_key="", **kwargs):
+    """Record ``task.delay(*args, **kwargs)`` for the relay to publish
+
+    ``task`` is a Celery task or its name; arguments must be JSON-friendly.
+    """
+    return OutboxMessage.objects.create(
+        task=getattr(task, "name", task),
+        args=list(args),
+        kwargs=kwargs,
+        ordering_key=ordering_key,
+    )
+
+
+def _publish_batch(app, messages):
+    """Publish ``messages`` in order; returns (sent ids, {id: error})"""
+    sent, failed = [], {}
+    blocked_keys = set()
+    with app.producer_or_acquire() as producer:
+        for message in messages:
+            if message.ordering_key and message.ordering_key in blocked_keys:
+                continue
+            try:
+                app.send_task(
+                    message.task,
+                    args=message.args,
+                    kwargs=message.kwargs,
+                    # Gửi lại cùng id: already_delivered() nhận diện bản trùng
+                    task_id=f"outbox-{message.id}",
+                    producer=producer,
+                )
+            except Exception as exc:
+                logger.warning("Could not publish outbox message %s", message.id)
+                failed[message.id] = repr(exc)
+                if message.ordering_key:
+                    blocked_keys.add(message.ordering_key)
+            else:
+                sent.append(message.id)
+    return sent, failed
+
+
+def _delivered_key(task):
+    task_id = task.request.id or ""
+    return f"outbox-delivered:{task_id}" if task_id.startswith("outbox-") else None
+
+
+def already_delivered(task):
+    """True if this outbox message was already handled by ``task``
+
+    Call at the start of a bound task, and ``mark_delivered()`` once its
+    side effect succeeded; calls not published by the relay never match.
+    """
+    key = _delivered_key(task)
+    if key is None:
+        return False
+    try:
+        return cache.get(key) is not None
+    except Exception:
+        logger.warning("Outbox delivery marker unavailable for %s", key)
+        return False
+
+
+def mark_delivered(task):
+    """Remember for OUTBOX_RETENTION_HOURS that ``task`` handled its message"""
+    key = _delivered_key(task)
+    if key is None:
+        return
+    try:
+        cache.set(key, 1, settings.OUTBOX_RETENTION_HOURS * 3600)
+    except Exception:
+        logger.warning("Could not mark outbox message %s delivered", key)
+
+
+def relay(batch_size=None, max_batches=20):
+    """Publish pending outbox messages; returns how many were sent"""
+    from config.celery import app
+
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    total = 0
+    # Chờ giao dịch có id nhỏ hơn kịp commit trước khi gửi id lớn hơn
+    settled = timezone.now() - timedelta(seconds=settings.OUTBOX_SETTLE_SECONDS)
+    pending = OutboxMessage.objects.filter(sent_at__isnull=True, created_at__lt=settled)
+    for _ in range(max_batches):
+        with transaction.atomic():
+            # Relay chạy đơn lẻ (single_instance); khoá hàng chỉ để an toàn
+            messages = list(pending.select_for_update().order_by("id")[:batch_size])
+            if not messages:
+                break
+
+            sent, failed = _publish_batch(app, messages)
+            OutboxMessage.objects.filter(id__in=sent).update(sent_at=timezone.now())
+            for message in messages:
+                if message.id in failed:
+                    message.attempts += 1
+                    message.last_error = failed[message.id]
+            OutboxMessage.objects.bulk_update(
+                [message for message in messages if message.id in failed],
+                ["attempts", "last_error"],
+            )
+
+        total += len(sent)
+        if failed or len(messages) < batch_size:
+            # Broker lỗi hoặc đã hết hàng đợi: thử lại ở lần chạy sau
+            break
+    return total
+
+
+def purge_sent(batch_size=5000):
+    """Delete messages sent more than OUTBOX_RETENTION_HOURS ago"""
+    cutoff = timezone.now() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+    deleted = 0
+    while True:
+        ids = list(
+            OutboxMessage.objects.filter(sent_at__lt=cutoff).values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += OutboxMessage.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,21 @@
+"""Shared Redis client for buffers, counters and locks"""
+
+from django.conf import settings
+
+_client = None
+
+
+def get_redis():
+    """Return a process-wide Redis client (created lazily, after fork)"""
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def reset_redis():
+    """Forget the client so a forked child builds its own connections"""
+    global _client
+    _client = None
@@ -0,0 +1,78 @@
+import logging
+import reprlib
+import time
+from datetime import datetime
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.conf import settings
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# task id -> (wall clock, monotonic) at task_prerun
+_started = {}
+
+_args_repr = reprlib.Repr()
+_args_repr.maxstring = 200
+_args_repr.maxother = 200
+
+
+@receiver(request_finished)
+def publish_web_metrics(sender, **kwargs):
+    metrics.publish()
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    # Đọc lại ở worker qua task.request.enqueued_at
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+@task_prerun.connect
+def start_task_clock(task_id=None, **kwargs):
+    _started[task_id] = (time.time(), time.monotonic())
+
+
+def _queue_wait(request, started_at):
+    """Seconds between enqueue (or the ETA, if later) and start"""
+    enqueued_at = getattr(request, "enqueued_at", None)
+    if enqueued_at is None:
+        return None
+    eta = request.eta
+    if eta:
+        if isinstance(eta, str):
+            eta = datetime.fromisoformat(eta)
+        enqueued_at = max(enqueued_at, eta.timestamp())
+    return max(started_at - enqueued_at, 0.0)
+
+
+@task_postrun.connect
+def record_task_metrics(
+    sender=None, task_id=None, task=None, args=None, kwargs=None, state=None, **extra
+):
+    started = _started.pop(task_id, None)
+    if task is not None and started is not None:
+        started_at, started_clock = started
+        request = task.request
+        queue = (request.delivery_info or {}).get("routing_key") or "eager"
+        wait = _queue_wait(request, started_at)
+        run = time.monotonic() - started_clock
+        metrics.record_task(task.name, queue, state or "UNKNOWN", wait, run)
+
+        if run >= settings.METRICS_SLOW_TASK_SECONDS:
+            logger.warning(
+                "Slow task %s[%s] on %s: ran %.1fs after waiting %s, args=%s kwargs=%s",
+                task.name,
+                task_id,
+                queue,
+                run,
+                "?" if wait is None else f"{wait:.1f}s",
+                _args_repr.repr(args),
+                _args_repr.repr(kwargs),
+            )
+
+    metrics.publish()
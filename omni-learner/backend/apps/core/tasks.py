@@ -0,0 +1,18 @@
+from celery import shared_task
+
+from .locks import single_instance
+from .outbox import purge_sent, relay
+
+
+@shared_task
+@single_instance(ttl=60)
+def relay_outbox():
+    """Publish committed outbox messages to the broker"""
+    return relay()
+
+
+@shared_task
+@single_instance(ttl=10 * 60)
+def purge_outbox():
+    """Drop outbox messages that were sent long enough ago"""
+    return purge_sent()
@@ -1,3 +1,21 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from .metrics import render_metrics
+
+
+@require_GET
+@transaction.non_atomic_requests
+def metrics(request):
+    """Prometheus scrape endpoint (Bearer METRICS_TOKEN when configured)"""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,3 +1,33 @@
 from django.contrib import admin
+from .models import DeepWorkSession, FocusBitmap, Pomodoro
 
-# Register your models here.
+
+class PomodoroInline(admin.TabularInline):
+    model = Pomodoro
+    extra = 0
+    readonly_fields = ["kind", "started_at", "ended_at", "duration_seconds"]
+
+
+@admin.register(DeepWorkSession)
+class DeepWorkSessionAdmin(admin.ModelAdmin):
+    list_display = [
+        "user",
+        "state",
+        "started_at",
+        "focus_seconds",
+        "interruptions",
+        "pomodoros_completed",
+    ]
+    list_filter = ["state", "started_at"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user", "card"]
+    readonly_fields = ["created_at", "updated_at"]
+    inlines = [PomodoroInline]
+
+
+@admin.register(FocusBitmap)
+class FocusBitmapAdmin(admin.ModelAdmin):
+    list_display = ["user", "date", "updated_at"]
+    list_filter = ["date"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
@@ -0,0 +1,154 @@
+"""Per-minute focus history packed into one 1440-bit bitmap per user-day
+
+Minutes are in local time. Days are stacked into a (days, 180) uint8 matrix
+so streaks, heatmaps and totals are vectorized NumPy operations. NumPy is
+imported on first use, keeping it out of web and worker start-up.
+"""
+
+import math
+from datetime import timedelta
+from functools import lru_cache
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import FocusBitmap
+
+MINUTES_PER_DAY = 1440
+BITMAP_BYTES = MINUTES_PER_DAY // 8
+
+
+@lru_cache(maxsize=None)
+def popcount_table():
+    """Set bits of every byte value (NumPy 1.x has no bitwise_count)"""
+    import numpy as np
+
+    return np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def empty_bitmap():
+    import numpy as np
+
+    return np.zeros(BITMAP_BYTES, dtype=np.uint8)
+
+
+def split_minutes(start, end):
+    """Yield (local date, first minute, last minute + 1) covered by [start, end)"""
+    start = timezone.localtime(start)
+    end = timezone.localtime(end)
+    while start < end:
+        day_start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = min(end, day_start + timedelta(days=1))
+
+        first = start.hour * 60 + start.minute
+        last = (day_end - day_start).total_seconds() / 60
+        yield start.date(), first, min(math.ceil(last), MINUTES_PER_DAY)
+
+        start = day_end
+
+
+def record_focus(intervals):
+    """OR focused (user_id, start, end) intervals into the stored bitmaps
+
+    Builds every touched day in memory, makes sure each day has a row
+    (INSERT ... ON CONFLICT DO NOTHING), then locks all of them at once,
+    ORs in Python and writes them back with one bulk UPDATE. Because every
+    row exists before the SELECT FOR UPDATE, concurrent flushes of the same
+    day queue on the row lock and each ORs into the other's result.
+    """
+    import numpy as np
+
+    days = {}
+    for user_id, start, end in intervals:
+        for date, first, last in split_minutes(start, end):
+            minutes = days.setdefault(
+                (user_id, date), np.zeros(MINUTES_PER_DAY, dtype=bool)
+            )
+            minutes[first:last] = True
+    if not days:
+        return 0
+
+    keys = sorted(days)
+    user_ids = {user_id for user_id, _ in keys}
+    dates = {date for _, date in keys}
+    with transaction.atomic():
+        # Hàng rỗng cho ngày mới; thứ tự cố định để tránh deadlock
+        FocusBitmap.objects.bulk_create(
+            [
+                FocusBitmap(user_id=user_id, date=date, bits=bytes(BITMAP_BYTES))
+                for user_id, date in keys
+            ],
+            ignore_conflicts=True,
+        )
+        stored = (
+            FocusBitmap.objects.select_for_update()
+            .filter(user_id__in=user_ids, date__in=dates)
+            .order_by("user_id", "date")
+            .values_list("id", "user_id", "date", "bits")
+        )
+
+        now = timezone.now()
+        rows = []
+        for row_id, user_id, date, bits in stored:
+            minutes = days.get((user_id, date))
+            if minutes is None:
+                continue
+            merged = np.bitwise_or(
+                np.packbits(minutes), np.frombuffer(bytes(bits), dtype=np.uint8)
+            )
+            rows.append(FocusBitmap(id=row_id, bits=merged.tobytes(), updated_at=now))
+
+        FocusBitmap.objects.bulk_update(rows, ["bits", "updated_at"])
+    return len(rows)
+
+
+def load_matrix(user_id, start, end):
+    """Bitmaps for start..end (inclusive) as a (days, 180) uint8 matrix"""
+    import numpy as np
+
+    length = (end - start).days + 1
+    matrix = np.zeros((length, BITMAP_BYTES), dtype=np.uint8)
+    rows = FocusBitmap.objects.filter(
+        user_id=user_id, date__gte=start, date__lte=end
+    ).values_list("date", "bits")
+    for date, bits in rows:
+        matrix[(date - start).days] = np.frombuffer(bytes(bits), dtype=np.uint8)
+    return matrix
+
+
+def minutes_per_day(matrix):
+    """Focused minutes of each day (popcount per row)"""
+    import numpy as np
+
+    return popcount_table()[matrix].sum(axis=1, dtype=np.int64)
+
+
+def minutes_per_hour(matrix):
+    """Focused minutes per hour of day (24 values) summed over all days"""
+    import numpy as np
+
+    bits = np.unpackbits(matrix, axis=1)
+    return bits.reshape(-1, 24, 60).sum(axis=(0, 2), dtype=np.int64)
+
+
+def streaks(active):
+    """(current, longest) run of True values in a per-day boolean array
+
+    The current streak ends today, or yesterday if today is still empty.
+    """
+    import numpy as np
+
+    if not active.any():
+        return 0, 0
+
+    # Độ dài các đoạn True liên tiếp
+    padded = np.concatenate(([False], active, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    runs = edges[1::2] - edges[::2]
+    longest = int(runs.max())
+
+    current = 0
+    if active[-1] or (len(active) > 1 and active[-2]):
+        end = len(active) if active[-1] else len(active) - 1
+        current = int(runs[edges[1::2] == end][0])
+    return current, longest
@@ -0,0 +1,99 @@
+"""Heartbeat ingestion buffer
+
+Heartbeats are appended to a Redis list (or an in-process deque) by the API
+and drained in batches by ``flush_heartbeats``; the request path never
+touches the database. ``batch()`` only acknowledges a batch once the block
+processing it exits cleanly: a failed or killed flush leaves the beats to
+be processed again (replays are dropped by the state machine as late).
+"""
+
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from apps.core.redis import get_redis
+
+BUFFER_KEY = "deepwork:heartbeats"
+PROCESSING_KEY = "deepwork:heartbeats:processing"
+
+# Chuyển tối đa ARGV[1] phần tử sang list processing trong một round trip
+CLAIM_SCRIPT = """
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+    local item = redis.call("lmove", KEYS[1], KEYS[2], "LEFT", "RIGHT")
+    if not item then
+        break
+    end
+    items[i] = item
+end
+return items
+"""
+
+
+class RedisHeartbeatBuffer:
+    """Heartbeats in a Redis list shared by all web processes"""
+
+    def push(self, beat):
+        get_redis().rpush(BUFFER_KEY, json.dumps(beat))
+
+    @contextmanager
+    def batch(self, limit):
+        """Claim up to ``limit`` beats into the processing list
+
+        The list is cleared only after the block succeeds; a batch left
+        there by a failed flush is handed out again first.
+        """
+        client = get_redis()
+        items = client.lrange(PROCESSING_KEY, 0, -1)
+        if not items:
+            items = client.eval(CLAIM_SCRIPT, 2, BUFFER_KEY, PROCESSING_KEY, limit)
+        yield [json.loads(item) for item in items]
+        client.delete(PROCESSING_KEY)
+
+
+class LocalHeartbeatBuffer:
+    """In-process buffer for single-process deployments and development"""
+
+    def __init__(self):
+        self._items = deque()
+        self._lock = threading.Lock()
+        # Một batch tại một thời điểm: giữ thứ tự heartbeat giữa các thread
+        self._flush_lock = threading.Lock()
+
+    def push(self, beat):
+        with self._lock:
+            self._items.append(beat)
+
+    @contextmanager
+    def batch(self, limit):
+        """Take up to ``limit`` beats; put them back if the block fails"""
+        with self._flush_lock:
+            with self._lock:
+                count = min(limit, len(self._items))
+                beats = [self._items.popleft() for _ in range(count)]
+            try:
+                yield beats
+            except BaseException:
+                with self._lock:
+                    self._items.extendleft(reversed(beats))
+                raise
+
+    def __len__(self):
+        return len(self._items)
+
+
+_buffer = None
+
+
+def get_buffer():
+    """Process-wide heartbeat buffer configured from settings"""
+    global _buffer
+    if _buffer is None:
+        if settings.DEEPWORK_BUFFER_BACKEND == "local":
+            _buffer = LocalHeartbeatBuffer()
+        else:
+            _buffer = RedisHeartbeatBuffer()
+    return _buffer
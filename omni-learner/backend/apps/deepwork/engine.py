@@ -0,0 +1,196 @@
+"""Server-side session state machine
+
+States: focus <-> break, focus/break -> interrupted (heartbeats stopped for
+longer than DEEPWORK_INTERRUPT_SECONDS), any -> completed ("end" heartbeat).
+Totals are credited from the gaps between consecutive heartbeats, so a
+silent client never accrues focus time.
+"""
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .bitmaps import record_focus
+from .models import DeepWorkSession, Heartbeat, Pomodoro
+
+SESSION_FIELDS = [
+    "state",
+    "ended_at",
+    "phase_started_at",
+    "last_heartbeat_at",
+    "focus_seconds",
+    "break_seconds",
+    "interruptions",
+    "pomodoros_completed",
+    "updated_at",
+]
+
+
+def _close_phase(session, ended_at, pomodoros):
+    """Record the current phase as a Pomodoro row (appended to ``pomodoros``)"""
+    duration = int((ended_at - session.phase_started_at).total_seconds())
+    if duration <= 0 or session.state == "completed":
+        return
+
+    pomodoros.append(
+        Pomodoro(
+            session=session,
+            kind=session.state,
+            started_at=session.phase_started_at,
+            ended_at=ended_at,
+            duration_seconds=duration,
+        )
+    )
+    if session.state == "focus" and duration >= session.planned_focus_minutes * 60:
+        session.pomodoros_completed += 1
+
+
+def interrupt(session, at, pomodoros):
+    """Timer went silent after ``at``: close the phase and mark interrupted"""
+    _close_phase(session, at, pomodoros)
+    if session.state == "focus":
+        session.interruptions += 1
+    session.state = "interrupted"
+    session.phase_started_at = at
+
+
+def apply_heartbeat(session, state, timestamp, pomodoros, focused=None):
+    """Advance ``session`` by one heartbeat; returns False if it was ignored
+
+    ``state`` is what the client is doing now: "focus", "break" or "end".
+    Credited focus intervals are appended to ``focused`` when given.
+    """
+    if session.state == "completed":
+        return False
+
+    last = session.last_heartbeat_at or session.started_at
+    if timestamp <= last:
+        # Trùng lặp hoặc đến trễ
+        return False
+
+    gap = (timestamp - last).total_seconds()
+    if gap > settings.DEEPWORK_INTERRUPT_SECONDS:
+        if session.state != "interrupted":
+            interrupt(session, last, pomodoros)
+    elif session.state == "focus":
+        session.focus_seconds += int(round(gap))
+        if focused is not None:
+            focused.append((session.user_id, last, timestamp))
+    elif session.state == "break":
+        session.break_seconds += int(round(gap))
+
+    target = "completed" if state == "end" else state
+    if target != session.state:
+        _close_phase(session, timestamp, pomodoros)
+        session.state = target
+        session.phase_started_at = timestamp
+        if target == "completed":
+            session.ended_at = timestamp
+
+    session.last_heartbeat_at = timestamp
+    return True
+
+
+def end_sessions(sessions, at):
+    """Complete ``sessions`` as if each had sent an "end" heartbeat at ``at``
+
+    Closes the open phase and credits the time since the last heartbeat, so
+    totals match a client-ended session even when its last beats are still
+    in the buffer (those are dropped at flush as late).
+    """
+    with transaction.atomic():
+        sessions = list(
+            sessions.select_for_update().exclude(state="completed").order_by("id")
+        )
+        pomodoros, focused = [], []
+        for session in sessions:
+            if not apply_heartbeat(session, "end", at, pomodoros, focused):
+                # Heartbeat cuối mới hơn ``at``: kết thúc tại heartbeat đó
+                _close_phase(session, session.last_heartbeat_at, pomodoros)
+                session.state = "completed"
+                session.ended_at = session.last_heartbeat_at
+            session.updated_at = at
+
+        Pomodoro.objects.bulk_create(pomodoros, batch_size=1000)
+        DeepWorkSession.objects.bulk_update(sessions, SESSION_FIELDS, batch_size=500)
+        record_focus(focused)
+    return len(sessions)
+
+
+def process_heartbeats(beats):
+    """Persist a drained batch of heartbeats and update session totals
+
+    One SELECT ... FOR UPDATE for the sessions involved, then bulk INSERTs
+    for heartbeats and closed phases, a single bulk UPDATE for sessions and
+    one upsert of the focus bitmaps.
+    """
+    beats = sorted(beats, key=lambda beat: beat["ts"])
+    session_ids = {beat["session"] for beat in beats}
+
+    with transaction.atomic():
+        sessions = {
+            session.id: session
+            for session in DeepWorkSession.objects.select_for_update()
+            .filter(id__in=session_ids)
+            .exclude(state="completed")
+        }
+
+        heartbeats, pomodoros, focused, changed = [], [], [], {}
+        for beat in beats:
+            session = sessions.get(beat["session"])
+            if session is None or session.user_id != beat["user"]:
+                continue
+
+            timestamp = datetime.fromisoformat(beat["ts"])
+            if apply_heartbeat(session, beat["state"], timestamp, pomodoros, focused):
+                heartbeats.append(
+                    Heartbeat(
+                        session_id=session.id,
+                        timestamp=timestamp,
+                        state=beat["state"],
+                    )
+                )
+                changed[session.id] = session
+
+        now = timezone.now()
+        for session in changed.values():
+            session.updated_at = now
+
+        Heartbeat.objects.bulk_create(heartbeats, batch_size=1000)
+        Pomodoro.objects.bulk_create(pomodoros, batch_size=1000)
+        DeepWorkSession.objects.bulk_update(
+            changed.values(), SESSION_FIELDS, batch_size=500
+        )
+        record_focus(focused)
+
+    return len(heartbeats)
+
+
+def reap_stale_sessions(batch_size=500):
+    """Interrupt silent sessions and complete long-abandoned ones"""
+    now = timezone.now()
+    silent_since = now - timedelta(seconds=settings.DEEPWORK_INTERRUPT_SECONDS)
+
+    with transaction.atomic():
+        stale = list(
+            DeepWorkSession.objects.select_for_update(skip_locked=True).filter(
+                state__in=["focus", "break"], last_heartbeat_at__lt=silent_since
+            )[:batch_size]
+        )
+        pomodoros = []
+        for session in stale:
+            interrupt(session, session.last_heartbeat_at, pomodoros)
+            session.updated_at = now
+
+        Pomodoro.objects.bulk_create(pomodoros, batch_size=1000)
+        DeepWorkSession.objects.bulk_update(stale, SESSION_FIELDS, batch_size=500)
+
+    abandoned = DeepWorkSession.objects.filter(
+        state="interrupted",
+        last_heartbeat_at__lt=now
+        - timedelta(seconds=settings.DEEPWORK_ABANDON_SECONDS),
+    ).update(state="completed", ended_at=now, updated_at=now)
+
+    return len(stale), abandoned
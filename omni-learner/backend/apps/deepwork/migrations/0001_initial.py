@@ -0,0 +1,174 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("kanban", "0006_index_plan"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeepWorkSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("focus", "Focus"),
+                            ("break", "Break"),
+                            ("interrupted", "Interrupted"),
+                            ("completed", "Completed"),
+                        ],
+                        default="focus",
+                        max_length=12,
+                    ),
+                ),
+                ("planned_focus_minutes", models.IntegerField(default=25)),
+                ("planned_break_minutes", models.IntegerField(default=5)),
+                ("started_at", models.DateTimeField()),
+                ("ended_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "phase_started_at",
+                    models.DateTimeField(help_text="Start of the current phase"),
+                ),
+                ("last_heartbeat_at", models.DateTimeField(blank=True, null=True)),
+                ("focus_seconds", models.IntegerField(default=0)),
+                ("break_seconds", models.IntegerField(default=0)),
+                ("interruptions", models.IntegerField(default=0)),
+                ("pomodoros_completed", models.IntegerField(default=0)),
+                (
+                    "card",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="deepwork_sessions",
+                        to="kanban.card",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deepwork_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "deepwork_sessions",
+                "ordering": ["-started_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Heartbeat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                ("state", models.CharField(max_length=12)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="heartbeats",
+                        to="deepwork.deepworksession",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "deepwork_heartbeats",
+                "ordering": ["session", "timestamp"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Pomodoro",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("focus", "Focus"),
+                            ("break", "Break"),
+                            ("interrupted", "Interrupted"),
+                        ],
+                        max_length=12,
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("ended_at", models.DateTimeField()),
+                ("duration_seconds", models.IntegerField(default=0)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pomodoros",
+                        to="deepwork.deepworksession",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "deepwork_pomodoros",
+                "ordering": ["session", "started_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="deepworksession",
+            index=models.Index(
+                fields=["user", "-started_at"], name="deepwork_se_user_id_fcba96_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deepworksession",
+            index=models.Index(
+                fields=["state", "last_heartbeat_at"],
+                name="deepwork_se_state_8163d2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="heartbeat",
+            index=models.Index(
+                fields=["session", "timestamp"], name="deepwork_he_session_262b03_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pomodoro",
+            index=models.Index(
+                fields=["session", "started_at"], name="deepwork_po_session_eadecf_idx"
+            ),
+        ),
+    ]
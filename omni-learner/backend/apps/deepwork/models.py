@@ -1,3 +1,130 @@
 from django.db import models
+from django.conf import settings
 
-# Create your models here.
+from apps.core.models import BaseModel
+
+
+class DeepWorkSession(BaseModel):
+    """A focus session (chuỗi pomodoro) driven by client heartbeats"""
+
+    STATE_CHOICES = [
+        ("focus", "Focus"),
+        ("break", "Break"),
+        ("interrupted", "Interrupted"),
+        ("completed", "Completed"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="deepwork_sessions",
+    )
+    card = models.ForeignKey(
+        "kanban.Card",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="deepwork_sessions",
+    )
+
+    state = models.CharField(max_length=12, choices=STATE_CHOICES, default="focus")
+    planned_focus_minutes = models.IntegerField(default=25)
+    planned_break_minutes = models.IntegerField(default=5)
+
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(null=True, blank=True)
+    phase_started_at = models.DateTimeField(help_text="Start of the current phase")
+    last_heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    # Totals (computed by the server-side state machine)
+    focus_seconds = models.IntegerField(default=0)
+    break_seconds = models.IntegerField(default=0)
+    interruptions = models.IntegerField(default=0)
+    pomodoros_completed = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "deepwork_sessions"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["user", "-started_at"]),
+            models.Index(fields=["state", "last_heartbeat_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} session @ {self.started_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def is_active(self):
+        return self.state != "completed"
+
+
+class Pomodoro(models.Model):
+    """A closed focus or break phase of a session"""
+
+    KIND_CHOICES = [
+        ("focus", "Focus"),
+        ("break", "Break"),
+        ("interrupted", "Interrupted"),
+    ]
+
+    session = models.ForeignKey(
+        DeepWorkSession, on_delete=models.CASCADE, related_name="pomodoros"
+    )
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField()
+    duration_seconds = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "deepwork_pomodoros"
+        ordering = ["session", "started_at"]
+        indexes = [
+            models.Index(fields=["session", "started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.duration_seconds}s"
+
+
+class Heartbeat(models.Model):
+    """Raw client heartbeat (append-only, written in batches)"""
+
+    session = models.ForeignKey(
+        DeepWorkSession, on_delete=models.CASCADE, related_name="heartbeats"
+    )
+    timestamp = models.DateTimeField()
+    state = models.CharField(max_length=12)
+
+    class Meta:
+        db_table = "deepwork_heartbeats"
+        ordering = ["session", "timestamp"]
+        indexes = [
+            models.Index(fields=["session", "timestamp"]),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id} {self.state} @ {self.timestamp}"
+
+
+class FocusBitmap(models.Model):
+    """One day of focus history: bit i set = minute i (local time) focused
+
+    1440 bits packed into 180 bytes, so a year of history is ~65 KB.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="focus_bitmaps",
+    )
+    date = models.DateField()
+    bits = models.BinaryField(max_length=180)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "deepwork_focus_bitmaps"
+        ordering = ["user", "date"]
+        unique_together = ["user", "date"]
+
+    def __str__(self):
+        return f"{self.user_id} focus {self.date}"
@@ -0,0 +1,72 @@
+from rest_framework import serializers
+
+from .models import DeepWorkSession, Pomodoro
+
+
+class PomodoroSerializer(serializers.ModelSerializer):
+    """Serializer cho pomodoro phases"""
+
+    class Meta:
+        model = Pomodoro
+        fields = ["id", "kind", "started_at", "ended_at", "duration_seconds"]
+        read_only_fields = fields
+
+
+class DeepWorkSessionSerializer(serializers.ModelSerializer):
+    """Serializer cho deep work sessions"""
+
+    card_title = serializers.CharField(source="card.title", read_only=True)
+
+    class Meta:
+        model = DeepWorkSession
+        fields = [
+            "id",
+            "card",
+            "card_title",
+            "state",
+            "planned_focus_minutes",
+            "planned_break_minutes",
+            "started_at",
+            "ended_at",
+            "phase_started_at",
+            "last_heartbeat_at",
+            "focus_seconds",
+            "break_seconds",
+            "interruptions",
+            "pomodoros_completed",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "state",
+            "started_at",
+            "ended_at",
+            "phase_started_at",
+            "last_heartbeat_at",
+            "focus_seconds",
+            "break_seconds",
+            "interruptions",
+            "pomodoros_completed",
+            "created_at",
+            "updated_at",
+        ]
+
+    def validate_card(self, value):
+        if value and value.column.board.owner != self.context["request"].user:
+            raise serializers.ValidationError("Card not found")
+        return value
+
+
+class DeepWorkSessionDetailSerializer(DeepWorkSessionSerializer):
+    """Session kèm các pomodoro đã đóng"""
+
+    pomodoros = PomodoroSerializer(many=True, read_only=True)
+
+    class Meta(DeepWorkSessionSerializer.Meta):
+        fields = DeepWorkSessionSerializer.Meta.fields + ["pomodoros"]
+
+
+class HeartbeatSerializer(serializers.Serializer):
+    """Client heartbeat: what the timer is doing right now"""
+
+    state = serializers.ChoiceField(choices=["focus", "break", "end"])
@@ -0,0 +1,31 @@
+from celery import shared_task
+
+from apps.core.locks import single_instance
+
+from .buffer import get_buffer
+from .engine import process_heartbeats, reap_stale_sessions
+
+FLUSH_BATCH_SIZE = 5000
+
+
+@shared_task
+@single_instance(ttl=30)
+def flush_heartbeats():
+    """Drain buffered heartbeats into the database in batches
+
+    Each batch is one bulk INSERT of heartbeats plus one bulk UPDATE of the
+    sessions it touched, however many timers are running. Runs one at a
+    time so batches are applied in arrival order, and a batch is removed
+    from the buffer only after its transaction commits.
+    """
+    buffer = get_buffer()
+    stored = 0
+    while True:
+        with buffer.batch(FLUSH_BATCH_SIZE) as beats:
+            if beats:
+                stored += process_heartbeats(beats)
+        if len(beats) < FLUSH_BATCH_SIZE:
+            break
+
+    interrupted, abandoned = reap_stale_sessions()
+    return {"heartbeats": stored, "interrupted": interrupted, "abandoned": abandoned}
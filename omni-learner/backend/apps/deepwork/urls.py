@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r"sessions", views.DeepWorkSessionViewSet, basename="session")
+router.register(r"focus", views.FocusHistoryViewSet, basename="focus")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -1,3 +1,188 @@
-from django.shortcuts import render
+from datetime import date, timedelta
 
-# Create your views here.
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .bitmaps import (
+    load_matrix,
+    minutes_per_day,
+    minutes_per_hour,
+    streaks,
+)
+from .buffer import get_buffer
+from .engine import end_sessions, process_heartbeats
+from .models import DeepWorkSession, FocusBitmap
+from .serializers import (
+    DeepWorkSessionSerializer,
+    DeepWorkSessionDetailSerializer,
+    HeartbeatSerializer,
+)
+
+
+class DeepWorkSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    ViewSet for deep work sessions
+
+    create: Start a session (ends any other active session of the user)
+    heartbeat: Buffered timer heartbeat (focus / break / end)
+    active: Current active session
+    """
+
+    permission_classes = [IsAuthenticated]
+    # heartbeat đọc pk ngoài queryset: chỉ nhận id số
+    lookup_value_regex = r"\d+"
+
+    def get_queryset(self):
+        return DeepWorkSession.objects.filter(user=self.request.user).select_related(
+            "card"
+        )
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return DeepWorkSessionDetailSerializer
+        return DeepWorkSessionSerializer
+
+    def perform_create(self, serializer):
+        now = timezone.now()
+        # Mỗi user chỉ có một session đang chạy: kết thúc qua state machine
+        end_sessions(DeepWorkSession.objects.filter(user=self.request.user), now)
+        serializer.save(
+            user=self.request.user,
+            state="focus",
+            started_at=now,
+            phase_started_at=now,
+            last_heartbeat_at=now,
+        )
+
+    @action(detail=True, methods=["post"])
+    def heartbeat(self, request, pk=None):
+        """Queue a heartbeat; totals are applied by the next flush"""
+        serializer = HeartbeatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Không query DB: ownership được kiểm tra khi flush
+        buffer = get_buffer()
+        buffer.push(
+            {
+                "session": int(pk),
+                "user": request.user.id,
+                "state": serializer.validated_data["state"],
+                "ts": timezone.now().isoformat(),
+            }
+        )
+
+        # Backend local không có beat flush riêng
+        if settings.DEEPWORK_BUFFER_BACKEND == "local" and (
+            len(buffer) >= settings.DEEPWORK_LOCAL_FLUSH_SIZE
+            or serializer.validated_data["state"] == "end"
+        ):
+            with buffer.batch(len(buffer)) as beats:
+                process_heartbeats(beats)
+
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"])
+    def active(self, request):
+        """Get the current active session"""
+        session = self.get_queryset().exclude(state="completed").first()
+        if session is None:
+            return Response(
+                {"error": "No active session"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(DeepWorkSessionSerializer(session).data)
+
+
+class FocusHistoryViewSet(viewsets.ViewSet):
+    """
+    Focus analytics over the per-day minute bitmaps
+
+    heatmap: Focused minutes per day for a year (?year=)
+    streak: Current and longest streak of focus days
+    summary: Focus hours this week / month / year (?period=)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    PERIODS = ["week", "month", "year"]
+
+    @action(detail=False, methods=["get"])
+    def heatmap(self, request):
+        """Get per-day focused minutes for a calendar year"""
+        try:
+            year = int(request.query_params.get("year", timezone.localdate().year))
+            start, end = date(year, 1, 1), date(year, 12, 31)
+        except ValueError:
+            return Response(
+                {"error": "Invalid year"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        matrix = load_matrix(request.user.id, start, end)
+        minutes = minutes_per_day(matrix)
+        return Response(
+            {
+                "year": year,
+                "start": start,
+                "minutes": minutes.tolist(),
+                "by_hour": minutes_per_hour(matrix).tolist(),
+                "total_hours": round(int(minutes.sum()) / 60, 2),
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def streak(self, request):
+        """Get current and longest streak of focus days"""
+        today = timezone.localdate()
+        first = (
+            FocusBitmap.objects.filter(user=request.user)
+            .order_by("date")
+            .values_list("date", flat=True)
+            .first()
+        )
+        if first is None:
+            return Response({"current": 0, "longest": 0})
+
+        minutes = minutes_per_day(load_matrix(request.user.id, first, today))
+        current, longest = streaks(minutes >= settings.DEEPWORK_STREAK_MINUTES)
+        return Response({"current": current, "longest": longest})
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """Get focus totals for the current week, month or year"""
+        period = request.query_params.get("period", "week")
+        if period not in self.PERIODS:
+            return Response(
+                {"error": f"period must be one of {self.PERIODS}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        today = timezone.localdate()
+        if period == "week":
+            start = today - timedelta(days=today.weekday())
+        elif period == "month":
+            start = today.replace(day=1)
+        else:
+            start = today.replace(month=1, day=1)
+
+        matrix = load_matrix(request.user.id, start, today)
+        minutes = minutes_per_day(matrix)
+        best = int(minutes.argmax())
+        return Response(
+            {
+                "period": period,
+                "start": start,
+                "end": today,
+                "focus_hours": round(int(minutes.sum()) / 60, 2),
+                "active_days": int((minutes > 0).sum()),
+                "best_day": start + timedelta(days=best) if minutes[best] else None,
+                "by_hour": minutes_per_hour(matrix).tolist(),
+            }
+        )
@@ -1,6 +1,18 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Board, Column, Card, Sprint, Comment, CardAttachment
+from .models import (
+    Board,
+    Column,
+    Card,
+    CardEvent,
+    CardReminder,
+    Sprint,
+    SprintSnapshot,
+    Comment,
+    CardAttachment,
+    AttachmentBlob,
+    UploadSession,
+)
 
 
 @admin.register(Board)
@@ -208,6 +220,20 @@ class SprintAdmin(admin.ModelAdmin):
     completion_rate_display.short_description = "Completion"
 
 
+@admin.register(SprintSnapshot)
+class SprintSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        "sprint",
+        "date",
+        "total_cards",
+        "remaining_cards",
+        "remaining_hours",
+        "completed_points",
+    ]
+    list_filter = ["sprint__board", "date"]
+    readonly_fields = ["created_at"]
+
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ["card", "author", "content_preview", "is_edited", "created_at"]
@@ -232,6 +258,7 @@ class CardAttachmentAdmin(admin.ModelAdmin):
     ]
     list_filter = ["created_at"]
     search_fields = ["filename", "card__title"]
+    raw_id_fields = ["blob"]
     readonly_fields = ["file_size", "created_at", "updated_at"]
 
     def file_size_display(self, obj):
@@ -241,3 +268,37 @@ class CardAttachmentAdmin(admin.ModelAdmin):
         return f"{size_kb/1024:.1f} MB"
 
     file_size_display.short_description = "Size"
+
+
+@admin.register(CardEvent)
+class CardEventAdmin(admin.ModelAdmin):
+    list_display = ["event_type", "card", "board", "actor", "timestamp"]
+    list_filter = ["event_type", "board"]
+    search_fields = ["card__title", "actor__email"]
+    raw_id_fields = ["card", "board", "actor", "from_column", "to_column"]
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CardReminder)
+class CardReminderAdmin(admin.ModelAdmin):
+    list_display = ["card", "kind", "remind_at", "sent_at"]
+    list_filter = ["kind", "sent_at"]
+    search_fields = ["card__title"]
+    raw_id_fields = ["card"]
+
+
+@admin.register(AttachmentBlob)
+class AttachmentBlobAdmin(admin.ModelAdmin):
+    list_display = ["sha256", "size", "content_type", "ref_count", "created_at"]
+    search_fields = ["sha256"]
+    readonly_fields = ["sha256", "size", "ref_count", "released_at", "created_at"]
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ["filename", "uploaded_by", "received", "size", "created_at"]
+    search_fields = ["filename", "uploaded_by__email"]
+    raw_id_fields = ["card", "uploaded_by", "attachment"]
+    readonly_fields = ["received", "created_at", "updated_at"]
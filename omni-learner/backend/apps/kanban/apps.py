@@ -5,3 +5,6 @@ class KanbanConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.kanban"
     label = "kanban"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,230 @@
+"""Async read endpoints for ASGI deployments
+
+DRF 3.14 views are sync-only, so with KANBAN_ASYNC_READS (on by default in
+config.asgi) GET on board detail, board statistics and the card list is
+served by these plain async views. They authenticate like the API, reuse its
+serializers with counts loaded up front, and fan independent queries out
+with run_parallel(). Statistics are computed once per burst of concurrent
+requests (single_flight), as in the viewset. Other methods on the same URLs
+fall through to the viewsets.
+
+Parallel queries use separate connections, so unlike the ATOMIC_REQUESTS
+viewsets a response is not read from a single snapshot.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections, models, transaction
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.core.db.concurrent import run_parallel
+from apps.core.locks import single_flight
+from apps.users.authentication import CachedJWTAuthentication
+
+from .metrics import board_statistics
+from .models import Board, Card, CardAttachment, Column, Comment
+from .serializers import BoardDetailSerializer, CardSerializer
+from .views import BoardViewSet, CardViewSet
+
+authenticator = CachedJWTAuthentication()
+
+
+def _json(data, status=200, headers=None):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def _error(detail, status):
+    """Error body in DRF's format"""
+    return _json(
+        detail if isinstance(detail, (dict, list)) else {"detail": detail}, status
+    )
+
+
+async def _authenticate(request):
+    """(user, None), or (None, the 401 response DRF would send)"""
+    try:
+        result = await sync_to_async(authenticator.authenticate)(request)
+        detail = "Authentication credentials were not provided."
+    except APIException as exc:
+        result, detail = None, exc.detail
+
+    if result is None:
+        response = _error(detail, 401)
+        response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+        return None, response
+
+    # ActivityTrackingMiddleware đọc request.user sau view
+    request.user = result[0]
+    return result[0], None
+
+
+def _counts_by_card(model, **filters):
+    return dict(
+        model.objects.filter(**filters)
+        .order_by()
+        .values_list("card")
+        .annotate(total=models.Count("id"))
+    )
+
+
+def _set_counts(cards, comments, attachments):
+    for card in cards:
+        card.comment_total = comments.get(card.id, 0)
+        card.attachment_total = attachments.get(card.id, 0)
+
+
+async def _board_detail(request, pk):
+    user, denied = await _authenticate(request)
+    if denied:
+        return denied
+
+    owned_cards = {"card__column__board_id": pk, "card__column__board__owner": user}
+    board, columns, comments, attachments = await run_parallel(
+        lambda: Board.objects.select_related("owner").filter(pk=pk, owner=user).first(),
+        lambda: list(
+            Column.objects.filter(board_id=pk, board__owner=user).prefetch_related(
+                models.Prefetch(
+                    "cards", queryset=Card.objects.select_related("assigned_to")
+                )
+            )
+        ),
+        lambda: _counts_by_card(Comment, **owned_cards),
+        lambda: _counts_by_card(CardAttachment, **owned_cards),
+    )
+    if board is None:
+        return _error("Not found.", 404)
+
+    cards = [card for column in columns for card in column.cards.all()]
+    _set_counts(cards, comments, attachments)
+    board.loaded_columns = columns
+    board.column_total = len(columns)
+    board.card_total = len(cards)
+    return _json(BoardDetailSerializer(board).data)
+
+
+async def _board_statistics(request, pk):
+    user, denied = await _authenticate(request)
+    if denied:
+        return denied
+
+    exists, stats = await run_parallel(
+        lambda: Board.objects.filter(pk=pk, owner=user).exists(),
+        lambda: single_flight(f"board-statistics:{pk}", lambda: board_statistics(pk)),
+    )
+    if not exists:
+        return _error("Not found.", 404)
+    return _json(stats)
+
+
+async def _card_list(request):
+    user, denied = await _authenticate(request)
+    if denied:
+        return denied
+
+    # Lọc / tìm kiếm / sắp xếp giống hệt CardViewSet.list
+    view = CardViewSet(
+        action="list", args=(), kwargs={}, format_kwarg=None, detail=False
+    )
+    view.request = Request(request)
+    view.request.user = user
+    try:
+        queryset = await sync_to_async(
+            lambda: view.filter_queryset(view.get_queryset())
+        )()
+    except APIException as exc:
+        return _error(exc.detail, exc.status_code)
+
+    pagination = view.paginator
+    page_size = pagination.get_page_size(view.request)
+    number = request.GET.get(pagination.page_query_param) or 1
+    paginator = Paginator(queryset, page_size)
+    last = number in pagination.last_page_strings
+    if last:
+        (paginator.count,) = await run_parallel(queryset.count)
+        number = paginator.num_pages
+    try:
+        number = int(number)
+        if number < 1:
+            raise ValueError
+    except ValueError:
+        return _error("Invalid page.", 404)
+
+    start = (number - 1) * page_size
+    page_rows = lambda: list(queryset[start : start + page_size])  # noqa: E731
+    if last:
+        (rows,) = await run_parallel(page_rows)
+    else:
+        # Tổng số và trang kết quả được truy vấn song song
+        paginator.count, rows = await run_parallel(queryset.count, page_rows)
+    try:
+        paginator.validate_number(number)
+    except InvalidPage:
+        return _error("Invalid page.", 404)
+
+    ids = [card.id for card in rows]
+    comments, attachments = await run_parallel(
+        lambda: _counts_by_card(Comment, card_id__in=ids),
+        lambda: _counts_by_card(CardAttachment, card_id__in=ids),
+    )
+    _set_counts(rows, comments, attachments)
+
+    pagination.request = view.request
+    pagination.page = Page(rows, number, paginator)
+    serializer = CardSerializer(rows, many=True, context=view.get_serializer_context())
+    return _json(pagination.get_paginated_response(serializer.data).data)
+
+
+def _atomic(view):
+    """Wrap ``view`` the way ATOMIC_REQUESTS would"""
+    for alias, settings_dict in connections.settings.items():
+        if settings_dict["ATOMIC_REQUESTS"]:
+            view = transaction.atomic(using=alias)(view)
+    return view
+
+
+def read_async(async_view, viewset_view):
+    """Serve GET with ``async_view`` and every other method with the viewset"""
+    fallback = sync_to_async(_atomic(viewset_view))
+
+    @csrf_exempt
+    @transaction.non_atomic_requests
+    async def view(request, *args, **kwargs):
+        if request.method == "GET":
+            return await async_view(request, *args, **kwargs)
+        return await fallback(request, *args, **kwargs)
+
+    return view
+
+
+board_detail = read_async(
+    _board_detail,
+    BoardViewSet.as_view(
+        {
+            "get": "retrieve",
+            "put": "update",
+            "patch": "partial_update",
+            "delete": "destroy",
+        },
+        basename="board",
+        detail=True,
+    ),
+)
+board_statistics = read_async(
+    _board_statistics,
+    BoardViewSet.as_view({"get": "statistics"}, basename="board", detail=True),
+)
+card_list = read_async(
+    _card_list,
+    CardViewSet.as_view(
+        {"get": "list", "post": "create"}, basename="card", detail=False
+    ),
+)
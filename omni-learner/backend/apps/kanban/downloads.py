@@ -0,0 +1,173 @@
+"""Attachment downloads
+
+These views are the only way to read attachment content: MEDIA_ROOT is
+never served directly. After the ownership check the transfer is handed to the front-end server
+(X-Accel-Redirect / X-Sendfile) when configured. Otherwise a FileResponse
+serves the file, with single-range requests and conditional headers, and
+keeps a real file descriptor so the WSGI server can still use sendfile().
+"""
+
+import io
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFileWrapper:
+    """File-like view of ``length`` bytes of ``file`` starting at ``start``
+
+    No tell()/seek(), so FileResponse leaves Content-Length to the caller;
+    fileno() is passed through so servers can sendfile() from the current
+    offset for exactly Content-Length bytes.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        if not hasattr(self.file, "fileno"):
+            raise io.UnsupportedOperation("fileno")
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """(start, end) for a single "bytes=" range, None to serve the whole file
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header or "")
+    if not match:
+        # Không có Range, hoặc multi-range: trả cả file
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # "bytes=-500": 500 byte cuối
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _validators(attachment, thumbnail=None):
+    if thumbnail is not None:
+        etag = quote_etag(f"{attachment.blob.sha256}-{thumbnail.size}")
+        modified = attachment.blob.created_at
+    elif attachment.blob_id:
+        etag = quote_etag(attachment.blob.sha256)
+        modified = attachment.blob.created_at
+    else:
+        etag = quote_etag(f"{attachment.id}-{attachment.file_size}")
+        modified = attachment.updated_at
+    return etag, int(modified.timestamp())
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    return if_range == http_date(last_modified)
+
+
+def serve_attachment(request, attachment, as_attachment=True, thumbnail=None):
+    """Response for an already-authorized attachment (or thumbnail) download"""
+    etag, last_modified = _validators(attachment, thumbnail)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        # 304 Not Modified / 412 Precondition Failed
+        return response
+
+    if thumbnail is not None:
+        file = thumbnail.file
+        filename = f"{os.path.splitext(attachment.filename)[0]}-{thumbnail.size}.webp"
+        content_type = "image/webp"
+    else:
+        file = attachment.file
+        filename = attachment.filename
+        content_type = (
+            attachment.blob.content_type
+            if attachment.blob_id and attachment.blob.content_type
+            else mimetypes.guess_type(attachment.filename)[0]
+        ) or "application/octet-stream"
+    backend = settings.ATTACHMENT_SENDFILE_BACKEND
+
+    if backend == "nginx":
+        # nginx tự xử lý Range / conditional cho internal location
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.ATTACHMENT_SENDFILE_PREFIX + quote(
+            file.name
+        )
+    elif backend == "xsendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = file.path
+    else:
+        response = _file_response(request, file, content_type, etag, last_modified)
+        if response.status_code == 416:
+            return response
+
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment, filename
+    )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
+
+
+def _file_response(request, field_file, content_type, etag, last_modified):
+    file = field_file.open("rb")
+    size = field_file.size
+
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    response = FileResponse(
+        RangeFileWrapper(file, start, length), content_type=content_type
+    )
+    response["Content-Length"] = length
+    response["Accept-Ranges"] = "bytes"
+    if byte_range:
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
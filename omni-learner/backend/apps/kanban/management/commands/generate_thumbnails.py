@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.kanban.models import AttachmentBlob, CardAttachment
+from apps.kanban.previews import generate_thumbnails
+from apps.kanban.uploads import adopt_legacy_attachment
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _adopt_batch(attachment_ids):
+    return [adopt_legacy_attachment(attachment_id) for attachment_id in attachment_ids]
+
+
+def _thumbnail_batch(blob_ids):
+    return sum(generate_thumbnails(blob_id) for blob_id in blob_ids)
+
+
+def _batches(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+class Command(BaseCommand):
+    help = "Backfill attachment blobs and WebP thumbnails in parallel batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes (default: CPU count)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Attachments / blobs per worker batch",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        batch_size = options["batch_size"]
+
+        legacy_ids = list(
+            CardAttachment.objects.filter(blob__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        blob_ids = list(
+            AttachmentBlob.objects.filter(previews_at__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        # Worker mở kết nối DB riêng, không dùng chung socket của process cha
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            adopted = [
+                blob_id
+                for batch in pool.map(_adopt_batch, _batches(legacy_ids, batch_size))
+                for blob_id in batch
+                if blob_id is not None
+            ]
+            self.stdout.write(f"Adopted {len(adopted)} legacy attachments")
+
+            # Blob mới từ bước trên cũng cần thumbnail
+            pending = sorted(set(blob_ids) | set(adopted))
+            created = sum(pool.map(_thumbnail_batch, _batches(pending, batch_size)))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {created} thumbnails for {len(pending)} blobs"
+            )
+        )
@@ -0,0 +1,200 @@
+"""Board statistics, and burndown / velocity math over SprintSnapshot rows
+
+NumPy is imported on first use, keeping it out of web and worker start-up.
+"""
+
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+from .models import Card
+
+
+def board_statistics(board_id):
+    """Card counts and hours of a board in three aggregate queries
+
+    The caller checks that the board exists and belongs to the user.
+    """
+    cards = Card.objects.filter(column__board_id=board_id)
+    open_cards = models.Q(completed_at__isnull=True)
+
+    totals = cards.aggregate(
+        total_cards=models.Count("id"),
+        completed_cards=models.Count("id", filter=~open_cards),
+        in_progress_cards=models.Count(
+            "id", filter=open_cards & models.Q(started_at__isnull=False)
+        ),
+        overdue_cards=models.Count("id", filter=Card.overdue_q()),
+        total_estimated_hours=models.Sum("estimated_hours"),
+        total_actual_hours=models.Sum("actual_hours"),
+    )
+
+    def by_field(field):
+        return dict(
+            cards.order_by().values_list(field).annotate(total=models.Count("id"))
+        )
+
+    by_priority = by_field("priority")
+    by_status = by_field("status")
+    return {
+        "total_cards": totals["total_cards"],
+        "completed_cards": totals["completed_cards"],
+        "in_progress_cards": totals["in_progress_cards"],
+        "overdue_cards": totals["overdue_cards"],
+        "total_estimated_hours": float(totals["total_estimated_hours"] or 0),
+        "total_actual_hours": float(totals["total_actual_hours"] or 0),
+        "cards_by_priority": {
+            priority: by_priority.get(priority, 0)
+            for priority, _ in Card.PRIORITY_CHOICES
+        },
+        "cards_by_status": {
+            status: by_status.get(status, 0) for status, _ in Card.STATUS_CHOICES
+        },
+    }
+
+
+def _to_list(values, digits=2):
+    """Convert a float array to a JSON-friendly list (NaN -> None)"""
+    import numpy as np
+
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def _project_zero(days, remaining):
+    """Fit a line through the known points and return the day it hits zero"""
+    import numpy as np
+
+    known = ~np.isnan(remaining)
+    if known.sum() < 2:
+        return None
+
+    slope, intercept = np.polyfit(days[known], remaining[known], 1)
+    if slope >= 0:
+        # Không giảm thì không bao giờ xong
+        return None
+    return float(-intercept / slope)
+
+
+def compute_burndown(sprint, snapshots):
+    """Ideal vs actual burndown lines for a sprint
+
+    ``snapshots`` is an iterable of dicts with ``date``, ``total_cards``,
+    ``remaining_cards`` and ``remaining_hours``, ordered by date.
+    """
+    import numpy as np
+
+    start = np.datetime64(timezone.localtime(sprint.start_date).date(), "D")
+    end = np.datetime64(timezone.localtime(sprint.end_date).date(), "D")
+    length = max(int((end - start).astype(int)), 1)
+    days = np.arange(length + 1, dtype=float)
+    dates = start + np.arange(length + 1)
+
+    actual_cards = np.full(length + 1, np.nan)
+    actual_hours = np.full(length + 1, np.nan)
+
+    snapshots = list(snapshots)
+    if snapshots:
+        offsets = (
+            np.array([s["date"] for s in snapshots], dtype="datetime64[D]") - start
+        ).astype(int)
+        in_range = (offsets >= 0) & (offsets <= length)
+
+        totals = np.array([s["total_cards"] for s in snapshots], dtype=float)
+        cards = np.array([s["remaining_cards"] for s in snapshots], dtype=float)
+        hours = np.array([s["remaining_hours"] for s in snapshots], dtype=float)
+        actual_cards[offsets[in_range]] = cards[in_range]
+        actual_hours[offsets[in_range]] = hours[in_range]
+
+        # Scope = snapshot đầu tiên trong khoảng sprint
+        first = np.flatnonzero(in_range)[:1]
+        scope_cards = float(totals[first].sum())
+        scope_hours = float(hours[first].sum())
+    else:
+        scope_cards = scope_hours = 0.0
+
+    ideal_cards = np.linspace(scope_cards, 0, length + 1)
+    ideal_hours = np.linspace(scope_hours, 0, length + 1)
+
+    projected = _project_zero(days, actual_cards)
+    projected_date = None
+    if projected is not None:
+        projected_date = (start + int(np.ceil(projected))).astype(object).isoformat()
+
+    return {
+        "sprint": sprint.id,
+        "dates": [d.isoformat() for d in dates.astype(object)],
+        "ideal_cards": _to_list(ideal_cards),
+        "actual_cards": _to_list(actual_cards),
+        "ideal_hours": _to_list(ideal_hours),
+        "actual_hours": _to_list(actual_hours),
+        "projected_completion": projected_date,
+        "on_track": projected is not None and projected <= length,
+    }
+
+
+def compute_velocity(sprints, window=3):
+    """Rolling velocity over completed sprints and projection for the active one
+
+    ``sprints`` is an iterable of dicts with ``id``, ``name``, ``start_date``,
+    ``end_date``, ``planned_story_points``, ``completed_story_points``,
+    ``is_active`` and ``is_completed``, ordered by ``start_date``.
+    """
+    import numpy as np
+
+    sprints = list(sprints)
+    completed = [s for s in sprints if s["is_completed"]]
+    active = next((s for s in sprints if s["is_active"]), None)
+
+    points = np.array([s["completed_story_points"] for s in completed], dtype=float)
+    planned = np.array([s["planned_story_points"] for s in completed], dtype=float)
+    durations = np.array(
+        [(s["end_date"] - s["start_date"]).total_seconds() for s in completed],
+        dtype=float,
+    )
+
+    window = max(1, min(window, len(points) or 1))
+    if len(points):
+        # Trung bình trượt: cumsum thay vì vòng lặp
+        csum = np.cumsum(np.insert(points, 0, 0.0))
+        counts = np.minimum(np.arange(1, len(points) + 1), window)
+        starts = np.arange(1, len(points) + 1) - counts
+        rolling = (csum[1:] - csum[starts]) / counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(planned > 0, points / planned * 100, 0.0)
+    else:
+        rolling = ratio = np.array([])
+
+    projection = None
+    if active is not None and len(rolling) and rolling[-1] > 0:
+        remaining = max(
+            active["planned_story_points"] - active["completed_story_points"], 0
+        )
+        avg_duration = durations[-window:].mean()
+        sprints_needed = remaining / rolling[-1]
+        projection = {
+            "sprint": active["id"],
+            "remaining_points": remaining,
+            "sprints_needed": round(float(sprints_needed), 2),
+            "projected_completion": (
+                timezone.now() + timedelta(seconds=float(sprints_needed * avg_duration))
+            ).isoformat(),
+        }
+
+    return {
+        "window": window,
+        "sprints": [
+            {
+                "id": s["id"],
+                "name": s["name"],
+                "end_date": s["end_date"].isoformat(),
+                "planned_points": s["planned_story_points"],
+                "completed_points": s["completed_story_points"],
+                "completion_ratio": round(float(r), 2),
+                "rolling_velocity": round(float(v), 2),
+            }
+            for s, r, v in zip(completed, ratio, rolling)
+        ],
+        "average_velocity": round(float(rolling[-1]), 2) if len(rolling) else 0,
+        "projection": projection,
+    }
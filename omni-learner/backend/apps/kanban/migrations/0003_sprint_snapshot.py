@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0002_board_is_archived"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SprintSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("total_cards", models.IntegerField(default=0)),
+                ("remaining_cards", models.IntegerField(default=0)),
+                (
+                    "remaining_hours",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=8),
+                ),
+                ("completed_points", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "sprint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="kanban.sprint",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kanban_sprint_snapshots",
+                "ordering": ["sprint", "date"],
+                "unique_together": {("sprint", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0003_sprint_snapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CardEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("moved", "Moved"),
+                            ("started", "Started"),
+                            ("completed", "Completed"),
+                            ("updated", "Updated"),
+                            ("status_changed", "Status changed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Changed fields: {'status': ['normal', 'blocked']}",
+                    ),
+                ),
+                ("timestamp", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="card_events",
+                        to="kanban.board",
+                    ),
+                ),
+                (
+                    "card",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="kanban.card",
+                    ),
+                ),
+                (
+                    "from_column",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="kanban.column",
+                    ),
+                ),
+                (
+                    "to_column",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="kanban.column",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kanban_card_events",
+                "ordering": ["-timestamp"],
+                "indexes": [
+                    models.Index(
+                        fields=["board", "timestamp"],
+                        name="kanban_card_board_i_1b9d6f_idx",
+                    ),
+                    models.Index(
+                        fields=["card", "timestamp"],
+                        name="kanban_card_card_id_04ce84_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
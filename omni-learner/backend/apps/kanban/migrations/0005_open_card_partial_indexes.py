@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0004_card_event"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                condition=models.Q(("completed_at__isnull", True)),
+                fields=["due_date"],
+                name="kanban_card_open_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                condition=models.Q(("completed_at__isnull", True)),
+                fields=["status", "due_date"],
+                name="kanban_card_open_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0005_open_card_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="board",
+            index=models.Index(
+                fields=["owner", "-created_at"], name="kanban_boar_owner_i_3e2259_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                condition=models.Q(("completed_at__isnull", True)),
+                fields=["column", "position"],
+                include=("status", "priority", "due_date", "started_at"),
+                name="kanban_card_open_column_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                condition=models.Q(
+                    ("completed_at__isnull", True), ("started_at__isnull", False)
+                ),
+                fields=["column"],
+                name="kanban_card_in_progress_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cardattachment",
+            index=models.Index(
+                fields=["card", "-created_at"], name="kanban_atta_card_id_ce73ad_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["card", "created_at"], name="kanban_comm_card_id_112ed9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sprint",
+            index=models.Index(
+                fields=["board", "-start_date"], name="kanban_spri_board_i_ba190a_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0006_index_plan"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CardReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("due_soon", "Due soon"), ("due", "Due")],
+                        max_length=10,
+                    ),
+                ),
+                ("remind_at", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "card",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reminders",
+                        to="kanban.card",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kanban_card_reminders",
+                "ordering": ["remind_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("sent_at__isnull", True)),
+                        fields=["remind_at"],
+                        name="kanban_reminder_pending_idx",
+                    )
+                ],
+                "unique_together": {("card", "kind")},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+# Bản sao của REMINDER_OFFSETS tại thời điểm migration
+OFFSETS = {
+    "due_soon": timedelta(hours=24),
+    "due": timedelta(0),
+}
+
+
+def seed_reminders(apps, schema_editor):
+    """Schedule reminders for open cards that already have a future due date"""
+    Card = apps.get_model("kanban", "Card")
+    CardReminder = apps.get_model("kanban", "CardReminder")
+    now = timezone.now()
+
+    reminders = [
+        CardReminder(card_id=card_id, kind=kind, remind_at=due_date - offset)
+        for card_id, due_date in Card.objects.filter(
+            completed_at__isnull=True, due_date__gt=now
+        )
+        .values_list("id", "due_date")
+        .iterator()
+        for kind, offset in OFFSETS.items()
+        if due_date - offset > now
+    ]
+    CardReminder.objects.bulk_create(reminders, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0007_card_reminder"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_reminders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:39
+
+import apps.kanban.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0008_seed_card_reminders"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cardattachment",
+            name="file",
+            field=models.FileField(
+                max_length=255, upload_to="kanban/attachments/%Y/%m/"
+            ),
+        ),
+        migrations.CreateModel(
+            name="AttachmentBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                (
+                    "file",
+                    models.FileField(
+                        max_length=255, upload_to=apps.kanban.models.blob_upload_to
+                    ),
+                ),
+                ("size", models.BigIntegerField(help_text="File size in bytes")),
+                ("content_type", models.CharField(blank=True, max_length=100)),
+                ("ref_count", models.IntegerField(default=0)),
+                (
+                    "released_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When ref_count last dropped to zero",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "kanban_attachment_blobs",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("ref_count__lte", 0)),
+                        fields=["released_at"],
+                        name="kanban_blob_orphan_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="cardattachment",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="attachments",
+                to="kanban.attachmentblob",
+            ),
+        ),
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("content_type", models.CharField(blank=True, max_length=100)),
+                ("size", models.BigIntegerField(help_text="Total size in bytes")),
+                ("received", models.BigIntegerField(default=0)),
+                (
+                    "attachment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="kanban.cardattachment",
+                    ),
+                ),
+                (
+                    "card",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="kanban.card",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kanban_upload_sessions",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
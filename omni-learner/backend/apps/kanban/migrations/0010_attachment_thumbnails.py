@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:41
+
+import apps.kanban.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0009_attachment_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachmentblob",
+            name="previews_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When thumbnails were generated (or skipped)",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="AttachmentThumbnail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("size", models.CharField(max_length=20)),
+                (
+                    "file",
+                    models.ImageField(
+                        max_length=255, upload_to=apps.kanban.models.thumbnail_upload_to
+                    ),
+                ),
+                ("width", models.IntegerField()),
+                ("height", models.IntegerField()),
+                (
+                    "blob",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="thumbnails",
+                        to="kanban.attachmentblob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kanban_attachment_thumbnails",
+                "unique_together": {("blob", "size")},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kanban", "0010_attachment_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                condition=models.Q(("status__in", ["overdue", "at_risk"])),
+                fields=["status", "due_date"],
+                name="kanban_card_flagged_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -45,6 +47,7 @@ class Board(TimeStampedModel):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["owner", "is_active"]),
+            models.Index(fields=["owner", "-created_at"]),
         ]
 
     def __str__(self):
@@ -157,11 +160,49 @@ class Card(TimeStampedModel):
             models.Index(fields=["column", "position"]),
             models.Index(fields=["assigned_to", "status"]),
             models.Index(fields=["due_date"]),
+            # Status engine + "overdue work" lookups chỉ quét card chưa xong
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(completed_at__isnull=True),
+                name="kanban_card_open_due_idx",
+            ),
+            models.Index(
+                fields=["status", "due_date"],
+                condition=models.Q(completed_at__isnull=True),
+                name="kanban_card_open_status_idx",
+            ),
+            # Bước "recovered": gồm cả card đã xong nhưng vẫn overdue/at_risk
+            models.Index(
+                fields=["status", "due_date"],
+                condition=models.Q(status__in=["overdue", "at_risk"]),
+                name="kanban_card_flagged_idx",
+            ),
+            # Board/column card lists + WIP counts: index-only trên card chưa xong
+            models.Index(
+                fields=["column", "position"],
+                include=["status", "priority", "due_date", "started_at"],
+                condition=models.Q(completed_at__isnull=True),
+                name="kanban_card_open_column_idx",
+            ),
+            models.Index(
+                fields=["column"],
+                condition=models.Q(started_at__isnull=False, completed_at__isnull=True),
+                name="kanban_card_in_progress_idx",
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.column.name})"
 
+    @staticmethod
+    def overdue_q(now=None):
+        """Filter for overdue cards: open and past due (same rule as is_overdue)
+
+        Reads due_date directly, so it is exact at query time; the "overdue"
+        status set by refresh_card_statuses can lag by one run.
+        """
+        return models.Q(completed_at__isnull=True, due_date__lt=now or timezone.now())
+
     @property
     def is_overdue(self):
         """Check if card is overdue"""
@@ -177,7 +218,7 @@ class Card(TimeStampedModel):
         percentage = (float(self.actual_hours) / float(self.estimated_hours)) * 100
         return min(percentage, 100)
 
-    def move_to_column(self, target_column, position=None):
+    def move_to_column(self, target_column, position=None, actor=None):
         """Move card to another column"""
         # Check WIP limit
         if target_column.is_wip_limit_reached():
@@ -187,6 +228,15 @@ class Card(TimeStampedModel):
 
         old_column = self.column
         self.column = target_column
+        events = [
+            CardEvent.build(
+                self,
+                "moved",
+                actor=actor,
+                from_column=old_column,
+                to_column=target_column,
+            )
+        ]
 
         # Set position
         if position is not None:
@@ -204,11 +254,15 @@ class Card(TimeStampedModel):
             and not self.started_at
         ):
             self.started_at = timezone.now()
+            events.append(CardEvent.build(self, "started", actor=actor))
 
         if target_column.name.lower() == "done" and not self.completed_at:
             self.completed_at = timezone.now()
+            events.append(CardEvent.build(self, "completed", actor=actor))
 
-        self.save()
+        with transaction.atomic():
+            self.save()
+            CardEvent.objects.bulk_create(events)
         return self
 
 
@@ -240,6 +294,7 @@ class Sprint(TimeStampedModel):
         ordering = ["-start_date"]
         indexes = [
             models.Index(fields=["board", "is_active"]),
+            models.Index(fields=["board", "-start_date"]),
         ]
 
     def __str__(self):
@@ -267,6 +322,30 @@ class Sprint(TimeStampedModel):
         return (completed_cards / total_cards) * 100
 
 
+class SprintSnapshot(models.Model):
+    """Daily snapshot of a sprint, used for burndown and velocity charts"""
+
+    sprint = models.ForeignKey(
+        Sprint, on_delete=models.CASCADE, related_name="snapshots"
+    )
+    date = models.DateField()
+
+    total_cards = models.IntegerField(default=0)
+    remaining_cards = models.IntegerField(default=0)
+    remaining_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0.0)
+    completed_points = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "kanban_sprint_snapshots"
+        ordering = ["sprint", "date"]
+        unique_together = [["sprint", "date"]]
+
+    def __str__(self):
+        return f"{self.sprint.name} @ {self.date}"
+
+
 class Comment(TimeStampedModel):
     """Comments on cards"""
 
@@ -280,16 +359,87 @@ class Comment(TimeStampedModel):
     class Meta:
         db_table = "kanban_comments"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["card", "created_at"]),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.email} on {self.card.title}"
 
 
+def blob_upload_to(instance, filename):
+    # Content-addressed: kanban/blobs/ab/cd/abcd...
+    digest = instance.sha256
+    return f"kanban/blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+class AttachmentBlob(models.Model):
+    """Stored file content, shared by every attachment with the same SHA-256"""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=blob_upload_to, max_length=255)
+    size = models.BigIntegerField(help_text="File size in bytes")
+    content_type = models.CharField(max_length=100, blank=True)
+    ref_count = models.IntegerField(default=0)
+    released_at = models.DateTimeField(
+        null=True, blank=True, help_text="When ref_count last dropped to zero"
+    )
+    previews_at = models.DateTimeField(
+        null=True, blank=True, help_text="When thumbnails were generated (or skipped)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "kanban_attachment_blobs"
+        indexes = [
+            models.Index(
+                fields=["released_at"],
+                name="kanban_blob_orphan_idx",
+                condition=models.Q(ref_count__lte=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes, {self.ref_count} refs)"
+
+
+def thumbnail_upload_to(instance, filename):
+    digest = instance.blob.sha256
+    return f"kanban/thumbnails/{digest[:2]}/{digest[2:4]}/{filename}"
+
+
+class AttachmentThumbnail(models.Model):
+    """WebP rendition of an image blob at one of THUMBNAIL_SIZES"""
+
+    blob = models.ForeignKey(
+        AttachmentBlob, on_delete=models.CASCADE, related_name="thumbnails"
+    )
+    size = models.CharField(max_length=20)
+    file = models.ImageField(upload_to=thumbnail_upload_to, max_length=255)
+    width = models.IntegerField()
+    height = models.IntegerField()
+
+    class Meta:
+        db_table = "kanban_attachment_thumbnails"
+        unique_together = ["blob", "size"]
+
+    def __str__(self):
+        return f"{self.blob.sha256[:12]} {self.size} ({self.width}x{self.height})"
+
+
 class CardAttachment(TimeStampedModel):
     """File attachments for cards"""
 
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name="attachments")
-    file = models.FileField(upload_to="kanban/attachments/%Y/%m/")
+    # Uploads mới trỏ tới blob dùng chung; file giữ đường dẫn của blob
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="attachments",
+    )
+    file = models.FileField(upload_to="kanban/attachments/%Y/%m/", max_length=255)
     filename = models.CharField(max_length=255)
     file_size = models.IntegerField(help_text="File size in bytes")
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -297,6 +447,176 @@ class CardAttachment(TimeStampedModel):
     class Meta:
         db_table = "kanban_attachments"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["card", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.filename} on {self.card.title}"
+
+
+class CardEvent(models.Model):
+    """Append-only log of card lifecycle changes"""
+
+    EVENT_TYPES = [
+        ("created", "Created"),
+        ("moved", "Moved"),
+        ("started", "Started"),
+        ("completed", "Completed"),
+        ("updated", "Updated"),
+        ("status_changed", "Status changed"),
+    ]
+
+    board = models.ForeignKey(
+        Board, on_delete=models.CASCADE, related_name="card_events"
+    )
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name="events")
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    from_column = models.ForeignKey(
+        Column, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    to_column = models.ForeignKey(
+        Column, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Changed fields: {'status': ['normal', 'blocked']}",
+    )
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "kanban_card_events"
+        ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["board", "timestamp"]),
+            models.Index(fields=["card", "timestamp"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()}: card {self.card_id}"
+
+    def save(self, *args, **kwargs):
+        # Log chỉ được ghi thêm, không sửa
+        if not self._state.adding:
+            raise ValidationError("Card events are append-only")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def build(cls, card, event_type, actor=None, board_id=None, **fields):
+        """Build an unsaved event for ``card`` (for bulk_create)"""
+        return cls(
+            board_id=board_id or card.column.board_id,
+            card=card,
+            actor=actor if actor is None or actor.is_authenticated else None,
+            event_type=event_type,
+            **fields,
+        )
+
+
+class CardEventBuffer:
+    """Collect card events and write them with batched inserts
+
+    Usage:
+        with CardEventBuffer() as buffer:
+            buffer.add(CardEvent.build(card, "status_changed", data={...}))
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.events = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, event):
+        self.events.append(event)
+        if len(self.events) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.events:
+            CardEvent.objects.bulk_create(self.events, batch_size=self.batch_size)
+            self.events = []
+
+
+class CardReminder(models.Model):
+    """Pending due-date reminder for a card
+
+    The partial index on unsent reminders, ordered by remind_at, is the
+    dispatch queue: the next due reminders are always at its head, and
+    rescheduling is a single-row index update.
+    """
+
+    KIND_CHOICES = [
+        ("due_soon", "Due soon"),
+        ("due", "Due"),
+    ]
+
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name="reminders")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    remind_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "kanban_card_reminders"
+        ordering = ["remind_at"]
+        unique_together = ["card", "kind"]
+        indexes = [
+            models.Index(
+                fields=["remind_at"],
+                name="kanban_reminder_pending_idx",
+                condition=models.Q(sent_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: card {self.card_id} @ {self.remind_at}"
+
+
+class UploadSession(TimeStampedModel):
+    """Resumable chunked upload of a card attachment
+
+    Chunks are appended to a temporary file in order (Content-Range); the
+    upload is hashed and turned into an attachment once complete.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name="+")
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField(help_text="Total size in bytes")
+    received = models.BigIntegerField(default=0)
+    attachment = models.ForeignKey(
+        CardAttachment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        db_table = "kanban_upload_sessions"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.attachment_id is not None
@@ -0,0 +1,110 @@
+"""Thumbnail / preview renditions of image attachments
+
+Renditions belong to the blob, so an image attached to many cards is only
+resized once.
+"""
+
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AttachmentBlob, AttachmentThumbnail
+
+logger = logging.getLogger(__name__)
+
+# Name -> longest edge in pixels
+THUMBNAIL_SIZES = {
+    "small": 160,
+    "medium": 480,
+    "large": 1280,
+}
+WEBP_QUALITY = 80
+
+
+def render_webp(image, max_edge):
+    """Downscale ``image`` to fit ``max_edge`` and encode it as WebP"""
+    rendition = image.copy()
+    rendition.thumbnail((max_edge, max_edge))
+    buffer = io.BytesIO()
+    rendition.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue(), rendition.size
+
+
+def generate_thumbnails(blob_id):
+    """Create every missing rendition of a blob; returns how many were made
+
+    Non-image blobs are only marked as processed.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    blob = AttachmentBlob.objects.filter(id=blob_id).first()
+    if blob is None:
+        return 0
+
+    existing = set(blob.thumbnails.values_list("size", flat=True))
+    missing = {
+        name: edge for name, edge in THUMBNAIL_SIZES.items() if name not in existing
+    }
+
+    thumbnails = []
+    if missing:
+        try:
+            with blob.file.open("rb") as source:
+                image = Image.open(source)
+                # JPEG: giải mã thẳng ở độ phân giải nhỏ hơn
+                image.draft("RGB", (max(missing.values()),) * 2)
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+                for name, edge in missing.items():
+                    data, (width, height) = render_webp(image, edge)
+                    thumbnail = AttachmentThumbnail(
+                        blob=blob, size=name, width=width, height=height
+                    )
+                    thumbnail.file.save(
+                        f"{blob.sha256}-{name}.webp", ContentFile(data), save=False
+                    )
+                    thumbnails.append(thumbnail)
+        except (
+            UnidentifiedImageError,
+            Image.DecompressionBombError,
+            OSError,
+            ValueError,
+        ):
+            # Không phải ảnh (hoặc ảnh hỏng): bỏ qua
+            logger.info("No thumbnails for blob %s", blob.sha256)
+
+    # Task và lệnh backfill có thể chạy trùng blob (outbox giao ít nhất một lần)
+    AttachmentThumbnail.objects.bulk_create(thumbnails, ignore_conflicts=True)
+    created = 0
+    if thumbnails:
+        # Bên thua race: row bị bỏ qua thì xoá file vừa ghi
+        stored = dict(blob.thumbnails.values_list("size", "file"))
+        for thumbnail in thumbnails:
+            if stored.get(thumbnail.size) == thumbnail.file.name:
+                created += 1
+            else:
+                thumbnail.file.storage.delete(thumbnail.file.name)
+    AttachmentBlob.objects.filter(id=blob.id).update(previews_at=timezone.now())
+    return created
+
+
+def thumbnail_urls(attachment, request=None):
+    """{size: download url} for an attachment's generated thumbnails
+
+    Uses the prefetched ``blob.thumbnails``; the URLs go through the
+    ownership-checked download action, never straight to MEDIA_URL.
+    """
+    if attachment.blob is None:
+        return {}
+
+    download = reverse("attachment-download", args=[attachment.id])
+    urls = {}
+    for thumbnail in attachment.blob.thumbnails.all():
+        url = f"{download}?size={thumbnail.size}"
+        urls[thumbnail.size] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,122 @@
+"""Due-date reminders
+
+Reminders are rows, not Celery ETA tasks: editing a due date upserts the
+card's reminder rows, and ``dispatch_due_reminders`` pops whatever is due
+from the pending index every minute. ``sent_at`` marks a reminder as
+claimed (handed to a delivery task in the same transaction), not as
+delivered: ``send_reminder_batch`` retries SMTP failures, and a batch that
+still fails after the last retry is logged by the worker as a task error.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CardReminder
+
+# Kind -> how long before the due date it fires
+REMINDER_OFFSETS = {
+    "due_soon": timedelta(hours=24),
+    "due": timedelta(0),
+}
+DISPATCH_BATCH_SIZE = 500
+
+
+def schedule_reminders(cards, now=None):
+    """(Re)schedule reminders for ``cards`` after a due date change
+
+    Open cards with a due date get one upserted row per kind still in the
+    future; every other pending reminder of these cards is dropped.
+    """
+    now = now or timezone.now()
+    wanted = [
+        CardReminder(card_id=card.id, kind=kind, remind_at=card.due_date - offset)
+        for card in cards
+        if card.due_date and not card.completed_at
+        for kind, offset in REMINDER_OFFSETS.items()
+        if card.due_date - offset > now
+    ]
+
+    wanted_keys = {(reminder.card_id, reminder.kind) for reminder in wanted}
+
+    with transaction.atomic():
+        pending = CardReminder.objects.filter(
+            card_id__in=[card.id for card in cards], sent_at__isnull=True
+        ).values_list("id", "card_id", "kind")
+        stale = [
+            reminder_id
+            for reminder_id, card_id, kind in pending
+            if (card_id, kind) not in wanted_keys
+        ]
+        if stale:
+            CardReminder.objects.filter(id__in=stale).delete()
+
+        CardReminder.objects.bulk_create(
+            wanted,
+            update_conflicts=True,
+            unique_fields=["card", "kind"],
+            update_fields=["remind_at", "sent_at"],
+        )
+    return len(wanted)
+
+
+def pop_due_reminders(now, limit=DISPATCH_BATCH_SIZE):
+    """Claim up to ``limit`` due reminders
+
+    Returns (number claimed, {board id: JSON-friendly delivery rows}). Must
+    run inside a transaction; rows are locked with SKIP LOCKED so concurrent
+    dispatchers never claim the same reminder.
+    """
+    rows = list(
+        CardReminder.objects.select_for_update(skip_locked=True, of=("self",))
+        .filter(sent_at__isnull=True, remind_at__lte=now)
+        .order_by("remind_at")
+        .values(
+            "id",
+            "kind",
+            "card__completed_at",
+            board_id=F("card__column__board_id"),
+            title=F("card__title"),
+            due_date=F("card__due_date"),
+            email=Coalesce(
+                "card__assigned_to__email", "card__column__board__owner__email"
+            ),
+        )[:limit]
+    )
+    if rows:
+        CardReminder.objects.filter(id__in=[row["id"] for row in rows]).update(
+            sent_at=now
+        )
+    # Thẻ đã xong thì chỉ đánh dấu, không gửi
+    by_board = defaultdict(list)
+    for row in rows:
+        if row["card__completed_at"] is None and row["due_date"]:
+            by_board[row["board_id"]].append(
+                {
+                    "kind": row["kind"],
+                    "title": row["title"],
+                    "due_date": row["due_date"].isoformat(),
+                    "email": row["email"],
+                }
+            )
+    return len(rows), dict(by_board)
+
+
+def deliver_reminders(rows):
+    """Send one batch of reminder emails over a single connection"""
+    messages = []
+    for row in rows:
+        if row["kind"] == "due_soon":
+            subject = f"Due soon: {row['title']}"
+        else:
+            subject = f"Due now: {row['title']}"
+        due = timezone.localtime(datetime.fromisoformat(row["due_date"]))
+        body = f"Card \"{row['title']}\" is due at {due:%Y-%m-%d %H:%M}."
+        messages.append((subject, body, settings.DEFAULT_FROM_EMAIL, [row["email"]]))
+    return send_mass_mail(messages)
@@ -1,6 +1,18 @@
 from rest_framework import serializers
 from django.utils import timezone
-from .models import Board, Column, Card, Sprint, Comment, CardAttachment
+from django.conf import settings
+from django.urls import reverse
+from .models import (
+    Board,
+    Column,
+    Card,
+    CardEvent,
+    Sprint,
+    Comment,
+    CardAttachment,
+    UploadSession,
+)
+from .previews import thumbnail_urls
 
 
 class BoardListSerializer(serializers.ModelSerializer):
@@ -29,9 +41,13 @@ class BoardListSerializer(serializers.ModelSerializer):
         read_only_fields = ["owner", "created_at", "updated_at"]
 
     def get_column_count(self, obj):
+        if hasattr(obj, "column_total"):
+            return obj.column_total
         return obj.columns.count()
 
     def get_card_count(self, obj):
+        if hasattr(obj, "card_total"):
+            return obj.card_total
         return Card.objects.filter(column__board=obj).count()
 
 
@@ -99,10 +115,15 @@ class CardSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["started_at", "completed_at", "created_at", "updated_at"]
 
+    # *_total: counts loaded up front (see async_views)
     def get_comment_count(self, obj):
+        if hasattr(obj, "comment_total"):
+            return obj.comment_total
         return obj.comments.count()
 
     def get_attachment_count(self, obj):
+        if hasattr(obj, "attachment_total"):
+            return obj.attachment_total
         return obj.attachments.count()
 
     def validate(self, data):
@@ -144,8 +165,12 @@ class CardDetailSerializer(CardSerializer):
         return CommentSerializer(comments, many=True).data
 
     def get_attachments(self, obj):
-        attachments = obj.attachments.all()
-        return CardAttachmentSerializer(attachments, many=True).data
+        attachments = obj.attachments.select_related(
+            "blob", "uploaded_by"
+        ).prefetch_related("blob__thumbnails")
+        return CardAttachmentSerializer(
+            attachments, many=True, context=self.context
+        ).data
 
 
 class MoveCardSerializer(serializers.Serializer):
@@ -169,6 +194,38 @@ class MoveCardSerializer(serializers.Serializer):
             raise serializers.ValidationError("Target column does not exist")
 
 
+class PositionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    position = serializers.IntegerField()
+
+
+def _validate_unique_ids(orders):
+    ids = [item["id"] for item in orders]
+    if len(ids) != len(set(ids)):
+        raise serializers.ValidationError("Each id may appear only once")
+    return orders
+
+
+class ColumnReorderSerializer(serializers.Serializer):
+    """Serializer cho reorder columns"""
+
+    board_id = serializers.IntegerField()
+    column_orders = PositionSerializer(many=True, allow_empty=False)
+
+    def validate_column_orders(self, value):
+        return _validate_unique_ids(value)
+
+
+class CardReorderSerializer(serializers.Serializer):
+    """Serializer cho reorder cards trong một column"""
+
+    column_id = serializers.IntegerField()
+    card_orders = PositionSerializer(many=True, allow_empty=False)
+
+    def validate_card_orders(self, value):
+        return _validate_unique_ids(value)
+
+
 class BoardDetailSerializer(BoardListSerializer):
     """Detailed board serializer với columns và cards"""
 
@@ -178,7 +235,9 @@ class BoardDetailSerializer(BoardListSerializer):
         fields = BoardListSerializer.Meta.fields + ["columns", "default_columns"]
 
     def get_columns(self, obj):
-        columns = obj.columns.all().prefetch_related("cards")
+        columns = getattr(obj, "loaded_columns", None)
+        if columns is None:
+            columns = obj.columns.all().prefetch_related("cards")
         return ColumnWithCardsSerializer(columns, many=True).data
 
 
@@ -306,6 +365,7 @@ class CardAttachmentSerializer(serializers.ModelSerializer):
         source="uploaded_by.email", read_only=True
     )
     file_url = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = CardAttachment
@@ -318,15 +378,68 @@ class CardAttachmentSerializer(serializers.ModelSerializer):
             "uploaded_by",
             "uploaded_by_email",
             "file_url",
+            "thumbnails",
             "created_at",
         ]
         read_only_fields = ["uploaded_by", "file_size", "created_at"]
+        # "file" chỉ để upload; đọc qua file_url
+        extra_kwargs = {
+            "filename": {"required": False},
+            "file": {"write_only": True},
+        }
 
     def get_file_url(self, obj):
+        """Ownership-checked download URL (MEDIA_ROOT is not public)"""
+        if not obj.file:
+            return None
         request = self.context.get("request")
-        if obj.file and hasattr(obj.file, "url"):
-            return request.build_absolute_uri(obj.file.url) if request else obj.file.url
-        return None
+        url = reverse("attachment-download", args=[obj.id])
+        return request.build_absolute_uri(url) if request else url
+
+    def get_thumbnails(self, obj):
+        """{"small": url, "medium": url, "large": url} once generated"""
+        return thumbnail_urls(obj, self.context.get("request"))
+
+    def validate_card(self, value):
+        if value.column.board.owner != self.context["request"].user:
+            raise serializers.ValidationError("Card not found")
+        return value
+
+    def validate_file(self, value):
+        if value.size > settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError("File is too large")
+        return value
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer cho resumable upload sessions"""
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "card",
+            "filename",
+            "content_type",
+            "size",
+            "received",
+            "attachment",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["received", "attachment", "created_at", "updated_at"]
+
+    def validate_card(self, value):
+        if value.column.board.owner != self.context["request"].user:
+            raise serializers.ValidationError("Card not found")
+        return value
+
+    def validate_size(self, value):
+        if value <= 0 or value > settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"size must be between 1 and {settings.ATTACHMENT_MAX_SIZE} bytes"
+            )
+        return value
 
 
 class BulkCardUpdateSerializer(serializers.Serializer):
@@ -346,3 +459,27 @@ class BulkCardUpdateSerializer(serializers.Serializer):
             )
 
         return value
+
+
+class CardEventSerializer(serializers.ModelSerializer):
+    """Serializer cho card activity feed"""
+
+    card_title = serializers.CharField(source="card.title", read_only=True)
+    actor_email = serializers.EmailField(source="actor.email", read_only=True)
+
+    class Meta:
+        model = CardEvent
+        fields = [
+            "id",
+            "board",
+            "card",
+            "card_title",
+            "actor",
+            "actor_email",
+            "event_type",
+            "from_column",
+            "to_column",
+            "data",
+            "timestamp",
+        ]
+        read_only_fields = fields
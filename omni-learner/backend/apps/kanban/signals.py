@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.outbox import enqueue
+
+from .models import AttachmentBlob, CardAttachment
+from .tasks import generate_attachment_previews
+from .uploads import release_blob
+
+
+@receiver(post_delete, sender=CardAttachment)
+def release_attachment_blob(sender, instance, **kwargs):
+    """Attachment gone (directly or via card/board cascade) -> drop its ref"""
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+@receiver(post_save, sender=AttachmentBlob)
+def queue_blob_previews(sender, instance, created, **kwargs):
+    """New content stored -> render thumbnails once the row is committed"""
+    if created:
+        enqueue(generate_attachment_previews, instance.id)
@@ -0,0 +1,220 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.core.locks import single_instance
+from apps.core.outbox import already_delivered, enqueue, mark_delivered
+
+from .models import Card, CardEvent, Sprint, SprintSnapshot
+from .reminders import DISPATCH_BATCH_SIZE, deliver_reminders, pop_due_reminders
+from .previews import generate_thumbnails
+from .uploads import purge_unreferenced
+
+# Open cards due within this window and not started are "at risk"
+AT_RISK_WINDOW = timedelta(hours=24)
+STATUS_BATCH_SIZE = 1000
+
+
+@shared_task
+@single_instance(ttl=60 * 60, hold=True)
+def snapshot_active_sprints():
+    """Record today's burndown snapshot for every active sprint
+
+    All sprints are aggregated in a single GROUP BY query and written with
+    one upsert, so re-running the job on the same day just refreshes the row.
+    """
+    today = timezone.localdate()
+    open_cards = Q(cards__completed_at__isnull=True)
+
+    rows = (
+        Sprint.objects.filter(is_active=True)
+        .annotate(
+            total_cards=Count("cards"),
+            remaining_cards=Count("cards", filter=open_cards),
+            remaining_hours=Sum("cards__estimated_hours", filter=open_cards),
+        )
+        .values(
+            "id",
+            "total_cards",
+            "remaining_cards",
+            "remaining_hours",
+            "completed_story_points",
+        )
+    )
+
+    snapshots = [
+        SprintSnapshot(
+            sprint_id=row["id"],
+            date=today,
+            total_cards=row["total_cards"],
+            remaining_cards=row["remaining_cards"],
+            remaining_hours=row["remaining_hours"] or 0,
+            completed_points=row["completed_story_points"],
+        )
+        for row in rows
+    ]
+
+    SprintSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["sprint", "date"],
+        update_fields=[
+            "total_cards",
+            "remaining_cards",
+            "remaining_hours",
+            "completed_points",
+        ],
+    )
+    return len(snapshots)
+
+
+def _transition_status(queryset, new_status, now):
+    """Move matching cards to ``new_status`` in batches, logging each change
+
+    Each batch locks its rows (SKIP LOCKED, so cards being edited are left
+    for the next run), issues one UPDATE by id and one bulk INSERT of
+    status_changed events.
+    """
+    changed = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update(skip_locked=True, of=("self",))
+                .order_by("id")
+                .values_list("id", "column__board_id", "status")[:STATUS_BATCH_SIZE]
+            )
+            if not rows:
+                break
+
+            Card.objects.filter(id__in=[card_id for card_id, _, _ in rows]).update(
+                status=new_status, updated_at=now
+            )
+            CardEvent.objects.bulk_create(
+                [
+                    CardEvent(
+                        card_id=card_id,
+                        board_id=board_id,
+                        event_type="status_changed",
+                        data={"status": [old_status, new_status], "source": "auto"},
+                        timestamp=now,
+                    )
+                    for card_id, board_id, old_status in rows
+                ]
+            )
+            changed += len(rows)
+
+        if len(rows) < STATUS_BATCH_SIZE:
+            break
+    return changed
+
+
+@shared_task
+@single_instance(ttl=5 * 60)
+def refresh_card_statuses():
+    """Set-based overdue / at-risk status engine
+
+    Each step runs on a partial index: the recovery step on the one over
+    overdue / at-risk cards (completed or not), the others on the ones over
+    incomplete cards, so a pass only touches cards whose status changes.
+    The status can lag by one run; the overdue filter and board statistics
+    use Card.overdue_q() on due_date instead.
+    """
+    now = timezone.now()
+    at_risk_until = now + AT_RISK_WINDOW
+    open_cards = Card.objects.filter(completed_at__isnull=True)
+
+    # 1. Hết overdue/at_risk: đã xong, đổi hạn, hoặc đã bắt đầu
+    recovered = _transition_status(
+        Card.objects.filter(status__in=["overdue", "at_risk"]).filter(
+            Q(completed_at__isnull=False)
+            | Q(due_date__isnull=True)
+            | Q(status="overdue", due_date__gte=now)
+            | Q(status="at_risk", started_at__isnull=False)
+            | Q(status="at_risk", due_date__gte=at_risk_until)
+        ),
+        "normal",
+        now,
+    )
+
+    # 2. Quá hạn (không ghi đè "blocked")
+    overdue = _transition_status(
+        open_cards.filter(due_date__lt=now, status__in=["normal", "at_risk"]),
+        "overdue",
+        now,
+    )
+
+    # 3. Sắp đến hạn mà chưa bắt đầu
+    at_risk = _transition_status(
+        open_cards.filter(
+            due_date__gte=now,
+            due_date__lt=at_risk_until,
+            started_at__isnull=True,
+            status="normal",
+        ),
+        "at_risk",
+        now,
+    )
+
+    return {"normal": recovered, "overdue": overdue, "at_risk": at_risk}
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=60,
+    max_retries=5,
+)
+def send_reminder_batch(self, rows):
+    """Deliver one batch of claimed reminders
+
+    SMTP failures are retried with backoff (a retry may resend the part of
+    the batch that went out before the error); a batch is marked delivered
+    only after it was sent, so a redelivered outbox message is skipped.
+    """
+    if already_delivered(self):
+        return 0
+    sent = deliver_reminders(rows)
+    mark_delivered(self)
+    return sent
+
+
+@shared_task
+@single_instance(ttl=45)
+def dispatch_due_reminders():
+    """Beat entry point: pop due reminders in batches and fan them out
+
+    Each claimed batch of up to DISPATCH_BATCH_SIZE reminders becomes one
+    delivery task per board, instead of one delayed task per card.
+    """
+    now = timezone.now()
+    batches = 0
+    while True:
+        with transaction.atomic():
+            claimed, rows = pop_due_reminders(now)
+            # Cùng transaction với việc đánh dấu sent_at; mỗi board một message
+            for board_id, board_rows in rows.items():
+                enqueue(
+                    send_reminder_batch, board_rows, ordering_key=f"board:{board_id}"
+                )
+                batches += 1
+        if claimed < DISPATCH_BATCH_SIZE:
+            break
+    return batches
+
+
+@shared_task
+@single_instance(ttl=10 * 60)
+def purge_attachment_blobs():
+    """Delete unreferenced blobs and abandoned resumable uploads"""
+    blobs, sessions = purge_unreferenced()
+    return {"blobs": blobs, "upload_sessions": sessions}
+
+
+@shared_task
+def generate_attachment_previews(blob_id):
+    """Render WebP thumbnails for a newly stored blob"""
+    return generate_thumbnails(blob_id)
@@ -1,3 +1,401 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.users.models import User
+from .models import (
+    AttachmentThumbnail,
+    Board,
+    Column,
+    Card,
+    CardEvent,
+    Comment,
+    CardAttachment,
+    Sprint,
+)
+from .views import (
+    BoardViewSet,
+    ColumnViewSet,
+    CardViewSet,
+    SprintViewSet,
+    CommentViewSet,
+    CardAttachmentViewSet,
+)
+
+# Tables whose plans must never degrade to a sequential scan
+CHECKED_TABLES = {
+    "kanban_boards",
+    "kanban_columns",
+    "kanban_cards",
+    "kanban_comments",
+    "kanban_attachments",
+    "kanban_sprints",
+    "kanban_card_events",
+}
+
+
+def index_name(model, *fields):
+    """Name of the Meta index of ``model`` over exactly ``fields``"""
+    for index in model._meta.indexes:
+        if list(index.fields) == list(fields) and index.condition is None:
+            return index.name
+    raise LookupError(f"No index on {model.__name__}{fields}")
+
+
+def fk_index_name(model, field_name):
+    """Name Django gives the implicit index of a foreign key column"""
+    column = model._meta.get_field(field_name).column
+    editor = connection.schema_editor()
+    return editor._create_index_name(model._meta.db_table, [column])
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "EXPLAIN plan checks need PostgreSQL"
+)
+class QueryPlanTests(TestCase):
+    """EXPLAIN each viewset's main query and check the index it is meant to use
+
+    Sequential scans are disabled (enable_seqscan = off), so a query no
+    index can serve still shows up as a Seq Scan; each test also names the
+    index that must be searched with an Index Cond, so a full scan of some
+    unrelated index (e.g. one matching only the ORDER BY) fails too.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.users = [
+            User.objects.create_user(
+                email=f"plan{i}@example.com", username=f"plan{i}", password="x"
+            )
+            for i in range(3)
+        ]
+
+        boards = Board.objects.bulk_create(
+            [
+                Board(owner=user, name=f"Board {i}", default_columns=["Todo"])
+                for user in cls.users
+                for i in range(5)
+            ]
+        )
+        columns = Column.objects.bulk_create(
+            [
+                Column(board=board, name=name, position=position)
+                for board in boards
+                for position, name in enumerate(["To Do", "In Progress", "Done"])
+            ]
+        )
+        cards = Card.objects.bulk_create(
+            [
+                Card(
+                    column=column,
+                    title=f"Card {i}",
+                    position=i,
+                    due_date=now + timedelta(days=i - 10),
+                    started_at=now if i % 3 == 0 else None,
+                    completed_at=now if column.name == "Done" else None,
+                )
+                for column in columns
+                for i in range(30)
+            ]
+        )
+        Comment.objects.bulk_create(
+            [
+                Comment(card=card, author=cls.users[0], content="comment")
+                for card in cards[::3]
+            ]
+        )
+        CardAttachment.objects.bulk_create(
+            [
+                CardAttachment(
+                    card=card,
+                    file="kanban/attachments/plan.txt",
+                    filename="plan.txt",
+                    file_size=1,
+                    uploaded_by=cls.users[0],
+                )
+                for card in cards[::5]
+            ]
+        )
+        CardEvent.objects.bulk_create(
+            [
+                CardEvent(
+                    board_id=card.column.board_id, card=card, event_type="created"
+                )
+                for card in cards
+            ]
+        )
+        Sprint.objects.bulk_create(
+            [
+                Sprint(
+                    board=board,
+                    name="Sprint",
+                    goal="goal",
+                    start_date=now,
+                    end_date=now + timedelta(days=14),
+                )
+                for board in boards
+            ]
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.user = cls.users[1]
+        cls.board = Board.objects.filter(owner=cls.user).first()
+        cls.column = cls.board.columns.first()
+        cls.card = cls.column.cards.first()
+
+    def viewset_queryset(self, viewset_class, action="list", **params):
+        """Build the queryset a viewset would run for a GET request"""
+        request = Request(APIRequestFactory().get("/", params))
+        request.user = self.user
+
+        view = viewset_class()
+        view.request = request
+        view.action = action
+        view.format_kwarg = None
+        view.kwargs = {}
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return json.loads(queryset.explain(format="json"))[0]["Plan"]
+
+    def assertNoSeqScan(self, queryset, plan=None):
+        plan = plan or self.explain(queryset)
+        seq_scans = [
+            node["Relation Name"]
+            for node in _plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") in CHECKED_TABLES
+        ]
+        self.assertFalse(
+            seq_scans,
+            f"Sequential scan on {seq_scans}:\n{json.dumps(plan, indent=2)}",
+        )
+
+    def assertUsesIndex(self, queryset, *index_names, node_type=None):
+        """One of ``index_names`` is searched (Index Cond), not fully scanned
+
+        Several names are only given where equivalent indexes serve the same
+        lookup and the planner may pick either.
+        """
+        plan = self.explain(queryset)
+        self.assertNoSeqScan(queryset, plan)
+        dump = json.dumps(plan, indent=2)
+
+        nodes = [
+            node for node in _plan_nodes(plan) if node.get("Index Name") in index_names
+        ]
+        self.assertTrue(nodes, f"None of {index_names} is used:\n{dump}")
+        self.assertTrue(
+            any("Index Cond" in node for node in nodes),
+            f"{index_names} only scanned in full, no Index Cond:\n{dump}",
+        )
+        if node_type:
+            self.assertIn(node_type, [node["Node Type"] for node in nodes], dump)
+
+    def test_board_list(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(BoardViewSet),
+            index_name(Board, "owner", "-created_at"),
+        )
+
+    def test_column_list_by_board(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(ColumnViewSet, board=self.board.id),
+            index_name(Column, "board", "position"),
+        )
+
+    def test_card_list_by_board(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(CardViewSet, board_id=self.board.id),
+            index_name(Card, "column", "position"),
+            fk_index_name(Card, "column"),
+        )
+
+    def test_card_list_by_column(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(CardViewSet, column=self.column.id),
+            index_name(Card, "column", "position"),
+            fk_index_name(Card, "column"),
+        )
+
+    def test_overdue_cards(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(CardViewSet, overdue="true"),
+            "kanban_card_open_due_idx",
+        )
+
+    def test_sprint_list_by_board(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(SprintViewSet, board=self.board.id),
+            index_name(Sprint, "board", "-start_date"),
+        )
+
+    def test_comments_by_card(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(CommentViewSet, card=self.card.id),
+            index_name(Comment, "card", "created_at"),
+        )
+
+    def test_attachments_by_card(self):
+        self.assertUsesIndex(
+            self.viewset_queryset(CardAttachmentViewSet, card=self.card.id),
+            index_name(CardAttachment, "card", "-created_at"),
+        )
+
+    def test_card_detail_comments(self):
+        self.assertUsesIndex(
+            self.card.comments.all()[:10], index_name(Comment, "card", "created_at")
+        )
+
+    def test_board_activity_feed(self):
+        self.assertUsesIndex(
+            CardEvent.objects.filter(board=self.board).order_by("-timestamp")[:50],
+            index_name(CardEvent, "board", "timestamp"),
+        )
+
+    def test_open_cards_per_column(self):
+        self.assertUsesIndex(
+            Card.objects.filter(column__board=self.board, completed_at__isnull=True)
+            .order_by()
+            .values("column_id")
+            .annotate(n=Count("id")),
+            "kanban_card_open_column_idx",
+            node_type="Index Only Scan",
+        )
+
+    def test_statistics_in_progress(self):
+        self.assertUsesIndex(
+            Card.objects.filter(
+                column__board=self.board,
+                started_at__isnull=False,
+                completed_at__isnull=True,
+            ),
+            "kanban_card_in_progress_idx",
+        )
+
+    def test_status_engine_overdue(self):
+        self.assertUsesIndex(
+            Card.objects.filter(
+                completed_at__isnull=True,
+                due_date__lt=timezone.now(),
+                status__in=["normal", "at_risk"],
+            ),
+            "kanban_card_open_status_idx",
+        )
+
+    def test_status_engine_recovered(self):
+        self.assertUsesIndex(
+            Card.objects.filter(status__in=["overdue", "at_risk"]).filter(
+                Q(completed_at__isnull=False) | Q(due_date__isnull=True)
+            ),
+            "kanban_card_flagged_idx",
+        )
+
+
+class AttachmentDownloadTests(TestCase):
+    """Attachment content is only reachable through the ownership check"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media = override_settings(
+            MEDIA_ROOT=cls.media_root, ATTACHMENT_SENDFILE_BACKEND=""
+        )
+        cls.media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            email="owner@example.com", username="owner", password="x"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", username="other", password="x"
+        )
+        board = Board.objects.create(owner=self.owner, name="Board")
+        column = Column.objects.create(board=board, name="To Do", position=0)
+        self.card = Card.objects.create(column=column, title="Card", position=0)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        # Blob file is moved into place on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/kanban/attachments/",
+                {
+                    "card": self.card.id,
+                    "file": SimpleUploadedFile("photo.png", b"not really a png"),
+                },
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.attachment = CardAttachment.objects.get(id=response.json()["id"])
+
+        thumbnail = AttachmentThumbnail(
+            blob=self.attachment.blob, size="small", width=1, height=1
+        )
+        thumbnail.file.save("small.webp", ContentFile(b"webp"), save=False)
+        thumbnail.save()
+        self.download_url = f"/api/kanban/attachments/{self.attachment.id}/download/"
+
+    def test_owner_downloads_file_and_thumbnail(self):
+        response = self.client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"not really a png")
+
+        response = self.client.get(self.download_url, {"size": "small"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(b"".join(response.streaming_content), b"webp")
+
+        response = self.client.get(self.download_url, {"size": "huge"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_non_owner_gets_404(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.download_url).status_code, 404)
+        response = self.client.get(self.download_url, {"size": "small"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_payloads_never_expose_media_urls(self):
+        payloads = [
+            self.client.get(f"/api/kanban/attachments/{self.attachment.id}/"),
+            self.client.get("/api/kanban/attachments/", {"card": self.card.id}),
+            self.client.get(f"/api/kanban/cards/{self.card.id}/"),
+        ]
+        for response in payloads:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("/media/", response.content.decode())
+
+        data = payloads[0].json()
+        self.assertTrue(data["file_url"].endswith(self.download_url))
+        self.assertTrue(
+            data["thumbnails"]["small"].endswith(f"{self.download_url}?size=small")
+        )
@@ -0,0 +1,327 @@
+"""Streaming attachment uploads with content-addressed storage
+
+Uploads are written to disk while being hashed; the SHA-256 then decides
+whether the bytes are new (moved into ``kanban/blobs/``) or a duplicate
+(the temporary file is dropped and the existing blob's ref_count bumped).
+
+New content is first stored under ``kanban/blobs/staging/`` and moved to its
+content-addressed name once the blob row commits, so a rolled-back upload
+only leaves a staging file, which ``purge_unreferenced`` sweeps.
+"""
+
+import hashlib
+import mimetypes
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from .models import AttachmentBlob, AttachmentThumbnail, CardAttachment, UploadSession
+
+HASH_CHUNK_SIZE = 1024 * 1024
+STAGING_DIR = "kanban/blobs/staging/"
+# Boundary và các field khác của body multipart ngoài file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(APIException):
+    status_code = 413
+    default_detail = "File is too large"
+    default_code = "too_large"
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file, computing SHA-256 on the way
+
+    The digest is exposed as ``uploaded_file.sha256``. Bodies larger than
+    ATTACHMENT_MAX_SIZE are refused from Content-Length before anything is
+    read, and while streaming if the header understated them.
+    """
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        if content_length > settings.ATTACHMENT_MAX_SIZE + MULTIPART_OVERHEAD:
+            raise UploadTooLarge()
+        return super().handle_raw_input(
+            input_data, META, content_length, boundary, encoding
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.ATTACHMENT_MAX_SIZE:
+            raise UploadTooLarge()
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        return uploaded
+
+
+class LocalFile(File):
+    """A file already on local disk, so storage can move instead of copy"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def file_sha256(uploaded_file):
+    """Digest of an upload (computed while streaming when possible)"""
+    digest = getattr(uploaded_file, "sha256", None)
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+    for data in uploaded_file.chunks(HASH_CHUNK_SIZE):
+        hasher.update(data)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def _acquire_existing(sha256):
+    updated = AttachmentBlob.objects.filter(sha256=sha256).update(
+        ref_count=F("ref_count") + 1, released_at=None
+    )
+    return AttachmentBlob.objects.get(sha256=sha256) if updated else None
+
+
+def _promote_staged(storage, staged, name):
+    """Move a staged blob file to its content-addressed ``name``"""
+    if storage.exists(name):
+        # Cùng SHA-256 thì cùng nội dung: giữ file đã có
+        storage.delete(staged)
+        return
+    try:
+        source, target = storage.path(staged), storage.path(name)
+    except NotImplementedError:
+        with storage.open(staged) as content:
+            storage.save(name, content)
+        storage.delete(staged)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source, target)
+
+
+def acquire_blob(content, sha256, size, content_type=""):
+    """Return the blob for ``sha256`` with one more reference
+
+    ``content`` is only written to storage if no blob has that digest yet;
+    it reaches its final name when the surrounding transaction commits.
+    """
+    blob = _acquire_existing(sha256)
+    if blob is not None:
+        return blob
+
+    blob = AttachmentBlob(
+        sha256=sha256, size=size, content_type=content_type, ref_count=1
+    )
+    field = blob.file.field
+    staged = field.storage.save(f"{STAGING_DIR}{sha256}.{uuid.uuid4().hex}", content)
+    blob.file.name = field.generate_filename(blob, sha256)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # Upload song song cùng nội dung đã tạo blob trước
+        field.storage.delete(staged)
+        return _acquire_existing(sha256)
+
+    transaction.on_commit(
+        lambda: _promote_staged(field.storage, staged, blob.file.name)
+    )
+    return blob
+
+
+def sweep_staged_blobs(grace):
+    """Finish or drop staging files older than ``grace``; returns the count
+
+    A staged file whose blob row exists but has no file yet (the process
+    died between commit and promotion) is promoted; the rest belong to
+    rolled-back uploads and are deleted.
+    """
+    storage = AttachmentBlob._meta.get_field("file").storage
+    try:
+        _, names = storage.listdir(STAGING_DIR)
+    except FileNotFoundError:
+        return 0
+
+    cutoff = timezone.now() - grace
+    swept = 0
+    for filename in names:
+        staged = STAGING_DIR + filename
+        if storage.get_modified_time(staged) >= cutoff:
+            continue
+        blob = AttachmentBlob.objects.filter(sha256=filename.split(".")[0]).first()
+        if blob is not None:
+            _promote_staged(storage, staged, blob.file.name)
+        else:
+            storage.delete(staged)
+        swept += 1
+    return swept
+
+
+def release_blob(blob_id):
+    """Drop one reference; unreferenced blobs are purged later"""
+    AttachmentBlob.objects.filter(id=blob_id).update(ref_count=F("ref_count") - 1)
+    AttachmentBlob.objects.filter(id=blob_id, ref_count__lte=0).update(
+        released_at=timezone.now()
+    )
+
+
+def create_attachment(card, user, uploaded_file, filename, sha256, content_type=""):
+    """Attach ``uploaded_file`` (already hashed) to ``card``"""
+    blob = acquire_blob(uploaded_file, sha256, uploaded_file.size, content_type)
+    return CardAttachment.objects.create(
+        card=card,
+        blob=blob,
+        file=blob.file.name,
+        filename=filename,
+        file_size=blob.size,
+        uploaded_by=user,
+    )
+
+
+def adopt_legacy_attachment(attachment_id):
+    """Move a pre-dedup attachment (own file, no blob) onto a shared blob
+
+    Returns the blob id, or None if the attachment was already adopted or
+    its file is missing.
+    """
+    attachment = CardAttachment.objects.filter(
+        id=attachment_id, blob__isnull=True
+    ).first()
+    if attachment is None or not attachment.file:
+        return None
+
+    old_name = attachment.file.name
+    try:
+        sha256 = file_sha256(attachment.file)
+    except FileNotFoundError:
+        return None
+
+    content_type = mimetypes.guess_type(attachment.filename)[0] or ""
+    blob = acquire_blob(attachment.file, sha256, attachment.file.size, content_type)
+    CardAttachment.objects.filter(id=attachment.id).update(
+        blob=blob, file=blob.file.name
+    )
+
+    if not CardAttachment.objects.filter(file=old_name).exists():
+        attachment.file.storage.delete(old_name)
+    return blob.id
+
+
+# Resumable uploads
+
+
+def session_path(session):
+    return Path(settings.UPLOAD_SESSION_DIR) / f"{session.id}.part"
+
+
+def append_chunk(session, stream, start, end, chunk_size=64 * 1024):
+    """Append bytes ``start``..``end`` (inclusive) from ``stream``
+
+    The caller has checked that ``start`` equals ``session.received``.
+    Returns the number of bytes written.
+    """
+    path = session_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    remaining = end - start + 1
+    with open(path, "r+b" if path.exists() else "wb") as part:
+        # Ghi đè phần thừa của một lần gửi dang dở trước đó
+        part.seek(start)
+        part.truncate()
+        while remaining > 0:
+            data = stream.read(min(chunk_size, remaining))
+            if not data:
+                break
+            part.write(data)
+            remaining -= len(data)
+
+    return end - start + 1 - remaining
+
+
+def finalize_session(session):
+    """Hash the assembled file and turn it into an attachment"""
+    path = session_path(session)
+    hasher = hashlib.sha256()
+    with open(path, "rb") as part:
+        for data in iter(lambda: part.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(data)
+
+    with open(path, "rb") as part:
+        content = LocalFile(part)
+        content.size = session.size
+        attachment = create_attachment(
+            session.card,
+            session.uploaded_by,
+            content,
+            session.filename,
+            hasher.hexdigest(),
+            session.content_type,
+        )
+
+    # Blob trùng lặp: file tạm chưa bị move thì xoá
+    if path.exists():
+        os.remove(path)
+
+    session.attachment = attachment
+    session.save(update_fields=["attachment", "updated_at"])
+    return attachment
+
+
+def purge_unreferenced(grace=timedelta(hours=1), batch_size=500):
+    """Delete blobs unreferenced for ``grace`` and expired upload sessions"""
+    now = timezone.now()
+    with transaction.atomic():
+        blobs = list(
+            AttachmentBlob.objects.select_for_update(skip_locked=True).filter(
+                ref_count__lte=0, released_at__lt=now - grace
+            )[:batch_size]
+        )
+        blob_ids = [blob.id for blob in blobs]
+        names = [blob.file.name for blob in blobs]
+        # Thumbnail rows cascade; their files have to be removed here too
+        thumbnail_names = list(
+            AttachmentThumbnail.objects.filter(blob_id__in=blob_ids).values_list(
+                "file", flat=True
+            )
+        )
+        AttachmentBlob.objects.filter(id__in=blob_ids).delete()
+
+        storage = AttachmentBlob._meta.get_field("file").storage
+        thumbnail_storage = AttachmentThumbnail._meta.get_field("file").storage
+
+        def delete_files():
+            for name in names:
+                storage.delete(name)
+            for name in thumbnail_names:
+                thumbnail_storage.delete(name)
+
+        transaction.on_commit(delete_files)
+
+    sweep_staged_blobs(grace)
+
+    expired = UploadSession.objects.filter(
+        attachment__isnull=True,
+        updated_at__lt=now - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    )
+    sessions = 0
+    for session in expired[:batch_size]:
+        session_path(session).unlink(missing_ok=True)
+        session.delete()
+        sessions += 1
+    return len(blobs), sessions
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -9,7 +10,18 @@ router.register(r"cards", views.CardViewSet, basename="card")
 router.register(r"sprints", views.SprintViewSet, basename="sprint")
 router.register(r"comments", views.CommentViewSet, basename="comment")
 router.register(r"attachments", views.CardAttachmentViewSet, basename="attachment")
+router.register(r"uploads", views.UploadSessionViewSet, basename="upload")
 
 urlpatterns = [
     path("", include(router.urls)),
 ]
+
+if settings.KANBAN_ASYNC_READS:
+    from . import async_views
+
+    # Đứng trước router: GET chạy async, các method khác vẫn vào viewset
+    urlpatterns = [
+        path("boards/<int:pk>/", async_views.board_detail),
+        path("boards/<int:pk>/statistics/", async_views.board_statistics),
+        path("cards/", async_views.card_list),
+    ] + urlpatterns
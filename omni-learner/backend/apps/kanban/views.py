@@ -1,14 +1,42 @@
-from rest_framework import viewsets, status, filters
+import re
+
+from rest_framework import mixins, viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import CursorPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.db import models
 from django.utils import timezone
 
-from .models import Board, Column, Card, Sprint, Comment, CardAttachment
+from apps.core.locks import single_flight
+
+from .models import (
+    Board,
+    Column,
+    Card,
+    CardEvent,
+    CardEventBuffer,
+    Sprint,
+    Comment,
+    CardAttachment,
+    AttachmentThumbnail,
+    UploadSession,
+)
+from .metrics import board_statistics, compute_burndown, compute_velocity
+from .downloads import serve_attachment
+from .reminders import schedule_reminders
+from .uploads import (
+    HashingFileUploadHandler,
+    acquire_blob,
+    append_chunk,
+    create_attachment,
+    file_sha256,
+    finalize_session,
+    release_blob,
+)
 from .serializers import (
     BoardListSerializer,
     BoardDetailSerializer,
@@ -16,16 +44,82 @@ from .serializers import (
     CardSerializer,
     CardDetailSerializer,
     MoveCardSerializer,
+    ColumnReorderSerializer,
+    CardReorderSerializer,
     SprintSerializer,
     SprintDetailSerializer,
     CommentSerializer,
     CardAttachmentSerializer,
     BulkCardUpdateSerializer,
     ColumnWithCardsSerializer,
+    CardEventSerializer,
+    UploadSessionSerializer,
 )
 
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+def _apply_positions(queryset, orders):
+    """Set every ``{"id", "position"}`` of ``orders`` in one UPDATE ... CASE"""
+    return queryset.filter(id__in=[item["id"] for item in orders]).update(
+        position=models.Case(
+            *[
+                models.When(id=item["id"], then=models.Value(item["position"]))
+                for item in orders
+            ],
+            output_field=models.IntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def _foreign_ids(queryset, orders):
+    """Ids in ``orders`` that are not in ``queryset`` (one query)"""
+    ids = {item["id"] for item in orders}
+    return sorted(ids - set(queryset.filter(id__in=ids).values_list("id", flat=True)))
+
+
+# Fields whose changes are written to the card event log
+TRACKED_CARD_FIELDS = [
+    "title",
+    "description",
+    "assigned_to_id",
+    "estimated_hours",
+    "actual_hours",
+    "priority",
+    "tags",
+    "due_date",
+]
 
-class BoardViewSet(viewsets.ModelViewSet):
+
+def _event_value(value):
+    """Make a field value JSON-serializable for CardEvent.data"""
+    if value is None or isinstance(value, (bool, int, float, str, list, dict)):
+        return value
+    return str(value)
+
+
+class ActivityPagination(CursorPagination):
+    """Cursor pagination for the append-only card event log"""
+
+    page_size = 50
+    ordering = "-timestamp"
+
+
+class ActivityFeedMixin:
+    """Render a paginated activity feed from a CardEvent queryset"""
+
+    def activity_response(self, events):
+        paginator = ActivityPagination()
+        # view=None: the viewset's OrderingFilter must not override the cursor
+        page = paginator.paginate_queryset(
+            events.select_related("card", "actor"), self.request, view=None
+        )
+        serializer = CardEventSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class BoardViewSet(ActivityFeedMixin, viewsets.ModelViewSet):
     """
     ViewSet for Boards
 
@@ -98,62 +192,80 @@ class BoardViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(new_board)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
-    @action(detail=True, methods=['post'])
+
+    @action(detail=True, methods=["post"])
     def archive(self, request, pk=None):
         """Archive a board"""
         board = self.get_object()
         board.is_archived = True
         board.is_active = False
         board.save()
-        
+
         serializer = self.get_serializer(board)
         return Response(serializer.data)
 
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=["post"])
     def unarchive(self, request, pk=None):
         """Unarchive a board"""
         board = self.get_object()
         board.is_archived = False
         board.is_active = True
         board.save()
-        
+
         serializer = self.get_serializer(board)
         return Response(serializer.data)
 
     @action(detail=True, methods=["get"])
     def statistics(self, request, pk=None):
-        """Get board statistics"""
-        board = self.get_object()
-        cards = Card.objects.filter(column__board=board)
-
-        stats = {
-            "total_cards": cards.count(),
-            "completed_cards": cards.filter(completed_at__isnull=False).count(),
-            "in_progress_cards": cards.filter(
-                started_at__isnull=False, completed_at__isnull=True
-            ).count(),
-            "overdue_cards": cards.filter(
-                due_date__lt=timezone.now(), completed_at__isnull=True
-            ).count(),
-            "total_estimated_hours": float(
-                cards.aggregate(total=models.Sum("estimated_hours"))["total"] or 0
-            ),
-            "total_actual_hours": float(
-                cards.aggregate(total=models.Sum("actual_hours"))["total"] or 0
-            ),
-            "cards_by_priority": {
-                priority: cards.filter(priority=priority).count()
-                for priority, _ in Card.PRIORITY_CHOICES
-            },
-            "cards_by_status": {
-                status: cards.filter(status=status).count()
-                for status, _ in Card.STATUS_CHOICES
-            },
-        }
+        """Get board statistics
 
+        Concurrent requests for the same board share one computation.
+        """
+        board = self.get_object()
+        stats = single_flight(
+            f"board-statistics:{board.id}", lambda: board_statistics(board.id)
+        )
         return Response(stats)
 
+    @action(detail=True, methods=["get"])
+    def velocity(self, request, pk=None):
+        """Rolling sprint velocity and projected completion
+
+        Query params: ?window=3 (number of sprints in the rolling average)
+        """
+        board = self.get_object()
+        try:
+            window = int(request.query_params.get("window", 3))
+        except ValueError:
+            return Response(
+                {"error": "window must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        sprints = (
+            Sprint.objects.filter(board=board)
+            .filter(models.Q(is_completed=True) | models.Q(is_active=True))
+            .order_by("start_date")
+            .values(
+                "id",
+                "name",
+                "start_date",
+                "end_date",
+                "planned_story_points",
+                "completed_story_points",
+                "is_active",
+                "is_completed",
+            )
+        )
+
+        return Response(compute_velocity(sprints, window=window))
+
+    @action(detail=True, methods=["get"])
+    def activity(self, request, pk=None):
+        """Paginated activity feed of card events on this board"""
+        board = self.get_object()
+        return self.activity_response(CardEvent.objects.filter(board=board))
+
 
 class ColumnViewSet(viewsets.ModelViewSet):
     """
@@ -182,23 +294,27 @@ class ColumnViewSet(viewsets.ModelViewSet):
 
         Payload: { "board_id": 1, "column_orders": [{"id": 1, "position": 0}, ...] }
         """
-        board_id = request.data.get("board_id")
-        column_orders = request.data.get("column_orders", [])
+        serializer = ColumnReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        board_id = serializer.validated_data["board_id"]
+        orders = serializer.validated_data["column_orders"]
 
-        board = get_object_or_404(Board, id=board_id, owner=request.user)
+        # Một query kiểm tra quyền sở hữu của tất cả id
+        columns = Column.objects.filter(board_id=board_id, board__owner=request.user)
+        invalid = _foreign_ids(columns, orders)
+        if invalid:
+            return Response(
+                {"error": f"Columns not on this board: {invalid}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        with transaction.atomic():
-            for item in column_orders:
-                Column.objects.filter(id=item["id"], board=board).update(
-                    position=item["position"]
-                )
+        _apply_positions(columns, orders)
 
-        columns = Column.objects.filter(board=board).order_by("position")
-        serializer = self.get_serializer(columns, many=True)
+        serializer = self.get_serializer(columns.order_by("position"), many=True)
         return Response(serializer.data)
 
 
-class CardViewSet(viewsets.ModelViewSet):
+class CardViewSet(ActivityFeedMixin, viewsets.ModelViewSet):
     """
     ViewSet for Cards
 
@@ -224,11 +340,9 @@ class CardViewSet(viewsets.ModelViewSet):
         if board_id:
             queryset = queryset.filter(column__board_id=board_id)
 
-        # Filter overdue cards
+        # Filter overdue cards (cùng điều kiện với board statistics)
         if self.request.query_params.get("overdue") == "true":
-            queryset = queryset.filter(
-                due_date__lt=timezone.now(), completed_at__isnull=True
-            )
+            queryset = queryset.filter(Card.overdue_q())
 
         return queryset.select_related("column", "assigned_to")
 
@@ -237,6 +351,64 @@ class CardViewSet(viewsets.ModelViewSet):
             return CardDetailSerializer
         return CardSerializer
 
+    def perform_create(self, serializer):
+        card = serializer.save()
+        CardEvent.build(card, "created", actor=self.request.user).save()
+        if card.due_date:
+            schedule_reminders([card])
+
+    def perform_update(self, serializer):
+        """Save card and log what changed"""
+        card = serializer.instance
+        old_column = card.column
+        old_status = card.status
+        old_completed_at = card.completed_at
+        before = {field: getattr(card, field) for field in TRACKED_CARD_FIELDS}
+
+        card = serializer.save()
+
+        if card.due_date != before["due_date"] or card.completed_at != old_completed_at:
+            schedule_reminders([card])
+
+        with CardEventBuffer() as buffer:
+            if card.column_id != old_column.id:
+                buffer.add(
+                    CardEvent.build(
+                        card,
+                        "moved",
+                        actor=self.request.user,
+                        from_column=old_column,
+                        to_column=card.column,
+                    )
+                )
+            if card.status != old_status:
+                buffer.add(
+                    CardEvent.build(
+                        card,
+                        "status_changed",
+                        actor=self.request.user,
+                        data={"status": [old_status, card.status]},
+                    )
+                )
+
+            changes = {
+                field: [_event_value(old), _event_value(getattr(card, field))]
+                for field, old in before.items()
+                if getattr(card, field) != old
+            }
+            if changes:
+                buffer.add(
+                    CardEvent.build(
+                        card, "updated", actor=self.request.user, data=changes
+                    )
+                )
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk=None):
+        """Paginated event history of a card"""
+        card = self.get_object()
+        return self.activity_response(CardEvent.objects.filter(card=card))
+
     @action(detail=True, methods=["post"])
     def move(self, request, pk=None):
         """Move card to another column
@@ -253,11 +425,46 @@ class CardViewSet(viewsets.ModelViewSet):
 
         with transaction.atomic():
             card.move_to_column(
-                target_column, position=serializer.validated_data.get("position")
+                target_column,
+                position=serializer.validated_data.get("position"),
+                actor=request.user,
             )
 
         return Response(CardDetailSerializer(card).data)
 
+    @action(detail=False, methods=["post"])
+    def reorder(self, request):
+        """Reorder cards within a column in one statement
+
+        Payload: { "column_id": 3, "card_orders": [{"id": 7, "position": 0}, ...] }
+        Cards are not moved between columns (use move for that).
+        """
+        serializer = CardReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        column_id = serializer.validated_data["column_id"]
+        orders = serializer.validated_data["card_orders"]
+
+        cards = Card.objects.filter(
+            column_id=column_id, column__board__owner=request.user
+        )
+        invalid = _foreign_ids(cards, orders)
+        if invalid:
+            return Response(
+                {"error": f"Cards not in this column: {invalid}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        updated_count = _apply_positions(cards, orders)
+
+        return Response(
+            {
+                "updated_count": updated_count,
+                "card_orders": list(
+                    cards.order_by("position", "id").values("id", "position")
+                ),
+            }
+        )
+
     @action(detail=True, methods=["post"])
     def start(self, request, pk=None):
         """Start working on a card"""
@@ -268,9 +475,23 @@ class CardViewSet(viewsets.ModelViewSet):
                 {"error": "Card already started"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        old_status = card.status
         card.started_at = timezone.now()
         card.status = "normal"
-        card.save()
+
+        with transaction.atomic():
+            card.save()
+            with CardEventBuffer() as buffer:
+                buffer.add(CardEvent.build(card, "started", actor=request.user))
+                if old_status != card.status:
+                    buffer.add(
+                        CardEvent.build(
+                            card,
+                            "status_changed",
+                            actor=request.user,
+                            data={"status": [old_status, card.status]},
+                        )
+                    )
 
         return Response(CardDetailSerializer(card).data)
 
@@ -284,9 +505,24 @@ class CardViewSet(viewsets.ModelViewSet):
                 {"error": "Card already completed"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        old_status = card.status
         card.completed_at = timezone.now()
         card.status = "normal"
-        card.save()
+
+        with transaction.atomic():
+            card.save()
+            schedule_reminders([card])
+            with CardEventBuffer() as buffer:
+                buffer.add(CardEvent.build(card, "completed", actor=request.user))
+                if old_status != card.status:
+                    buffer.add(
+                        CardEvent.build(
+                            card,
+                            "status_changed",
+                            actor=request.user,
+                            data={"status": [old_status, card.status]},
+                        )
+                    )
 
         return Response(CardDetailSerializer(card).data)
 
@@ -306,8 +542,36 @@ class CardViewSet(viewsets.ModelViewSet):
         updates = serializer.validated_data["updates"]
 
         cards = Card.objects.filter(id__in=card_ids, column__board__owner=request.user)
+        before = list(cards.values("id", "column__board_id", *updates.keys()))
 
-        updated_count = cards.update(**updates)
+        with transaction.atomic():
+            updated_count = cards.update(**updates)
+
+            with CardEventBuffer() as buffer:
+                for row in before:
+                    changes = {
+                        field: [_event_value(row[field]), value]
+                        for field, value in updates.items()
+                        if str(row[field]) != str(value)
+                    }
+                    status_change = changes.pop("status", None)
+                    common = {
+                        "card_id": row["id"],
+                        "board_id": row["column__board_id"],
+                        "actor": request.user,
+                    }
+                    if status_change:
+                        buffer.add(
+                            CardEvent(
+                                event_type="status_changed",
+                                data={"status": status_change},
+                                **common,
+                            )
+                        )
+                    if changes:
+                        buffer.add(
+                            CardEvent(event_type="updated", data=changes, **common)
+                        )
 
         return Response(
             {
@@ -365,6 +629,16 @@ class SprintViewSet(viewsets.ModelViewSet):
 
         return Response(SprintDetailSerializer(sprint).data)
 
+    @action(detail=True, methods=["get"])
+    def burndown(self, request, pk=None):
+        """Ideal vs actual burndown built from daily snapshots"""
+        sprint = self.get_object()
+        snapshots = sprint.snapshots.order_by("date").values(
+            "date", "total_cards", "remaining_cards", "remaining_hours"
+        )
+
+        return Response(compute_burndown(sprint, snapshots))
+
 
 class CommentViewSet(viewsets.ModelViewSet):
     """ViewSet for Comments"""
@@ -384,7 +658,12 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 
 class CardAttachmentViewSet(viewsets.ModelViewSet):
-    """ViewSet for Card Attachments"""
+    """
+    ViewSet for Card Attachments
+
+    Uploaded files are streamed to disk while hashed and stored once per
+    SHA-256 (see apps.kanban.uploads).
+    """
 
     permission_classes = [IsAuthenticated]
     serializer_class = CardAttachmentSerializer
@@ -392,12 +671,138 @@ class CardAttachmentViewSet(viewsets.ModelViewSet):
     filterset_fields = ["card"]
 
     def get_queryset(self):
-        return CardAttachment.objects.filter(
-            card__column__board__owner=self.request.user
+        return (
+            CardAttachment.objects.filter(card__column__board__owner=self.request.user)
+            .select_related("blob", "uploaded_by")
+            .prefetch_related("blob__thumbnails")
         )
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Phải gắn handler trước khi body multipart được parse
+        request.upload_handlers = [HashingFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        file = self.request.FILES.get("file")
+        file = serializer.validated_data["file"]
+        serializer.instance = create_attachment(
+            serializer.validated_data["card"],
+            self.request.user,
+            file,
+            serializer.validated_data.get("filename") or file.name,
+            file_sha256(file),
+            file.content_type or "",
+        )
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Download the file (Range / conditional requests supported)
+
+        ?inline=true to display in the browser instead of saving.
+        ?size=small|medium|large for a generated WebP thumbnail instead.
+        """
+        attachment = self.get_object()
+        inline = request.query_params.get("inline") == "true"
+        size = request.query_params.get("size")
+        thumbnail = None
+        if size:
+            thumbnail = get_object_or_404(
+                AttachmentThumbnail, blob_id=attachment.blob_id, size=size
+            )
+        return serve_attachment(
+            request, attachment, as_attachment=not inline, thumbnail=thumbnail
+        )
+
+    def perform_update(self, serializer):
+        file = serializer.validated_data.pop("file", None)
+        if file is None:
+            serializer.save()
+            return
+
+        attachment = serializer.instance
+        old_blob_id = attachment.blob_id
+        blob = acquire_blob(file, file_sha256(file), file.size, file.content_type or "")
         serializer.save(
-            uploaded_by=self.request.user, filename=file.name, file_size=file.size
+            blob=blob,
+            file=blob.file.name,
+            filename=serializer.validated_data.get("filename") or file.name,
+            file_size=blob.size,
+        )
+        if old_blob_id:
+            release_blob(old_blob_id)
+
+
+class UploadSessionViewSet(
+    mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """
+    Resumable chunked attachment uploads
+
+    create: Start an upload { "card", "filename", "size", "content_type" }
+    retrieve: Upload progress (resume from ``received``)
+    update: PUT raw bytes with "Content-Range: bytes start-end/total"
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = UploadSessionSerializer
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(uploaded_by=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(uploaded_by=self.request.user)
+
+    def update(self, request, *args, **kwargs):
+        """Append one chunk; the last chunk creates the attachment"""
+        match = CONTENT_RANGE_RE.match(request.headers.get("Content-Range", ""))
+        if not match:
+            return Response(
+                {"error": "Content-Range: bytes start-end/total is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end, total = (int(value) for value in match.groups())
+        if request.stream is None:
+            # Content-Length: 0 -> DRF không có stream
+            return Response(
+                {"error": "Chunk body is empty"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            session = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=kwargs["pk"]
+            )
+            if session.is_complete:
+                return Response(
+                    {"error": "Upload already complete"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if total != session.size or end < start or end >= total:
+                return Response(
+                    {"error": "Content-Range does not match the upload size"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if start != session.received:
+                # Client gửi lại từ offset server đã nhận
+                return Response(
+                    {"error": "Unexpected offset", "received": session.received},
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            written = append_chunk(session, request.stream, start, end)
+            session.received = start + written
+            session.save(update_fields=["received", "updated_at"])
+            if written < end - start + 1:
+                return Response(
+                    {"error": "Incomplete chunk", "received": session.received},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if session.received < session.size:
+                return Response(self.get_serializer(session).data)
+
+            attachment = finalize_session(session)
+
+        return Response(
+            CardAttachmentSerializer(attachment, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
         )
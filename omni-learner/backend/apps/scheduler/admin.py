@@ -1,3 +1,19 @@
 from django.contrib import admin
+from .models import AvailabilityWindow, TimeBlock
 
-# Register your models here.
+
+@admin.register(AvailabilityWindow)
+class AvailabilityWindowAdmin(admin.ModelAdmin):
+    list_display = ["user", "weekday", "start_time", "end_time", "is_active"]
+    list_filter = ["weekday", "is_active"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
+
+
+@admin.register(TimeBlock)
+class TimeBlockAdmin(admin.ModelAdmin):
+    list_display = ["user", "card", "start", "end", "is_locked", "is_late"]
+    list_filter = ["is_locked", "is_late", "start"]
+    search_fields = ["user__email", "card__title"]
+    raw_id_fields = ["user", "card"]
+    readonly_fields = ["created_at", "updated_at"]
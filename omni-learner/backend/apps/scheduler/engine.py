@@ -0,0 +1,155 @@
+"""Time-block packing over a sorted free-slot list
+
+Pure Python and database-free: the services layer loads availability,
+pinned blocks and open cards, and persists whatever ``schedule`` returns.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Thẻ không có hạn: hạn "mềm" theo độ ưu tiên
+PRIORITY_HORIZON = {
+    "urgent": timedelta(days=1),
+    "high": timedelta(days=3),
+    "medium": timedelta(days=7),
+    "low": timedelta(days=14),
+}
+PRIORITY_RANK = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+
+MIN_BLOCK = timedelta(minutes=15)
+
+
+@dataclass
+class Task:
+    card_id: int
+    hours: float
+    priority: str = "medium"
+    due_date: datetime = None
+    position: int = 0
+
+
+@dataclass
+class Block:
+    card_id: int
+    start: datetime
+    end: datetime
+    is_late: bool = False
+
+
+class FreeSlots:
+    """Disjoint free intervals kept sorted by start
+
+    ``starts`` mirrors ``slots`` so lookups are a bisect; reserving or
+    consuming time only touches the slots that overlap it.
+    """
+
+    def __init__(self, intervals=()):
+        self.slots = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.slots and start <= self.slots[-1][1]:
+                # Gộp các khoảng chồng lấn
+                prev_start, prev_end = self.slots[-1]
+                self.slots[-1] = (prev_start, max(prev_end, end))
+            else:
+                self.slots.append((start, end))
+        self.starts = [start for start, _ in self.slots]
+
+    @classmethod
+    def from_windows(cls, windows, start, end, tz):
+        """Expand weekly (weekday, start_time, end_time) windows over a range"""
+        intervals = []
+        day = start.astimezone(tz).date()
+        last_day = end.astimezone(tz).date()
+        while day <= last_day:
+            for weekday, from_time, to_time in windows:
+                if weekday != day.weekday():
+                    continue
+                window_start = datetime.combine(day, from_time, tzinfo=tz)
+                window_end = datetime.combine(day, to_time, tzinfo=tz)
+                intervals.append((max(window_start, start), min(window_end, end)))
+            day += timedelta(days=1)
+        return cls(intervals)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _first_overlapping(self, at):
+        index = bisect_right(self.starts, at) - 1
+        if index < 0 or self.slots[index][1] <= at:
+            index += 1
+        return index
+
+    def reserve(self, start, end):
+        """Remove [start, end) from the free time"""
+        index = self._first_overlapping(start)
+        replaced = []
+        stop = index
+        while stop < len(self.slots) and self.slots[stop][0] < end:
+            slot_start, slot_end = self.slots[stop]
+            if slot_start < start:
+                replaced.append((slot_start, start))
+            if slot_end > end:
+                replaced.append((end, slot_end))
+            stop += 1
+
+        self.slots[index:stop] = replaced
+        self.starts[index:stop] = [slot_start for slot_start, _ in replaced]
+
+    def allocate(self, duration, min_block=MIN_BLOCK):
+        """Take ``duration`` from the earliest free slots, splitting if needed
+
+        Slots shorter than ``min_block`` are skipped. Returns the list of
+        (start, end) pieces, or an empty list if the time does not fit.
+        """
+        pieces, remaining, index = [], duration, 0
+        while remaining > timedelta(0) and index < len(self.slots):
+            slot_start, slot_end = self.slots[index]
+            length = slot_end - slot_start
+            if length >= min(min_block, remaining):
+                take = min(length, remaining)
+                pieces.append((slot_start, slot_start + take))
+                remaining -= take
+            index += 1
+
+        if remaining > timedelta(0):
+            return []
+        for start, end in pieces:
+            self.reserve(start, end)
+        return pieces
+
+
+def deadline(task, now):
+    """Effective deadline: the due date, else a priority-based horizon"""
+    return task.due_date or now + PRIORITY_HORIZON.get(
+        task.priority, PRIORITY_HORIZON["medium"]
+    )
+
+
+def schedule(tasks, free_slots, now):
+    """Pack tasks earliest-deadline-first, ties broken by priority
+
+    Returns (blocks, unscheduled card ids).
+    """
+    ordered = sorted(
+        tasks,
+        key=lambda task: (
+            deadline(task, now),
+            PRIORITY_RANK.get(task.priority, 2),
+            task.position,
+            task.card_id,
+        ),
+    )
+
+    blocks, unscheduled = [], []
+    for task in ordered:
+        pieces = free_slots.allocate(timedelta(hours=task.hours))
+        if not pieces:
+            unscheduled.append(task.card_id)
+            continue
+        for start, end in pieces:
+            late = task.due_date is not None and end > task.due_date
+            blocks.append(Block(task.card_id, start, end, late))
+    return blocks, unscheduled
@@ -0,0 +1,127 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("kanban", "0006_index_plan"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityWindow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "weekday",
+                    models.IntegerField(
+                        choices=[
+                            (0, "Monday"),
+                            (1, "Tuesday"),
+                            (2, "Wednesday"),
+                            (3, "Thursday"),
+                            (4, "Friday"),
+                            (5, "Saturday"),
+                            (6, "Sunday"),
+                        ]
+                    ),
+                ),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_windows",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "scheduler_availability_windows",
+                "ordering": ["user", "weekday", "start_time"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "weekday"],
+                        name="scheduler_a_user_id_137108_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="TimeBlock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                (
+                    "is_locked",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Pinned by the user; kept when rescheduling",
+                    ),
+                ),
+                (
+                    "is_late",
+                    models.BooleanField(
+                        default=False, help_text="Block ends after the card's due date"
+                    ),
+                ),
+                (
+                    "card",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="time_blocks",
+                        to="kanban.card",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="time_blocks",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "scheduler_time_blocks",
+                "ordering": ["start"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "start"], name="scheduler_t_user_id_57036e_idx"
+                    ),
+                    models.Index(
+                        fields=["card"], name="scheduler_t_card_id_f8da90_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
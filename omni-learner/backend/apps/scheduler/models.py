@@ -1,3 +1,77 @@
 from django.db import models
+from django.conf import settings
 
-# Create your models here.
+from apps.core.models import BaseModel
+
+
+class AvailabilityWindow(BaseModel):
+    """Weekly recurring window (local time) in which work can be scheduled"""
+
+    WEEKDAY_CHOICES = [
+        (0, "Monday"),
+        (1, "Tuesday"),
+        (2, "Wednesday"),
+        (3, "Thursday"),
+        (4, "Friday"),
+        (5, "Saturday"),
+        (6, "Sunday"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="availability_windows",
+    )
+    weekday = models.IntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "scheduler_availability_windows"
+        ordering = ["user", "weekday", "start_time"]
+        indexes = [
+            models.Index(fields=["user", "weekday"]),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_weekday_display()} "
+            f"{self.start_time:%H:%M}-{self.end_time:%H:%M}"
+        )
+
+
+class TimeBlock(BaseModel):
+    """A scheduled slot of work on a card"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="time_blocks",
+    )
+    card = models.ForeignKey(
+        "kanban.Card", on_delete=models.CASCADE, related_name="time_blocks"
+    )
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    is_locked = models.BooleanField(
+        default=False, help_text="Pinned by the user; kept when rescheduling"
+    )
+    is_late = models.BooleanField(
+        default=False, help_text="Block ends after the card's due date"
+    )
+
+    class Meta:
+        db_table = "scheduler_time_blocks"
+        ordering = ["start"]
+        indexes = [
+            models.Index(fields=["user", "start"]),
+            models.Index(fields=["card"]),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id} {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M}"
+
+    @property
+    def duration_hours(self):
+        return round((self.end - self.start).total_seconds() / 3600, 2)
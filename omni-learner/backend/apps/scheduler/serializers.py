@@ -0,0 +1,64 @@
+from rest_framework import serializers
+
+from .models import AvailabilityWindow, TimeBlock
+
+
+class AvailabilityWindowSerializer(serializers.ModelSerializer):
+    """Serializer cho availability windows"""
+
+    class Meta:
+        model = AvailabilityWindow
+        fields = [
+            "id",
+            "weekday",
+            "start_time",
+            "end_time",
+            "is_active",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["created_at", "updated_at"]
+
+    def validate(self, data):
+        start = data.get("start_time", getattr(self.instance, "start_time", None))
+        end = data.get("end_time", getattr(self.instance, "end_time", None))
+        if start and end and start >= end:
+            raise serializers.ValidationError("end_time must be after start_time")
+        return data
+
+
+class TimeBlockSerializer(serializers.ModelSerializer):
+    """Serializer cho time blocks"""
+
+    card_title = serializers.CharField(source="card.title", read_only=True)
+    card_priority = serializers.CharField(source="card.priority", read_only=True)
+    duration_hours = serializers.ReadOnlyField()
+
+    class Meta:
+        model = TimeBlock
+        fields = [
+            "id",
+            "card",
+            "card_title",
+            "card_priority",
+            "start",
+            "end",
+            "duration_hours",
+            "is_locked",
+            "is_late",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["is_late", "created_at", "updated_at"]
+
+    def validate_card(self, value):
+        if value.column.board.owner != self.context["request"].user:
+            raise serializers.ValidationError("Card not found")
+        return value
+
+    def validate(self, data):
+        start = data.get("start", getattr(self.instance, "start", None))
+        end = data.get("end", getattr(self.instance, "end", None))
+        if start and end and start >= end:
+            raise serializers.ValidationError("end must be after start")
+        return data
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.kanban.models import Card
+from .engine import FreeSlots, Task, schedule
+from .models import AvailabilityWindow, TimeBlock
+
+
+def reschedule_user(user_id, now=None):
+    """Rebuild a user's unpinned time blocks over the scheduling horizon
+
+    Three reads (windows, pinned blocks, open cards), the packing in memory,
+    then one DELETE and one bulk INSERT.
+    """
+    now = now or timezone.now()
+    horizon = now + timedelta(days=settings.SCHEDULER_HORIZON_DAYS)
+
+    windows = AvailabilityWindow.objects.filter(
+        user_id=user_id, is_active=True
+    ).values_list("weekday", "start_time", "end_time")
+    free_slots = FreeSlots.from_windows(
+        windows, now, horizon, timezone.get_current_timezone()
+    )
+
+    pinned = TimeBlock.objects.filter(
+        user_id=user_id, is_locked=True, end__gt=now, start__lt=horizon
+    )
+    pinned_hours = {}
+    for block in pinned:
+        free_slots.reserve(block.start, block.end)
+        pinned_hours[block.card_id] = (
+            pinned_hours.get(block.card_id, 0) + block.duration_hours
+        )
+
+    cards = Card.objects.filter(
+        column__board__owner_id=user_id,
+        column__board__is_active=True,
+        completed_at__isnull=True,
+    ).values(
+        "id", "estimated_hours", "actual_hours", "priority", "due_date", "position"
+    )
+
+    tasks = []
+    for card in cards:
+        hours = float(
+            card["estimated_hours"] - card["actual_hours"]
+        ) - pinned_hours.get(card["id"], 0)
+        if hours > 0:
+            tasks.append(
+                Task(
+                    card_id=card["id"],
+                    hours=hours,
+                    priority=card["priority"],
+                    due_date=card["due_date"],
+                    position=card["position"],
+                )
+            )
+
+    blocks, unscheduled = schedule(tasks, free_slots, now)
+
+    with transaction.atomic():
+        TimeBlock.objects.filter(user_id=user_id, is_locked=False, end__gt=now).delete()
+        TimeBlock.objects.bulk_create(
+            [
+                TimeBlock(
+                    user_id=user_id,
+                    card_id=block.card_id,
+                    start=block.start,
+                    end=block.end,
+                    is_late=block.is_late,
+                )
+                for block in blocks
+            ],
+            batch_size=500,
+        )
+
+    return {
+        "blocks": len(blocks),
+        "late": sum(block.is_late for block in blocks),
+        "unscheduled": unscheduled,
+    }
@@ -0,0 +1,41 @@
+from celery import shared_task
+
+from apps.core.fanout import fan_out, id_bounds
+from apps.core.locks import single_instance
+
+from .models import AvailabilityWindow
+from .services import reschedule_user
+
+# Users per shard / shards per message
+SHARD_SIZE = 500
+SHARDS_PER_MESSAGE = 4
+
+
+def _scheduled_users():
+    return (
+        AvailabilityWindow.objects.filter(is_active=True)
+        .order_by()
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+@shared_task
+def reschedule_user_range(id_from, id_to):
+    """Reschedule every user with availability in [id_from, id_to)"""
+    user_ids = _scheduled_users().filter(user_id__gte=id_from, user_id__lt=id_to)
+    for user_id in user_ids:
+        reschedule_user(user_id)
+    return len(user_ids)
+
+
+@shared_task
+@single_instance(ttl=60 * 60, hold=True)
+def reschedule_all_users():
+    """Beat entry point: fan the nightly reschedule out across workers"""
+    return fan_out(
+        reschedule_user_range,
+        id_bounds(AvailabilityWindow.objects.filter(is_active=True), "user_id"),
+        shard_size=SHARD_SIZE,
+        shards_per_message=SHARDS_PER_MESSAGE,
+    )
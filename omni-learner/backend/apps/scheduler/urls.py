@@ -0,0 +1,13 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r"blocks", views.TimeBlockViewSet, basename="block")
+router.register(
+    r"availability", views.AvailabilityWindowViewSet, basename="availability"
+)
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -1,3 +1,82 @@
-from django.shortcuts import render
+from datetime import date, datetime, time, timedelta
 
-# Create your views here.
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.utils import timezone
+
+from .models import AvailabilityWindow, TimeBlock
+from .serializers import AvailabilityWindowSerializer, TimeBlockSerializer
+from .services import reschedule_user
+
+
+class AvailabilityWindowViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for weekly availability windows
+
+    list, create, retrieve, update, destroy
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = AvailabilityWindowSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        return AvailabilityWindow.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class TimeBlockViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for scheduled time blocks
+
+    list: Blocks in a date range (?start=&end=, default: next 7 days)
+    create: Manually placed (pinned) block
+    reschedule: Re-pack unpinned blocks from now on
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TimeBlockSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        queryset = TimeBlock.objects.filter(user=self.request.user).select_related(
+            "card"
+        )
+        if self.action != "list":
+            return queryset
+
+        params = self.request.query_params
+        try:
+            start = (
+                date.fromisoformat(params["start"])
+                if "start" in params
+                else timezone.localdate()
+            )
+            end = (
+                date.fromisoformat(params["end"])
+                if "end" in params
+                else start + timedelta(days=6)
+            )
+        except ValueError:
+            raise ValidationError({"error": "start/end must be YYYY-MM-DD"})
+
+        tz = timezone.get_current_timezone()
+        return queryset.filter(
+            start__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+            end__gt=datetime.combine(start, time.min, tzinfo=tz),
+        )
+
+    def perform_create(self, serializer):
+        # Block tạo tay luôn được giữ nguyên khi xếp lịch lại
+        serializer.save(user=self.request.user, is_locked=True)
+
+    @action(detail=False, methods=["post"])
+    def reschedule(self, request):
+        """Re-pack the current user's open cards into time blocks"""
+        result = reschedule_user(request.user.id)
+        return Response(result)
@@ -0,0 +1,145 @@
+"""Write-behind tracking of User.last_activity
+
+Requests only touch a buffer (Redis hash or in-process dict), throttled per
+user; the buffer is drained periodically into one batched UPDATE.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from apps.core.redis import get_redis
+
+from .authentication import invalidate_users
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "users:last_seen"
+
+# Per-process throttle table is trimmed once it grows past this many users
+MAX_THROTTLE_ENTRIES = 50000
+
+
+class RedisActivityBuffer:
+    """Last-seen timestamps in a Redis hash shared by all processes"""
+
+    def record(self, user_id, timestamp):
+        get_redis().hset(BUFFER_KEY, user_id, timestamp)
+
+    def drain(self):
+        from redis.exceptions import ResponseError
+
+        client = get_redis()
+        # RENAME là atomic: request mới ghi vào hash mới trong lúc flush
+        flushing = f"{BUFFER_KEY}:flushing:{uuid.uuid4().hex}"
+        try:
+            client.rename(BUFFER_KEY, flushing)
+        except ResponseError:
+            # Hash không tồn tại -> không có gì để flush
+            return {}
+        pipe = client.pipeline()
+        pipe.hgetall(flushing)
+        pipe.delete(flushing)
+        entries, _ = pipe.execute()
+        return {int(k): float(v) for k, v in entries.items()}
+
+
+class LocalActivityBuffer:
+    """In-process buffer for single-process deployments and development"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id, timestamp):
+        with self._lock:
+            self._entries[user_id] = timestamp
+
+    def drain(self):
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        return entries
+
+
+class ActivityTracker:
+    """Throttled front-end to an activity buffer"""
+
+    def __init__(self, buffer, throttle_seconds, flush_seconds=None):
+        self.buffer = buffer
+        self.throttle_seconds = throttle_seconds
+        self.flush_seconds = flush_seconds
+        self._last_recorded = {}
+        self._last_flush = time.time()
+
+    def touch(self, user_id):
+        """Record activity for ``user_id`` unless it was recorded recently"""
+        now = time.time()
+        last = self._last_recorded.get(user_id)
+        if last is not None and now - last < self.throttle_seconds:
+            return False
+
+        if len(self._last_recorded) >= MAX_THROTTLE_ENTRIES:
+            self._trim(now)
+        self._last_recorded[user_id] = now
+
+        try:
+            self.buffer.record(user_id, now)
+        except Exception:
+            logger.warning("Could not buffer activity for user %s", user_id)
+            return False
+
+        # Backend local không có beat flush riêng: tự flush theo chu kỳ
+        if self.flush_seconds and now - self._last_flush >= self.flush_seconds:
+            self._last_flush = now
+            flush_activity(self.buffer)
+        return True
+
+    def _trim(self, now):
+        cutoff = now - self.throttle_seconds
+        self._last_recorded = {
+            user_id: ts for user_id, ts in self._last_recorded.items() if ts > cutoff
+        }
+
+
+def flush_activity(buffer, batch_size=1000):
+    """Write buffered last-seen timestamps with batched UPDATEs"""
+    entries = buffer.drain()
+    if not entries:
+        return 0
+
+    User = get_user_model()
+    users = [
+        User(
+            id=user_id,
+            last_activity=datetime.fromtimestamp(timestamp, tz=dt_timezone.utc),
+        )
+        for user_id, timestamp in entries.items()
+    ]
+    User.objects.bulk_update(users, ["last_activity"], batch_size=batch_size)
+    invalidate_users(entries)
+    return len(users)
+
+
+_tracker = None
+
+
+def get_tracker():
+    """Process-wide tracker configured from settings"""
+    global _tracker
+    if _tracker is None:
+        if settings.ACTIVITY_BUFFER_BACKEND == "local":
+            _tracker = ActivityTracker(
+                LocalActivityBuffer(),
+                settings.ACTIVITY_THROTTLE_SECONDS,
+                flush_seconds=settings.ACTIVITY_FLUSH_SECONDS,
+            )
+        else:
+            _tracker = ActivityTracker(
+                RedisActivityBuffer(), settings.ACTIVITY_THROTTLE_SECONDS
+            )
+    return _tracker
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.urls import reverse
 from django.utils.html import format_html
 from .models import User
 
@@ -18,7 +19,14 @@ class UserAdmin(BaseUserAdmin):
         ("Personal Info", {"fields": ("first_name", "last_name", "bio")}),  # Bỏ avatar
         (
             "Financial",
-            {"fields": ("wallet_balance", "penalty_per_miss", "consecutive_failures")},
+            {
+                "fields": (
+                    "wallet_balance",
+                    "wallet_adjustment",
+                    "penalty_per_miss",
+                    "consecutive_failures",
+                )
+            },
         ),
         (
             "Permissions",
@@ -45,7 +53,14 @@ class UserAdmin(BaseUserAdmin):
         ),
     )
 
-    readonly_fields = ["last_login", "date_joined", "last_activity"]
+    # wallet_balance là cache do compaction ghi đè: sửa số dư qua ledger
+    readonly_fields = [
+        "last_login",
+        "date_joined",
+        "last_activity",
+        "wallet_balance",
+        "wallet_adjustment",
+    ]
 
     def wallet_status(self, obj):
         balance = obj.wallet_balance
@@ -57,3 +72,13 @@ class UserAdmin(BaseUserAdmin):
         )
 
     wallet_status.short_description = "Wallet"
+
+    def wallet_adjustment(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse("admin:wallet_wallettransaction_add")
+        return format_html(
+            '<a href="{}?user={}&kind=adjustment">Post an adjustment</a>', url, obj.pk
+        )
+
+    wallet_adjustment.short_description = "Adjust balance"
@@ -6,3 +6,6 @@ class UsersConfig(AppConfig):
     name = "apps.users"  # Full Python path
     label = "users"  # Unique label
     verbose_name = "User Management"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,104 @@
+"""JWT authentication with cached user resolution"""
+
+import copy
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.core.db.routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "jwt-user"
+
+# Process-local entries are dropped wholesale past this size
+MAX_LOCAL_ENTRIES = 10000
+
+_local_cache = {}
+_local_lock = threading.Lock()
+
+
+def user_cache_key(user_id):
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def invalidate_users(user_ids):
+    """Drop cached copies of these users
+
+    post_save / post_delete call this for single saves. Queryset
+    ``.update()`` and ``bulk_update()`` on users skip signals, so code doing
+    those must call it with the ids it touched (anything else is only
+    corrected when JWT_USER_CACHE_TTL runs out).
+    """
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except Exception:
+        logger.warning("Could not invalidate %d cached users", len(keys))
+
+    # Các process khác tự hết hạn sau JWT_USER_LOCAL_TTL giây
+    with _local_lock:
+        for key in keys:
+            _local_cache.pop(key, None)
+
+
+def _matches_token(user, version):
+    """Cached user still carries the password hash the token was issued for"""
+    return not version or get_md5_hash_password(user.password) == version
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips the users-table query in steady state
+
+    Users are resolved from a short-TTL process-local cache, then the shared
+    cache, then the database. A cached user is only used for tokens carrying
+    its current password-hash claim (CHECK_REVOKE_TOKEN), so after a password
+    change old tokens go to the database and fail the revoke check. Writes
+    to users drop the shared entry (see ``invalidate_users``); the short
+    JWT_USER_CACHE_TTL bounds how long a write that skipped it, such as a
+    raw ``is_active`` update, can go unnoticed.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        version = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM, "")
+        key = user_cache_key(user_id)
+        now = time.monotonic()
+
+        entry = _local_cache.get(key)
+        if entry is not None and entry[0] > now and _matches_token(entry[1], version):
+            return copy.copy(entry[1])
+
+        try:
+            user = cache.get(key)
+        except Exception:
+            logger.warning("User cache unavailable, falling back to database")
+            user = None
+
+        if user is None or not _matches_token(user, version):
+            # DB lookup + is_active + revoke checks; trên primary để không
+            # cache một bản ghi cũ từ replica
+            with use_primary():
+                user = super().get_user(validated_token)
+            try:
+                cache.set(key, user, settings.JWT_USER_CACHE_TTL)
+            except Exception:
+                pass
+
+        with _local_lock:
+            if len(_local_cache) >= MAX_LOCAL_ENTRIES:
+                _local_cache.clear()
+            _local_cache[key] = (now + settings.JWT_USER_LOCAL_TTL, user)
+
+        return copy.copy(user)
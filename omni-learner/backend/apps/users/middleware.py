@@ -0,0 +1,37 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .activity import get_tracker
+
+
+class ActivityTrackingMiddleware:
+    """Record authenticated users as "last seen" without writing to users
+
+    Runs after the view, so ``request.user`` is the user DRF authenticated
+    (JWT) rather than the session user.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.touch(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # request.user có thể là user session (lazy, truy vấn DB)
+        await sync_to_async(self.touch)(request)
+        return response
+
+    def touch(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            get_tracker().touch(user.pk)
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="last_activity",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Lần cuối hoạt động (ghi theo lô, xem apps.users.activity)",
+                null=True,
+            ),
+        ),
+    ]
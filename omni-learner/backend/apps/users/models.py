@@ -30,7 +30,11 @@ class User(AbstractUser):
     # avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)  # BỎ TẠM
 
     # Tracking
-    last_activity = models.DateTimeField(auto_now=True)
+    last_activity = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Lần cuối hoạt động (ghi theo lô, xem apps.users.activity)",
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
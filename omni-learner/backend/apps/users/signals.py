@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_users
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Deactivation, password change or profile edit -> drop cached user"""
+    invalidate_users([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_users([instance.pk])
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .activity import RedisActivityBuffer, flush_activity
+
+
+@shared_task
+def flush_user_activity():
+    """Flush buffered last-seen timestamps into users.last_activity"""
+    return flush_activity(RedisActivityBuffer())
@@ -0,0 +1,37 @@
+from django.contrib import admin
+from .models import DailyPenalty, WalletSnapshot, WalletTransaction
+from .services import record_transaction
+
+
+@admin.register(DailyPenalty)
+class DailyPenaltyAdmin(admin.ModelAdmin):
+    list_display = ["user", "date", "amount", "applied", "created_at"]
+    list_filter = ["applied", "date"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
+    readonly_fields = ["created_at"]
+
+
+@admin.register(WalletTransaction)
+class WalletTransactionAdmin(admin.ModelAdmin):
+    list_display = ["user", "kind", "amount", "reference", "created_at"]
+    list_filter = ["kind", "created_at"]
+    search_fields = ["user__email", "reference"]
+    raw_id_fields = ["user"]
+    readonly_fields = ["created_at"]
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        """New entries (e.g. balance adjustments) go through the ledger API"""
+        if not obj.description:
+            obj.description = f"Admin adjustment by {request.user}"
+        record_transaction(obj)
+
+
+@admin.register(WalletSnapshot)
+class WalletSnapshotAdmin(admin.ModelAdmin):
+    list_display = ["user", "balance", "last_transaction_id", "created_at"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPenalty",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Ngày bị bỏ lỡ")),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "applied",
+                    models.BooleanField(
+                        default=False, help_text="Đã trừ vào ví hay chưa"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="penalties",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "wallet_daily_penalties",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["date", "applied"], name="wallet_dail_date_ececc0_idx"
+                    )
+                ],
+                "unique_together": {("user", "date")},
+            },
+        ),
+    ]
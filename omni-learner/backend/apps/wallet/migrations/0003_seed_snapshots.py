@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def seed_snapshots(apps, schema_editor):
+    """Carry existing users.wallet_balance over as the opening snapshot"""
+    User = apps.get_model("users", "User")
+    WalletSnapshot = apps.get_model("wallet", "WalletSnapshot")
+
+    snapshots = [
+        WalletSnapshot(user_id=user_id, balance=balance, last_transaction_id=0)
+        for user_id, balance in User.objects.exclude(wallet_balance=0)
+        .values_list("id", "wallet_balance")
+        .iterator()
+    ]
+    WalletSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("wallet", "0002_ledger"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_snapshots, migrations.RunPython.noop),
+    ]
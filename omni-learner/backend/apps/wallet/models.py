@@ -1,3 +1,102 @@
 from django.db import models
+from django.conf import settings
+from django.core.exceptions import ValidationError
 
-# Wallet models sẽ được tạo sau
+
+class DailyPenalty(models.Model):
+    """One penalty per user per missed day
+
+    The (user, date) unique constraint is what makes the daily punishment job
+    idempotent: a rerun can never charge the same day twice.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="penalties"
+    )
+    date = models.DateField(help_text="Ngày bị bỏ lỡ")
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    applied = models.BooleanField(default=False, help_text="Đã trừ vào ví hay chưa")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "wallet_daily_penalties"
+        ordering = ["-date"]
+        unique_together = [["user", "date"]]
+        indexes = [
+            models.Index(fields=["date", "applied"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} missed {self.date}: -{self.amount}"
+
+
+class WalletTransaction(models.Model):
+    """Append-only wallet ledger
+
+    Every balance change is an INSERT here; nothing updates the users row, so
+    concurrent penalties, top-ups and refunds never contend on a hot row.
+    """
+
+    KIND_CHOICES = [
+        ("penalty", "Penalty"),
+        ("topup", "Top-up"),
+        ("refund", "Refund"),
+        ("adjustment", "Adjustment"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="wallet_transactions",
+    )
+    amount = models.DecimalField(
+        max_digits=12, decimal_places=2, help_text="Âm = trừ tiền, dương = nạp tiền"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    reference = models.CharField(
+        max_length=100,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Idempotency key, e.g. 'penalty:<user>:<date>'",
+    )
+    description = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "wallet_transactions"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["user", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind} {self.amount}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Wallet transactions are append-only")
+        super().save(*args, **kwargs)
+
+
+class WalletSnapshot(models.Model):
+    """Running balance of a user up to (and including) a ledger entry"""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="wallet_snapshots",
+    )
+    balance = models.DecimalField(max_digits=12, decimal_places=2)
+    last_transaction_id = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "wallet_snapshots"
+        ordering = ["-last_transaction_id"]
+        indexes = [
+            models.Index(fields=["user", "-last_transaction_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.balance} @ {self.last_transaction_id}"
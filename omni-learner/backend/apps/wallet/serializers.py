@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from .models import WalletTransaction
+
+
+class WalletTransactionSerializer(serializers.ModelSerializer):
+    """Serializer cho wallet ledger"""
+
+    class Meta:
+        model = WalletTransaction
+        fields = ["id", "amount", "kind", "reference", "description", "created_at"]
+        read_only_fields = fields
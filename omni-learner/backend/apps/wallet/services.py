@@ -0,0 +1,176 @@
+"""Wallet ledger operations
+
+``User.wallet_balance`` is only a cached copy refreshed by compaction; the
+source of truth is the latest WalletSnapshot plus the ledger tail after it.
+
+Ledger ids are allocated at INSERT but become visible at COMMIT, so a
+snapshot may only cover ids that no open transaction can still commit below.
+Inserts hold a shared advisory lock until their transaction ends; compaction
+briefly takes it exclusively to read that watermark (PostgreSQL; SQLite has
+a single writer, so the highest visible id is already safe).
+"""
+
+import logging
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    Max,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from apps.users.authentication import invalidate_users
+
+from .models import WalletSnapshot, WalletTransaction
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock key for "ledger inserts in flight" (any fixed bigint)
+LEDGER_LOCK_ID = 0x77616C6C6574
+WATERMARK_TIMEOUT_SECONDS = 5
+
+
+def _lock_ledger(shared):
+    """Take the ledger advisory lock for the current transaction
+
+    Returns False only when the exclusive (try) lock is unavailable.
+    """
+    connection = transaction.get_connection()
+    if connection.vendor != "postgresql":
+        return True
+    with connection.cursor() as cursor:
+        if shared:
+            cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [LEDGER_LOCK_ID])
+            return True
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [LEDGER_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def committed_watermark(timeout=WATERMARK_TIMEOUT_SECONDS):
+    """Highest ledger id no in-flight insert can still commit below
+
+    None if inserts kept the lock busy for ``timeout`` seconds. The lock is
+    polled rather than waited on, so queued writers are never held up.
+    """
+    deadline = time.monotonic() + timeout
+    with transaction.atomic():
+        while not _lock_ledger(shared=False):
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+        return WalletTransaction.objects.aggregate(last=Max("id"))["last"] or 0
+
+
+def post_transaction(user_id, amount, kind, reference=None, description=""):
+    """Append one ledger entry (no-op if ``reference`` was already used)"""
+    post_transactions(
+        [
+            WalletTransaction(
+                user_id=user_id,
+                amount=amount,
+                kind=kind,
+                reference=reference,
+                description=description,
+            )
+        ]
+    )
+
+
+def post_transactions(transactions, batch_size=1000):
+    """Append many ledger entries with batched INSERTs"""
+    with transaction.atomic():
+        # Giữ đến khi transaction (có thể là của caller) commit
+        _lock_ledger(shared=True)
+        WalletTransaction.objects.bulk_create(
+            transactions, batch_size=batch_size, ignore_conflicts=True
+        )
+
+
+def record_transaction(entry):
+    """Insert one unsaved WalletTransaction and return it with its id"""
+    with transaction.atomic():
+        _lock_ledger(shared=True)
+        entry.save()
+    return entry
+
+
+def get_balance(user_id):
+    """Current balance = latest snapshot + sum of the ledger tail after it"""
+    snapshot = (
+        WalletSnapshot.objects.filter(user_id=user_id)
+        .values("balance", "last_transaction_id")
+        .first()
+    )
+    base = snapshot["balance"] if snapshot else Decimal("0")
+    last_id = snapshot["last_transaction_id"] if snapshot else 0
+
+    tail = WalletTransaction.objects.filter(user_id=user_id, id__gt=last_id).aggregate(
+        total=Sum("amount")
+    )["total"]
+    return base + (tail or 0)
+
+
+def compact_balances(min_tail=1):
+    """Fold ledger tails into new snapshots for every user that has one
+
+    One GROUP BY over the ledger (tail after each user's latest snapshot),
+    then a batched INSERT of snapshots and a batched refresh of the cached
+    ``User.wallet_balance``. Only ids up to the committed watermark are
+    folded. Returns the number of users compacted.
+    """
+    watermark = committed_watermark()
+    if watermark is None:
+        logger.info("Ledger busy, compaction postponed")
+        return 0
+
+    latest = WalletSnapshot.objects.filter(user=OuterRef("user")).order_by(
+        "-last_transaction_id"
+    )
+    money = DecimalField(max_digits=12, decimal_places=2)
+
+    tails = (
+        WalletTransaction.objects.filter(id__lte=watermark)
+        .annotate(
+            snap_last=Coalesce(
+                Subquery(latest.values("last_transaction_id")[:1]), Value(0)
+            ),
+            snap_balance=Coalesce(
+                Subquery(latest.values("balance")[:1]),
+                Value(Decimal("0")),
+                output_field=money,
+            ),
+        )
+        .filter(id__gt=F("snap_last"))
+        .values("user_id", "snap_balance")
+        .annotate(tail=Sum("amount"), last_id=Max("id"), n=Count("id"))
+        .filter(n__gte=min_tail)
+    )
+
+    snapshots = [
+        WalletSnapshot(
+            user_id=row["user_id"],
+            balance=row["snap_balance"] + row["tail"],
+            last_transaction_id=row["last_id"],
+        )
+        for row in tails
+    ]
+
+    User = get_user_model()
+    with transaction.atomic():
+        WalletSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+        User.objects.bulk_update(
+            [User(id=s.user_id, wallet_balance=s.balance) for s in snapshots],
+            ["wallet_balance"],
+            batch_size=1000,
+        )
+    invalidate_users([snapshot.user_id for snapshot in snapshots])
+    return len(snapshots)
@@ -0,0 +1,144 @@
+from datetime import date, datetime, time, timedelta
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from apps.core.fanout import fan_out, id_bounds
+from apps.core.locks import single_instance
+from apps.kanban.models import Board, CardEvent
+from apps.users.authentication import invalidate_users
+from .models import DailyPenalty, WalletTransaction
+from .services import compact_balances, post_transactions
+
+# Users per worker task / ids per UPDATE statement
+SHARD_SIZE = 10000
+UPDATE_CHUNK_SIZE = 1000
+
+
+def _day_bounds(day):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return start, start + timedelta(days=1)
+
+
+def missed_users(day, id_from, id_to):
+    """Users in [id_from, id_to) who had active boards but completed nothing
+
+    One query: the "did anything" check is a correlated EXISTS over the card
+    event log, not a per-user loop.
+    """
+    start, end = _day_bounds(day)
+    User = get_user_model()
+
+    has_board = Board.objects.filter(owner=OuterRef("pk"), is_active=True)
+    completed = CardEvent.objects.filter(
+        board__owner=OuterRef("pk"),
+        event_type="completed",
+        timestamp__gte=start,
+        timestamp__lt=end,
+    )
+
+    return (
+        User.objects.filter(
+            id__gte=id_from,
+            id__lt=id_to,
+            is_active=True,
+            penalty_per_miss__gt=0,
+            date_joined__lt=start,
+        )
+        .filter(Exists(has_board))
+        .exclude(Exists(completed))
+    )
+
+
+@shared_task
+def punish_user_range(day, id_from, id_to):
+    """Apply penalties for one shard of users (ids in [id_from, id_to))"""
+    day = date.fromisoformat(day)
+    User = get_user_model()
+
+    with transaction.atomic():
+        DailyPenalty.objects.bulk_create(
+            [
+                DailyPenalty(user_id=user_id, date=day, amount=amount)
+                for user_id, amount in missed_users(day, id_from, id_to).values_list(
+                    "id", "penalty_per_miss"
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+        # Khóa các penalty chưa áp dụng: chạy lại song song sẽ phải chờ,
+        # sau đó thấy applied=True và không trừ tiền lần nữa
+        pending = list(
+            DailyPenalty.objects.select_for_update()
+            .filter(
+                date=day,
+                applied=False,
+                user_id__gte=id_from,
+                user_id__lt=id_to,
+            )
+            .values_list("user_id", "amount")
+        )
+
+        for i in range(0, len(pending), UPDATE_CHUNK_SIZE):
+            chunk = pending[i : i + UPDATE_CHUNK_SIZE]
+            user_ids = [user_id for user_id, _ in chunk]
+
+            # Tiền đi vào ledger (append-only), không ghi vào users.wallet_balance
+            post_transactions(
+                [
+                    WalletTransaction(
+                        user_id=user_id,
+                        amount=-amount,
+                        kind="penalty",
+                        reference=f"penalty:{user_id}:{day.isoformat()}",
+                        description=f"Missed {day.isoformat()}",
+                    )
+                    for user_id, amount in chunk
+                ]
+            )
+            User.objects.filter(id__in=user_ids).update(
+                consecutive_failures=F("consecutive_failures") + 1
+            )
+            DailyPenalty.objects.filter(date=day, user_id__in=user_ids).update(
+                applied=True
+            )
+
+        # Ai không bị phạt hôm nay thì reset chuỗi thất bại
+        penalized = DailyPenalty.objects.filter(user=OuterRef("pk"), date=day)
+        reset_ids = list(
+            User.objects.filter(
+                id__gte=id_from, id__lt=id_to, consecutive_failures__gt=0
+            )
+            .exclude(Exists(penalized))
+            .values_list("id", flat=True)
+        )
+        User.objects.filter(id__in=reset_ids).update(consecutive_failures=0)
+
+    # update() không phát signal: tự xoá user đã cache
+    invalidate_users([user_id for user_id, _ in pending] + reset_ids)
+    return len(pending)
+
+
+@shared_task
+@single_instance(ttl=60 * 60, hold=True)
+def run_daily_punishment_check(day=None):
+    """Beat entry point: split yesterday's check across workers by user id"""
+    day = date.fromisoformat(day) if day else timezone.localdate() - timedelta(days=1)
+    return fan_out(
+        punish_user_range,
+        id_bounds(get_user_model().objects.all()),
+        day.isoformat(),
+        shard_size=SHARD_SIZE,
+    )
+
+
+@shared_task
+@single_instance(ttl=5 * 60)
+def compact_wallet_balances():
+    """Fold recent ledger entries into balance snapshots"""
+    return compact_balances()
@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(
+    r"transactions", views.WalletTransactionViewSet, basename="wallet-transaction"
+)
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -0,0 +1,31 @@
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .models import WalletTransaction
+from .serializers import WalletTransactionSerializer
+from .services import get_balance
+
+
+class WalletTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for the wallet ledger
+
+    list: Current user's transactions (newest first)
+    balance: Current balance (latest snapshot + ledger tail)
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = WalletTransactionSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["kind"]
+
+    def get_queryset(self):
+        return WalletTransaction.objects.filter(user=self.request.user)
+
+    @action(detail=False, methods=["get"])
+    def balance(self, request):
+        """Get current wallet balance"""
+        return Response({"balance": float(get_balance(request.user.id))})
@@ -5,12 +5,18 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+Run with uvicorn workers, e.g.:
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
 import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+# Kanban GET endpoints có bản async (apps.kanban.async_views)
+os.environ.setdefault("KANBAN_ASYNC_READS", "True")
 
 application = get_asgi_application()
@@ -1,6 +1,9 @@
 import os
+from datetime import timedelta
+
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
 
@@ -8,12 +11,68 @@ app = Celery("omnilearner")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def freeze_before_fork(**kwargs):
+    # Prefork: task modules are already imported in the parent
+    from apps.core import boot
+
+    boot.freeze()
+
+
+@worker_process_init.connect
+def reset_child(**kwargs):
+    from apps.core import boot
+
+    boot.reset_after_fork()
+
+
 # Scheduled tasks
 app.conf.beat_schedule = {
+    "relay-outbox": {
+        "task": "apps.core.tasks.relay_outbox",
+        "schedule": timedelta(seconds=2),
+    },
+    "purge-outbox": {
+        "task": "apps.core.tasks.purge_outbox",
+        "schedule": crontab(minute=15),  # mỗi giờ
+    },
     "run-daily-punishment-midnight": {
         "task": "apps.wallet.tasks.run_daily_punishment_check",
         "schedule": crontab(hour=0, minute=0),  # 00:00 mỗi ngày
     },
+    "flush-user-activity": {
+        "task": "apps.users.tasks.flush_user_activity",
+        "schedule": crontab(minute="*"),  # mỗi phút
+    },
+    "flush-deepwork-heartbeats": {
+        "task": "apps.deepwork.tasks.flush_heartbeats",
+        "schedule": timedelta(seconds=10),
+    },
+    "compact-wallet-balances": {
+        "task": "apps.wallet.tasks.compact_wallet_balances",
+        "schedule": crontab(minute="*/15"),
+    },
+    "refresh-card-statuses": {
+        "task": "apps.kanban.tasks.refresh_card_statuses",
+        "schedule": crontab(minute="*/10"),
+    },
+    "dispatch-due-reminders": {
+        "task": "apps.kanban.tasks.dispatch_due_reminders",
+        "schedule": crontab(minute="*"),
+    },
+    "purge-attachment-blobs": {
+        "task": "apps.kanban.tasks.purge_attachment_blobs",
+        "schedule": crontab(minute=30),  # mỗi giờ
+    },
+    "snapshot-active-sprints": {
+        "task": "apps.kanban.tasks.snapshot_active_sprints",
+        "schedule": crontab(hour=23, minute=45),  # trước khi tính metrics
+    },
+    "reschedule-all-users": {
+        "task": "apps.scheduler.tasks.reschedule_all_users",
+        "schedule": crontab(hour=2, minute=0),  # xếp lịch lại mỗi đêm
+    },
     "calculate-daily-metrics": {
         "task": "apps.analytics.tasks.calculate_daily_metrics",
         "schedule": crontab(hour=23, minute=55),  # 23:55 mỗi ngày
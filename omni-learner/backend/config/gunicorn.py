@@ -0,0 +1,36 @@
+"""gunicorn settings
+
+    gunicorn -c config/gunicorn.py config.wsgi:application
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c config/gunicorn.py config.asgi:application
+
+The app is loaded once in the master (preload_app) and workers are forked
+from it, so they start without importing anything and share the loaded code
+copy-on-write. See apps.core.boot.
+"""
+
+import multiprocessing
+
+from decouple import config as env_config
+
+bind = env_config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = env_config(
+    "GUNICORN_WORKERS", default=multiprocessing.cpu_count() * 2 + 1, cast=int
+)
+worker_class = env_config("GUNICORN_WORKER_CLASS", default="sync")
+timeout = env_config("GUNICORN_TIMEOUT", default=60, cast=int)
+preload_app = True
+
+
+def when_ready(server):
+    # Chạy trong master, trước khi fork worker đầu tiên
+    from apps.core import boot
+
+    boot.preload()
+    boot.freeze()
+
+
+def post_fork(server, worker):
+    from apps.core import boot
+
+    boot.reset_after_fork()
@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config as env_config
+from decouple import Csv, config as env_config
 import os
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -38,11 +38,13 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "apps.core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.users.middleware.ActivityTrackingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -80,6 +82,47 @@ DATABASES = {
     }
 }
 
+# Connection pooling (psycopg_pool). Every process - gunicorn / uvicorn worker
+# or Celery child - opens its own pool per alias, so Postgres sees at most
+# processes * DB_POOL_MAX_SIZE connections. "Closing" returns the connection
+# to the pool, hence CONN_MAX_AGE = 0.
+if env_config("DB_POOL", default=True, cast=bool):
+    DATABASES["default"].update(
+        {
+            "ENGINE": "apps.core.db.backends.postgresql_pool",
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,  # checked by the pool on checkout
+            "OPTIONS": {
+                "pool": {
+                    "min_size": env_config("DB_POOL_MIN_SIZE", default=1, cast=int),
+                    "max_size": env_config("DB_POOL_MAX_SIZE", default=8, cast=int),
+                    "timeout": env_config("DB_POOL_TIMEOUT", default=10, cast=float),
+                    "max_idle": 300,  # shrink back to min_size after 5 idle minutes
+                    "max_lifetime": 1800,
+                },
+            },
+        }
+    )
+
+# Read replicas: DB_REPLICA_HOSTS=replica1,replica2:5433 adds "replica_1",
+# "replica_2" with the primary's credentials. Pointing it at the primary's own
+# host (or a second local database) exercises the routing locally; tests
+# mirror every replica onto "default".
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(env_config("DB_REPLICA_HOSTS", default="", cast=Csv())):
+    _host, _, _port = _host.partition(":")
+    DATABASES[f"replica_{_index + 1}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{_index + 1}")
+
+DATABASE_ROUTERS = ["apps.core.db.routers.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = 10  # reads stay on the primary this long after a write
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,7 +162,7 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -140,10 +183,29 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
+    # Token mang hash của password -> đổi password là token cũ hết hiệu lực
+    "CHECK_REVOKE_TOKEN": True,
+}
+
+# Cached JWT user resolution (apps.users.authentication)
+# Shared cache, invalidated on user writes; also bounds how long a raw UPDATE
+# (e.g. is_active) that skipped invalidate_users() keeps a user logged in
+JWT_USER_CACHE_TTL = 30
+JWT_USER_LOCAL_TTL = 5  # process-local cache
+
+# Redis (Celery broker, buffers, counters)
+REDIS_URL = env_config("REDIS_URL", default="redis://localhost:6379/0")
+
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env_config("CACHE_URL", default="redis://localhost:6379/1"),
+    }
 }
 
 # Celery Configuration
-CELERY_BROKER_URL = env_config("REDIS_URL", default="redis://localhost:6379/0")
+CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = "django-db"
 CELERY_CACHE_BACKEND = "default"
 CELERY_ACCEPT_CONTENT = ["json"]
@@ -152,3 +214,101 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # long jobs don't hoard messages
+
+# Queues: time-sensitive jobs never wait behind rollups or image work.
+# Each queue gets its own worker (see docker-compose.yml).
+from kombu import Queue
+
+CELERY_TASK_QUEUES = [
+    Queue(name, queue_arguments={"x-max-priority": 9})
+    for name in ("critical", "default", "analytics", "media")
+]
+CELERY_TASK_DEFAULT_QUEUE = "default"
+# Priority 0 (first) .. 9 (last) within a queue; Redis needs the steps listed.
+# No CELERY_TASK_DEFAULT_PRIORITY: it is copied onto every task and would
+# override the per-route priorities below.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",  # "-Q a,b" drains a before b
+}
+CELERY_TASK_ROUTES = {
+    "apps.core.tasks.relay_outbox": {"queue": "critical", "priority": 0},
+    "apps.deepwork.tasks.flush_heartbeats": {"queue": "critical", "priority": 1},
+    "apps.kanban.tasks.dispatch_due_reminders": {"queue": "critical", "priority": 2},
+    "apps.kanban.tasks.send_reminder_batch": {"queue": "critical", "priority": 3},
+    "apps.wallet.tasks.run_daily_punishment_check": {
+        "queue": "critical",
+        "priority": 2,
+    },
+    "apps.wallet.tasks.punish_user_range": {"queue": "critical", "priority": 4},
+    "apps.analytics.tasks.*": {"queue": "analytics", "priority": 5},
+    "apps.scheduler.tasks.*": {"queue": "analytics", "priority": 5},
+    "apps.kanban.tasks.snapshot_active_sprints": {
+        "queue": "analytics",
+        "priority": 5,
+    },
+    "apps.kanban.tasks.generate_attachment_previews": {
+        "queue": "media",
+        "priority": 5,
+    },
+    "apps.kanban.tasks.purge_attachment_blobs": {"queue": "media", "priority": 8},
+}
+# Rate limits are per task and per worker process, so a queue's limit is its
+# rate_limit times the worker's concurrency
+CELERY_TASK_ANNOTATIONS = {
+    "apps.kanban.tasks.send_reminder_batch": {"rate_limit": "30/m"},  # SMTP
+    "apps.kanban.tasks.generate_attachment_previews": {"rate_limit": "120/m"},
+    "apps.scheduler.tasks.reschedule_user_range": {"rate_limit": "60/m"},
+}
+
+# Activity tracking (write-behind User.last_activity)
+# "redis": shared buffer flushed by Celery beat; "local": in-process buffer
+ACTIVITY_BUFFER_BACKEND = env_config("ACTIVITY_BUFFER_BACKEND", default="redis")
+ACTIVITY_THROTTLE_SECONDS = 60  # record each user at most once per minute
+ACTIVITY_FLUSH_SECONDS = 60  # flush interval for the "local" backend
+
+# Deep work heartbeats
+# "redis": shared buffer flushed by Celery beat; "local": in-process buffer
+DEEPWORK_BUFFER_BACKEND = env_config("DEEPWORK_BUFFER_BACKEND", default="redis")
+DEEPWORK_INTERRUPT_SECONDS = 60  # no heartbeat for this long -> interrupted
+DEEPWORK_ABANDON_SECONDS = 2 * 60 * 60  # interrupted this long -> completed
+DEEPWORK_LOCAL_FLUSH_SIZE = 50  # "local" backend flushes every N heartbeats
+DEEPWORK_STREAK_MINUTES = 25  # focused minutes for a day to count in a streak
+
+# Async kanban reads (board detail, statistics, card list) for ASGI servers;
+# config.asgi turns this on unless the environment says otherwise
+KANBAN_ASYNC_READS = env_config("KANBAN_ASYNC_READS", default=False, cast=bool)
+
+# Time-block scheduler
+SCHEDULER_HORIZON_DAYS = 14  # how far ahead open cards are packed
+
+# Attachments
+ATTACHMENT_MAX_SIZE = 100 * 1024 * 1024  # 100 MB
+UPLOAD_SESSION_DIR = BASE_DIR / "tmp" / "uploads"  # resumable upload parts
+UPLOAD_SESSION_TTL_HOURS = 24  # unfinished uploads are discarded after this
+# Download hand-off: "nginx" (X-Accel-Redirect), "xsendfile" (Apache/lighttpd)
+# or "" to stream from Django
+ATTACHMENT_SENDFILE_BACKEND = env_config("ATTACHMENT_SENDFILE_BACKEND", default="")
+# nginx "internal" location aliased to MEDIA_ROOT
+ATTACHMENT_SENDFILE_PREFIX = "/protected-media/"
+
+# Distributed locks (apps.core.locks)
+# "redis": SET NX PX leases; "database": PostgreSQL advisory locks
+LOCK_BACKEND = env_config("LOCK_BACKEND", default="redis")
+SINGLE_FLIGHT_TIMEOUT_SECONDS = 10  # followers wait this long for the leader
+SINGLE_FLIGHT_RESULT_SECONDS = 2  # how stale a shared result may be
+
+# Transactional outbox (apps.core.outbox)
+OUTBOX_BATCH_SIZE = 500  # messages published per relay transaction
+OUTBOX_RETENTION_HOURS = 24  # sent messages are purged after this
+OUTBOX_SETTLE_SECONDS = 5  # relay skips rows younger than this (commit lag)
+
+# Metrics (/metrics, Prometheus text format)
+METRICS_PUBLISH_SECONDS = 15  # how often each process pushes its snapshot
+METRICS_TOKEN = env_config("METRICS_TOKEN", default="")  # Bearer token, "" = open
+# Tasks running longer than this are logged with their arguments
+METRICS_SLOW_TASK_SECONDS = env_config(
+    "METRICS_SLOW_TASK_SECONDS", default=60, cast=float
+)
@@ -4,6 +4,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.core.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     # JWT Authentication
@@ -11,9 +13,19 @@ urlpatterns = [
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # Kanban API
     path("api/kanban/", include("apps.kanban.urls")),
+    # Wallet API
+    path("api/wallet/", include("apps.wallet.urls")),
+    # Analytics API
+    path("api/analytics/", include("apps.analytics.urls")),
+    # Deep work API
+    path("api/deepwork/", include("apps.deepwork.urls")),
+    # Scheduler API
+    path("api/scheduler/", include("apps.scheduler.urls")),
+    # Prometheus metrics
+    path("metrics", metrics, name="metrics"),
 ]
 
-# Serve media files in development
+# Serve static files in development. MEDIA_ROOT holds attachments and is
+# never served directly, only through the ownership-checked download action.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)